@@ -0,0 +1,747 @@
+"""Timing harnesses for the tracker's hot paths.
+
+Run from the repository root, e.g. ``python3 code/satellite/benchmarks.py startup``.
+"""
+import argparse, os, shutil, statistics, sys, tempfile, time
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, base_dir)
+tle_file = os.path.join(base_dir, "satellites.txt")
+
+
+def _timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return result, samples
+
+
+def _report(label, samples):
+    print(f"{label:<28} median {statistics.median(samples) * 1000:8.1f} ms   "
+          f"min {min(samples) * 1000:8.1f} ms   ({len(samples)} runs)")
+
+
+def _with_checksum(line):
+    from tle_catalog import tle_checksum
+    line = line[:68]
+    return line + str(tle_checksum(line))
+
+
+def scaled_tle_text(scale):
+    """satellites.txt repeated ``scale`` times with unique catalog numbers."""
+    lines = [l for l in open(tle_file, encoding="utf-8-sig").read().splitlines() if l.strip()]
+    out = []
+    norad = 10000
+    for k in range(scale):
+        for i in range(0, len(lines) - 2, 3):
+            norad += 1
+            l1 = _with_checksum(lines[i + 1][:2] + f"{norad:05d}" + lines[i + 1][7:])
+            l2 = _with_checksum(lines[i + 2][:2] + f"{norad:05d}" + lines[i + 2][7:])
+            out += [f"{lines[i].strip()} #{k}", l1, l2]
+    return "\n".join(out)
+
+
+def bench_startup(args):
+    """Catalog load plus EarthSatellite construction: text TLE parse vs binary snapshot."""
+    from tle_catalog import TleCatalog, read_snapshot, write_snapshot
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "satellites.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(scaled_tle_text(args.scale))
+        write_snapshot(path)
+
+        catalog, text = _timed(lambda: TleCatalog.from_file(path).satellites(), args.repeat)
+        print(f"{len(catalog)} satellites")
+        _report("text parse", text)
+        _, snap = _timed(lambda: read_snapshot(path).satellites(), args.repeat)
+        _report("binary snapshot", snap)
+        print(f"speed-up x{statistics.median(text) / statistics.median(snap):.1f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _legacy_map_markup(base_map, colours, positions, forecast_lat, forecast_lon, observer_lat, observer_lon, parse):
+    """The pre-MapRenderer path: tag every plotted cell, join the frame, then regex it back into markup."""
+    h, w = len(base_map), len(base_map[0])
+
+    def cell(lat, lon):
+        row = int((90 - lat) / 180 * (h - 1))
+        col = int((lon + 180) / 360 * (w - 1))
+        return max(0, min(h - 1, row)), max(0, min(w - 1, col))
+
+    frame = [row.copy() for row in base_map]
+    for i in range(len(forecast_lat)):
+        colour = colours[i % len(colours)]
+        for lat, lon in zip(forecast_lat[i], forecast_lon[i]):
+            r, c = cell(lat, lon)
+            frame[r][c] = f"[{colour}]*[/{colour}]"
+    r, c = cell(observer_lat, observer_lon)
+    frame[r][c] = "[red]O[/red]"
+    for i, (lat, lon) in enumerate(positions):
+        colour = colours[i % len(colours)]
+        r, c = cell(lat, lon)
+        frame[r][c] = f"[{colour}]{i+1}[/{colour}]"
+    return parse("\n".join("".join(row) for row in frame))
+
+
+def _flatten_markup(markup):
+    out = []
+    for item in markup:
+        attr, text = item if isinstance(item, tuple) else (None, item)
+        out.extend((attr, ch) for ch in text)
+    return out
+
+
+def map_scene(n_sats, points, horizon_min=30):
+    """Current positions and forecast tracks for the first ``n_sats`` satellites of satellites.txt."""
+    import numpy as np
+    from ground_track import GroundTrackCache
+    from propagation import Propagator
+    from tle_catalog import load_catalog
+
+    sats = load_catalog(tle_file).satellites()[:n_sats]
+    prop = Propagator(sats, -31.9505, 115.8605)
+    now = time.time()
+    frame = prop.propagate_unix(np.array([now]))
+    lat, lon = GroundTrackCache(prop, points, horizon_min * 60.0).update(now)
+    positions = list(zip(frame.lat[:, 0].tolist(), frame.lon[:, 0].tolist()))
+    return positions, lat, lon
+
+
+def bench_map(args):
+    """One map frame: string build plus parse_colours vs MapRenderer markup, cell and hi-res."""
+    from map_render import MapRenderer
+    from sattrack import ascii_map, colourlist, parse_colours
+
+    positions, lat, lon = map_scene(args.satellites, args.points, args.horizon)
+    obs = (-31.9505, 115.8605)
+    cell = MapRenderer(ascii_map, hires=False)
+    hires = MapRenderer(ascii_map, hires=True)
+    legacy = lambda: _legacy_map_markup(ascii_map, colourlist, positions, lat, lon, *obs, parse_colours)
+    direct = lambda: cell.render(cell.overlay(positions, lat, lon, *obs, colourlist, len(lat)))
+    braille = lambda: hires.render(hires.overlay(positions, lat, lon, *obs, colourlist, len(lat)))
+    if _flatten_markup(legacy()) != _flatten_markup(direct()):
+        print("warning: renderers disagree")
+
+    print(f"{len(positions)} satellites, {args.points} forecast points over {args.horizon:g} min each")
+    _, old = _timed(legacy, args.repeat)
+    _report("string + parse_colours", old)
+    _, new = _timed(direct, args.repeat)
+    _report("MapRenderer", new)
+    print(f"speed-up x{statistics.median(old) / statistics.median(new):.1f}")
+    _, dots = _timed(braille, args.repeat)
+    _report("MapRenderer hi-res tracks", dots)
+
+
+def _legacy_metrics_tree(boxes):
+    """The pre-TelemetryTable path: a fresh Columns/LineBox/Pile/Text tree on every tick."""
+    import urwid
+    widgets = []
+    for header, rows in boxes:
+        texts = [urwid.Columns([('weight', 1, urwid.Text(label)), ('weight', 1, urwid.Text(value, align='right'))])
+                 for label, value in rows]
+        widgets.append(('weight', 1, urwid.LineBox(urwid.Pile([urwid.Text(header, align='center')] + texts))))
+    return urwid.Columns(widgets, dividechars=1)
+
+
+def telemetry_ticks(n_sats, ticks, interval, frame_interval):
+    """Telemetry boxes for ``ticks`` consecutive UI ticks.
+
+    As in the app, positions come from the latest background frame (one
+    every ``frame_interval`` seconds) while the pass countdown uses the
+    tick's own time.
+    """
+    import numpy as np
+    from passes import next_pass, predict_passes
+    from propagation import Propagator
+    from sattrack import telemetry_rows
+    from tle_catalog import load_catalog
+
+    sats = load_catalog(tle_file).satellites()[:n_sats]
+    prop = Propagator(sats, -31.9505, 115.8605)
+    now = time.time()
+    tick_times = now + interval * np.arange(ticks)
+    frame_times = now + np.floor(interval * np.arange(ticks) / frame_interval) * frame_interval
+    frame = prop.propagate_unix(frame_times)
+    passes = [next_pass(p, now) for p in predict_passes(prop, now, 86400.0, 20)]
+    out = []
+    for k in range(ticks):
+        boxes = []
+        for i, sat in enumerate(sats):
+            entry = (sat.name, frame.az[i, k], frame.el[i, k], frame.lat[i, k], frame.lon[i, k], frame.alt_km[i, k],
+                     0.0, frame.range_km[i, k], frame.speed_m_s[i, k], passes[i])
+            boxes.append((f"{i + 1}. {sat.name}", telemetry_rows(entry, tick_times[k])))
+        out.append(boxes)
+    return out
+
+
+def _tick_peak_kib(step, ticks):
+    """Mean transient memory (tracemalloc peak above the starting level) per tick, in KiB."""
+    import tracemalloc
+    tracemalloc.start()
+    peaks = []
+    for boxes in ticks:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(boxes)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return statistics.mean(peaks) / 1024
+
+
+def bench_telemetry(args):
+    """Live telemetry table per UI tick: rebuilt widget tree vs in-place TelemetryTable, rendered each tick."""
+    from sattrack import TelemetryTable
+
+    ticks = telemetry_ticks(args.satellites, args.ticks, args.interval, args.frame_interval)
+    size = (args.width,)
+    table = TelemetryTable()
+    # the screen keeps the last canvas alive, which is what lets urwid reuse cached canvases
+    screen = {}
+
+    def legacy(boxes):
+        screen["canvas"] = _legacy_metrics_tree(boxes).render(size)
+
+    def in_place(boxes):
+        table.update(boxes)
+        screen["canvas"] = table.widget.render(size)
+
+    print(f"{args.satellites} satellites, {args.ticks} ticks {args.interval:g} s apart, "
+          f"new frame every {args.frame_interval:g} s, {args.width} columns")
+    for label, step in (("rebuilt tree", legacy), ("TelemetryTable", in_place)):
+        cpu0 = time.process_time()
+        for boxes in ticks:
+            step(boxes)
+        cpu = (time.process_time() - cpu0) / len(ticks)
+        peak = _tick_peak_kib(step, ticks[:args.alloc_ticks])
+        print(f"{label:<28} cpu {cpu * 1000:7.2f} ms/tick   allocated {peak:7.1f} KiB/tick")
+
+
+def bench_processes(args):
+    """Frame throughput and UI-thread tick latency with propagation in-process vs in 1/2/4 worker processes."""
+    import threading
+    import numpy as np
+    from process_pool import make_propagator
+    from tle_catalog import TleCatalog
+
+    sats = TleCatalog.from_lines(scaled_tle_text(args.scale).splitlines()).satellites()
+    offsets = np.concatenate([np.arange(10) * 30.0, np.arange(args.points) * 60.0])
+    print(f"{len(sats)} satellites x {len(offsets)} times per frame, {os.cpu_count()} CPUs, "
+          f"{args.seconds:g} s per run, UI tick {args.tick * 1000:g} ms")
+    for workers in [0] + args.workers:
+        prop = make_propagator(sats, -31.9505, 115.8605, workers)
+        prop.propagate_unix(time.time() + offsets)
+        stop = threading.Event()
+        frames = [0]
+
+        def compute():
+            while not stop.is_set():
+                prop.propagate_unix(time.time() + offsets)
+                frames[0] += 1
+
+        worker = threading.Thread(target=compute, daemon=True)
+        lateness = []
+        t_start = time.perf_counter()
+        worker.start()
+        while time.perf_counter() - t_start < args.seconds:
+            t0 = time.perf_counter()
+            time.sleep(args.tick)
+            # a little Python work standing in for urwid handling a keystroke
+            "".join(f"{i:.1f}" for i in range(200))
+            lateness.append(time.perf_counter() - t0 - args.tick)
+        stop.set()
+        worker.join()
+        elapsed = time.perf_counter() - t_start
+        prop.close()
+
+        label = "in-process" if workers == 0 else f"{workers} worker process{'es' if workers > 1 else ''}"
+        lat_ms = np.array(lateness) * 1000
+        print(f"{label:<22} {frames[0] / elapsed:7.1f} frames/s   UI latency p50 {np.percentile(lat_ms, 50):6.2f} ms"
+              f"   p99 {np.percentile(lat_ms, 99):6.2f} ms   max {lat_ms.max():6.2f} ms")
+
+
+def bench_watcher(args):
+    """Per-tick UI cost of finding new decoder images: recursive glob vs draining the output watcher."""
+    from pathlib import Path
+    from output_watcher import OutputWatcher
+
+    root = Path(tempfile.mkdtemp(prefix="sattrack-watch-"))
+    try:
+        for d in range(args.passes):
+            pass_dir = root / f"pass_{d:04d}" / "products"
+            pass_dir.mkdir(parents=True)
+            for i in range(args.files):
+                (pass_dir / f"img_{i:03d}.png").write_bytes(b"")
+        print(f"{args.passes} pass directories x {args.files} images = {args.passes * args.files} files")
+
+        seen = set()
+
+        def glob_tick():
+            new = []
+            for ext in ("*.png", "*.jpg", "*.jpeg", "*.bmp"):
+                for p in root.glob(f"**/{ext}"):
+                    if p not in seen:
+                        seen.add(p)
+                        new.append(p)
+            return new
+
+        glob_tick()
+        _report("recursive glob per tick", _timed(glob_tick, args.repeat)[1])
+
+        for backend in ("inotify", "scan"):
+            watcher = OutputWatcher(root, backend=backend, interval=0.2, settle=0.2)
+            watcher.start()
+            time.sleep(0.5)
+            _report(f"{watcher.backend} drain per tick", _timed(watcher.drain, args.repeat)[1])
+            (root / "pass_0000" / "products" / f"new_{backend}.png").write_bytes(b"x")
+            t0 = time.perf_counter()
+            found = []
+            while not found and time.perf_counter() - t0 < 5:
+                time.sleep(0.01)
+                found = watcher.drain()
+            print(f"{'':<28} new image seen after {(time.perf_counter() - t0) * 1000:.0f} ms: "
+                  f"{[p.name for p in found]}")
+            watcher.stop()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def bench_decoder_log(args):
+    """Decoder panel cost per UI tick: tail list + 200-line rejoin vs log ring, parser and incremental view."""
+    import queue
+    import urwid
+    from satdump_log import SatdumpLog
+    from sattrack import LogView
+
+    def line(i):
+        return (f"[12:00:{i % 60:02d} - 18/10/2026] (I) Progress {i % 100}%, SNR : {i % 13}.5dB, "
+                f"Peak SNR: 12.0dB, Viterbi : SYNCED BER : 0.0{i % 90:02d}, Deframer : SYNCED")
+
+    lines = [line(i) for i in range(args.ticks * args.lines)]
+    size = (args.width,)
+
+    def legacy():
+        tail, q, text = [], queue.Queue(), urwid.Text("")
+        box = urwid.LineBox(urwid.Pile([text]))
+        canvas = None
+        for tick in range(args.ticks):
+            for raw in lines[tick * args.lines:(tick + 1) * args.lines]:
+                tail.append(raw)
+                if len(tail) > 400:
+                    tail = tail[-400:]
+                q.put(raw)
+            got = []
+            while True:
+                try:
+                    got.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            if got:
+                text.set_text("\n".join(tail[-200:]))
+            canvas = box.render(size)
+        return canvas
+
+    def ring():
+        log, view = SatdumpLog(), LogView()
+        box = urwid.LineBox(view.widget)
+        seq = 0
+        canvas = None
+        for tick in range(args.ticks):
+            for raw in lines[tick * args.lines:(tick + 1) * args.lines]:
+                log.feed(raw)
+            new, seq = log.lines.since(seq)
+            view.extend(new)
+            log.summary()
+            canvas = box.render(size)
+        return canvas
+
+    print(f"{args.ticks} ticks x {args.lines} lines, width {args.width}")
+    for label, fn in (("tail list + rejoin", legacy), ("ring + parser + view", ring)):
+        samples = [s / args.ticks for s in _timed(fn, args.repeat)[1]]
+        _report(f"{label} per tick", samples)
+
+
+def bench_signal_store(args):
+    """Range query over stored passes: memmapped signal store vs re-parsing the SatDump text logs."""
+    import numpy as np
+    from satdump_log import SatdumpLog
+    from signal_store import SignalStore
+
+    root = tempfile.mkdtemp(prefix="sattrack-signal-")
+    try:
+        store = SignalStore(root)
+        logs = []
+        t_start = 1.7e9
+        for k in range(args.passes):
+            start = t_start + k * 6000.0
+            writer = store.open_pass(f"SAT {k % 5}", 40000 + k % 5, start)
+            lines = []
+            for i in range(args.seconds):
+                snr = 5.0 + 3.0 * np.sin(i / 60.0)
+                writer.append(start + i, snr_db=snr, viterbi=1, deframer=int(snr > 4), servo_az=i * 0.1,
+                              servo_el=30.0, target_az=i * 0.1 + 0.5, target_el=30.0, predicted_el=30.0)
+                stamp = time.strftime("%H:%M:%S - %d/%m/%Y", time.localtime(start + i))
+                lines.append(f"[{stamp}] (I) SNR : {snr:.2f}dB, Peak SNR: 9.00dB")
+                lines.append(f"[{stamp}] (I) Progress, Viterbi : SYNCED BER : 0.010, "
+                             f"Deframer : {'SYNCED' if snr > 4 else 'NOSYNC'}")
+            writer.close(start + args.seconds)
+            logs.append("\n".join(lines))
+        print(f"{args.passes} passes x {args.seconds} s, query the middle {args.window} s of every pass")
+
+        def from_store():
+            out = []
+            for p in store.passes():
+                mid = p.start + args.seconds / 2
+                rows = store.read(p.pass_id, mid - args.window / 2, mid + args.window / 2)
+                out.append(float(np.nanmean(rows["snr_db"])))
+            return out
+
+        def from_logs():
+            out = []
+            for k, text in enumerate(logs):
+                mid = t_start + k * 6000.0 + args.seconds / 2
+                log, snr = SatdumpLog(), []
+                for line in text.splitlines():
+                    for event in log.feed(line):
+                        if hasattr(event, "snr_db") and abs(event.t - mid) <= args.window / 2:
+                            snr.append(event.snr_db)
+                out.append(float(np.mean(snr)))
+            return out
+
+        a, store_samples = _timed(from_store, args.repeat)
+        b, log_samples = _timed(from_logs, max(1, args.repeat // 10))
+        assert np.allclose(a, b, atol=0.01)
+        _report("re-parse text logs", log_samples)
+        _report("signal store memmap", store_samples)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+class _RecordingServo:
+    """servo_controller stand-in that timestamps every azimuth write"""
+
+    def __init__(self):
+        self.azimuth_angle = self.elevation_angle = 0.0
+        self.writes = []
+
+    def set_azimuth(self, angle):
+        self.azimuth_angle = angle
+        self.writes.append(time.monotonic())
+        return True
+
+    def set_elevation(self, angle):
+        self.elevation_angle = angle
+        return True
+
+
+def _write_gaps(writes):
+    gaps = sorted(b - a for a, b in zip(writes, writes[1:]))
+    return gaps[int(0.99 * (len(gaps) - 1))] * 1000, gaps[-1] * 1000, len(writes)
+
+
+def bench_servo_loop(args):
+    """Servo command timing while maps render: writes from the UI tick vs the fixed-rate ServoLoop."""
+    from map_render import MapRenderer
+    from sattrack import ascii_map, colourlist
+    from servo_loop import ServoLoop
+
+    positions, lat, lon = map_scene(args.satellites, args.points)
+    renderer = MapRenderer(ascii_map, hires=True)
+    render = lambda: renderer.render(renderer.overlay(positions, lat, lon, -31.9505, 115.8605, colourlist, len(lat)))
+    command = lambda t: ((t * 10.0) % 200.0 - 100.0, 30.0)
+    period = 1.0 / args.rate
+
+    # before: servo written once per UI tick, after that tick's redraw work
+    servo = _RecordingServo()
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        for _ in range(args.renders):
+            render()
+        az, el = command(time.time())
+        servo.set_azimuth(az)
+        servo.set_elevation(el)
+        time.sleep(period)
+    tick_p99, tick_max, tick_n = _write_gaps(servo.writes)
+
+    servo = _RecordingServo()
+    loop = ServoLoop(servo, command, rate=args.rate)
+    loop.start()
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        for _ in range(args.renders):
+            render()
+        time.sleep(period)
+    loop.stop()
+    loop_p99, loop_max, loop_n = _write_gaps(servo.writes)
+    s = loop.stats()
+
+    print(f"{args.rate:g} Hz target ({period * 1000:.0f} ms), {args.renders} hi-res map renders per UI tick, {args.seconds:g} s each")
+    print(f"{'UI tick':<28} {tick_n / args.seconds:6.1f} writes/s   gap p99 {tick_p99:7.1f} ms   max {tick_max:7.1f} ms")
+    print(f"{'ServoLoop':<28} {loop_n / args.seconds:6.1f} writes/s   gap p99 {loop_p99:7.1f} ms   max {loop_max:7.1f} ms")
+    print(f"ServoLoop jitter p99 {s['jitter_p99_ms']:.2f} ms, max {s['jitter_max_ms']:.2f} ms, "
+          f"{s['overruns']} overruns, {s['missed']} missed slots")
+
+
+def _legacy_glide(servo, start, target, seconds, steps, writers):
+    """The old LabeledSlider.glide_to: a thread stepping linearly from start to target, sleeping between steps."""
+    import threading
+
+    def runner():
+        writers.append(threading.get_ident())
+        for i in range(1, steps + 1):
+            servo.set_azimuth(start + (target - start) * (i / float(steps)))
+            time.sleep(seconds / float(steps))
+        servo.set_azimuth(target)
+        writers.remove(threading.get_ident())
+
+    threading.Thread(target=runner, daemon=True).start()
+
+
+class _PositionServo(_RecordingServo):
+    """_RecordingServo that also keeps every azimuth written, and how many glide threads were writing"""
+
+    def __init__(self, writers=()):
+        super().__init__()
+        self.values = []
+        self.writers = writers
+        self.concurrent = 0
+
+    def set_azimuth(self, angle):
+        self.values.append(angle)
+        self.concurrent = max(self.concurrent, len(self.writers))
+        return super().set_azimuth(angle)
+
+
+def _reversals(values):
+    steps = [b - a for a, b in zip(values, values[1:]) if b != a]
+    return sum(1 for a, b in zip(steps, steps[1:]) if (a > 0) != (b > 0))
+
+
+def bench_motion(args):
+    """Slews through the ServoLoop's trapezoidal profiles vs the old fixed-duration linear glides."""
+    from servo_loop import AxisProfile, ServoLoop, servo_max_accel, servo_max_speed
+
+    dt = 1.0 / args.rate
+    print(f"{args.rate:g} Hz loop, profile limits {servo_max_speed:g} deg/s, {servo_max_accel:g} deg/s^2; "
+          f"old auto-track glide: linear over 2 s")
+    print(f"{'slew':>6}  {'old s':>5} {'peak deg/s':>10} {'start deg/s^2':>13}   {'new s':>5} {'peak deg/s':>10} {'max deg/s^2':>11}")
+    for slew in (2.0, 10.0, 45.0, 90.0, 180.0, 270.0):
+        axis = AxisProfile(-135.0, (-135.0, 135.0))
+        vel, t = [0.0], 0.0
+        while axis.pos != slew - 135.0 or axis.vel != 0.0:
+            axis.step(slew - 135.0, dt)
+            vel.append(axis.vel)
+            t += dt
+        accel = max(abs(b - a) for a, b in zip(vel, vel[1:])) / dt
+        print(f"{slew:6.0f}  {2.0:5.2f} {slew / 2.0:10.1f} {slew / 2.0 / dt:13.0f}   {t:5.2f} {max(vel):10.1f} {accel:11.0f}")
+
+    # two targets 0.5 s apart (space pressed, then the slider moved): 120 -> 0, then -> 60
+    writers = []
+    servo = _PositionServo(writers)
+    servo.azimuth_angle = 120.0
+    _legacy_glide(servo, 120.0, 0.0, 3.0, 100, writers)
+    time.sleep(0.5)
+    _legacy_glide(servo, servo.azimuth_angle, 60.0, 3.0, 100, writers)
+    time.sleep(args.seconds)
+    old = (servo.concurrent, _reversals(servo.values), servo.azimuth_angle)
+
+    servo = _PositionServo()
+    servo.azimuth_angle = 120.0
+    loop = ServoLoop(servo, rate=args.rate)
+    loop.move_to(az=120.0)
+    loop.start()
+    loop.move_to(az=0.0)
+    time.sleep(0.5)
+    loop.move_to(az=60.0)
+    time.sleep(args.seconds)
+    loop.stop()
+    new = (1, _reversals(servo.values), servo.azimuth_angle)
+    print(f"120 -> 0, pre-empted after 0.5 s by -> 60 ({args.seconds:g} s):")
+    for label, (threads, reversals, final) in (("glide threads", old), ("ServoLoop", new)):
+        print(f"  {label:<14} {threads} writer threads, {reversals:3d} direction reversals, ends at {final:.1f} deg")
+
+
+def servo_corpus(n, seed=0):
+    """Random satellite az/el pairs plus the edge cases of the servo conversion.
+
+    Edges: az on the 45 deg grid and at the +-135 limits, az within 1e-7 deg
+    of east/west (where the north component drops under its 1e-9 cut-off),
+    el at the horizon, zenith, nadir and the 75 deg signed-elevation clamp,
+    both signs of zero, and az far outside 0..360.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    edge_az = np.concatenate([np.arange(-720.0, 721.0, 45.0), [-135.0, 135.0, -225.0, 225.0, -0.0],
+                              np.nextafter(135.0, [0.0, 200.0]), np.nextafter(-135.0, [0.0, -200.0]),
+                              90.0 + rng.uniform(-1e-7, 1e-7, 16), -90.0 + rng.uniform(-1e-7, 1e-7, 16)])
+    edge_el = np.array([-90.0, -75.0, -15.0, -0.0, 0.0, 1e-12, 15.0, 75.0, 89.9999999, 90.0,
+                        np.nextafter(90.0, 0.0), np.nextafter(15.0, 0.0)])
+    grid_az, grid_el = (g.ravel() for g in np.meshgrid(edge_az, edge_el))
+    az = np.concatenate([grid_az, rng.uniform(-720.0, 720.0, n), rng.uniform(0.0, 360.0, n)])
+    el = np.concatenate([grid_el, rng.uniform(-90.0, 90.0, n), rng.uniform(0.0, 90.0, n)])
+    return az, el
+
+
+def bench_servo_coords(args):
+    """satellite_to_servo_coords per sample vs trajectory.servo_coords on arrays, and how closely they agree."""
+    import numpy as np
+    from sattrack import satellite_to_servo_coords
+    from trajectory import servo_coords
+
+    az, el = servo_corpus(args.samples, args.seed)
+    pairs = list(zip(az.tolist(), el.tolist()))
+    scalar, scalar_t = _timed(lambda: [satellite_to_servo_coords(a, e) for a, e in pairs], 3)
+    (v_az, v_el, v_flip), array_t = _timed(lambda: servo_coords(az, el), args.repeat)
+
+    s_az, s_el, s_flip = (np.array(c) for c in zip(*scalar))
+    differ = int(np.sum(s_flip != v_flip))
+    print(f"{len(az)} samples ({len(az) - 2 * args.samples} edge cases), seed {args.seed}")
+    print(f"scalar vs array: {differ} flip flags differ, max |d az| {np.max(np.abs(s_az - v_az)):.1e} deg, "
+          f"max |d el| {np.max(np.abs(s_el - v_el)):.1e} deg, "
+          f"{int(np.sum(s_az.view(np.int64) != v_az.view(np.int64)))} az values not bit-identical")
+    _report("scalar per sample", scalar_t)
+    print(f"{'':<28} {np.median(scalar_t) / len(az) * 1e6:.2f} us per call")
+    _report("servo_coords array", array_t)
+    if differ:
+        sys.exit(1)
+
+
+def bench_trajectory(args):
+    """Upcoming passes: per-sample flip decisions vs one whole-pass flip decision from the planner."""
+    import numpy as np
+    from passes import predict_passes
+    from propagation import Propagator
+    from tle_catalog import load_catalog
+    from trajectory import plan_trajectory, servo_coords, total_slew
+
+    sats = load_catalog(tle_file).satellites()[:args.satellites]
+    prop = Propagator(sats, -31.9505, 115.8605)
+    now = time.time()
+    records = predict_passes(prop, now, args.hours * 3600.0, min_elevation=0.0)
+    samples = []
+    for i, passes in enumerate(records):
+        for p in passes:
+            if p.los - p.aos <= 1800:
+                times = np.arange(p.aos, p.los, args.step)
+                if len(times) < 2:
+                    continue
+                az, el = prop.look_angles_pairs(np.full(len(times), i), times)
+                samples.append((times, az, el))
+
+    flip_events, flip_el, plan_el = 0, [], []
+    whole = clamped = 0
+    per_sample_slew = plan_slew = 0.0
+    plan_samples = []
+    for times, az, el in samples:
+        servo_az, servo_el, flipped = servo_coords(az, el)
+        flips = np.flatnonzero(flipped[1:] != flipped[:-1]) + 1
+        flip_events += len(flips)
+        flip_el.extend(el[flips].tolist())
+        per_sample_slew += total_slew(servo_az, servo_el)
+        plan, t = _timed(lambda: plan_trajectory(times, az, el), 1)
+        plan_samples.extend(t)
+        plan_slew += plan.slew_deg
+        whole += plan.changeover is None and plan.feasible
+        clamped += not plan.feasible
+        if plan.changeover is not None:
+            plan_el.append(el[np.searchsorted(times, plan.changeover)])
+
+    median = lambda v: f"{statistics.median(v):.0f}" if v else "-"
+    print(f"{len(samples)} passes from {len(sats)} satellites over {args.hours:g} h, {args.step:g} s samples")
+    print(f"per-sample decision: {flip_events} mid-pass flips, median elevation {median(flip_el)} deg, "
+          f"max {max(flip_el, default=0):.0f}; {per_sample_slew:.0f} deg total slew")
+    print(f"whole-pass plan:     {whole} passes in one configuration, {len(plan_el)} with one changeover "
+          f"(median elevation {median(plan_el)} deg, max {max(plan_el, default=0):.0f}), {clamped} clamped; "
+          f"{plan_slew:.0f} deg total slew")
+    _report("plan one pass", plan_samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("startup", help=bench_startup.__doc__)
+    p.add_argument("--scale", type=int, default=1, help="repeat satellites.txt this many times")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("map", help=bench_map.__doc__)
+    p.add_argument("--satellites", type=int, default=8)
+    p.add_argument("--points", type=int, default=30)
+    p.add_argument("--horizon", type=float, default=30, help="forecast length in minutes")
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=bench_map)
+
+    p = sub.add_parser("telemetry", help=bench_telemetry.__doc__)
+    p.add_argument("--satellites", type=int, default=4)
+    p.add_argument("--ticks", type=int, default=100)
+    p.add_argument("--interval", type=float, default=0.1, help="seconds between UI ticks")
+    p.add_argument("--frame-interval", type=float, default=0.25, help="seconds between background frames")
+    p.add_argument("--width", type=int, default=170)
+    p.add_argument("--alloc-ticks", type=int, default=20, help="ticks traced for the allocation figure")
+    p.set_defaults(func=bench_telemetry)
+
+    p = sub.add_parser("processes", help=bench_processes.__doc__)
+    p.add_argument("--scale", type=int, default=10, help="repeat satellites.txt this many times")
+    p.add_argument("--points", type=int, default=30, help="ground track points per frame")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--seconds", type=float, default=3.0)
+    p.add_argument("--tick", type=float, default=0.01, help="UI tick the latency is measured against")
+    p.set_defaults(func=bench_processes)
+
+    p = sub.add_parser("watcher", help=bench_watcher.__doc__)
+    p.add_argument("--passes", type=int, default=200, help="pass output directories")
+    p.add_argument("--files", type=int, default=20, help="images per pass directory")
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_watcher)
+
+    p = sub.add_parser("decoder-log", help=bench_decoder_log.__doc__)
+    p.add_argument("--ticks", type=int, default=200)
+    p.add_argument("--lines", type=int, default=5, help="SatDump lines arriving per tick")
+    p.add_argument("--width", type=int, default=90)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_decoder_log)
+
+    p = sub.add_parser("signal-store", help=bench_signal_store.__doc__)
+    p.add_argument("--passes", type=int, default=50)
+    p.add_argument("--seconds", type=int, default=900, help="samples per pass")
+    p.add_argument("--window", type=float, default=120)
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_signal_store)
+
+    p = sub.add_parser("servo-loop", help=bench_servo_loop.__doc__)
+    p.add_argument("--rate", type=float, default=20, help="servo command rate in Hz")
+    p.add_argument("--renders", type=int, default=4, help="hi-res map renders per UI tick")
+    p.add_argument("--satellites", type=int, default=8)
+    p.add_argument("--points", type=int, default=60)
+    p.add_argument("--seconds", type=float, default=5.0)
+    p.set_defaults(func=bench_servo_loop)
+
+    p = sub.add_parser("motion", help=bench_motion.__doc__)
+    p.add_argument("--rate", type=float, default=20.0, help="servo loop rate in Hz")
+    p.add_argument("--seconds", type=float, default=4.0, help="how long to let the pre-empted slews run")
+    p.set_defaults(func=bench_motion)
+
+    p = sub.add_parser("servo-coords", help=bench_servo_coords.__doc__)
+    p.add_argument("--samples", type=int, default=50000, help="random samples on top of the edge cases")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_servo_coords)
+
+    p = sub.add_parser("trajectory", help=bench_trajectory.__doc__)
+    p.add_argument("--satellites", type=int, default=20)
+    p.add_argument("--hours", type=float, default=48)
+    p.add_argument("--step", type=float, default=1.0, help="seconds between trajectory samples")
+    p.set_defaults(func=bench_trajectory)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
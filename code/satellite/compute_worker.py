@@ -0,0 +1,127 @@
+import math, threading, time
+from typing import Any, NamedTuple
+
+
+class FrameSnapshot(NamedTuple):
+    """One complete tracker frame, never modified after it is published."""
+    seq: int
+    frame_time: float
+    finished_at: float
+    compute_s: float
+    scores: Any
+    best_sat: Any
+    sat_data: tuple
+    map_display: Any
+
+    def age(self, now=None):
+        return (time.time() if now is None else now) - self.frame_time
+
+
+class DoubleBuffer:
+    """Two snapshot slots: the writer fills the back slot, then flips it to the front."""
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._flip = threading.Lock()
+
+    def publish(self, snapshot):
+        with self._flip:
+            back = 1 - self._front
+            self._slots[back] = snapshot
+            self._front = back
+
+    def latest(self):
+        return self._slots[self._front]
+
+
+class ComputeWorker:
+    """Long-lived thread that computes a frame every ``interval`` seconds.
+
+    ``compute`` is called with the frame's unix time and returns a
+    ``(scores, best_sat, sat_data, map_display)`` tuple, or None when there
+    is nothing to show. Frames are scheduled on a fixed grid; a frame that
+    overruns into later grid slots counts those slots as skipped rather
+    than queueing them up.
+    """
+
+    def __init__(self, compute, interval):
+        self.compute = compute
+        self.interval = max(0.01, float(interval))
+        self.buffer = DoubleBuffer()
+        self.frames = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_compute_s = 0.0
+        self.avg_compute_s = 0.0
+        self._seq = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread = None
+
+    def latest(self):
+        """The most recent complete snapshot, or None before the first frame."""
+        return self.buffer.latest()
+
+    def run_once(self):
+        """Compute and publish one frame on the calling thread."""
+        with self._run_lock:
+            t0 = time.perf_counter()
+            frame_time = time.time()
+            try:
+                result = self.compute(frame_time)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                return None
+            compute_s = time.perf_counter() - t0
+            self.last_compute_s = compute_s
+            self.avg_compute_s = compute_s if not self.frames else 0.9 * self.avg_compute_s + 0.1 * compute_s
+            if result is None:
+                return None
+            scores, best_sat, sat_data, map_display = result
+            self._seq += 1
+            snapshot = FrameSnapshot(self._seq, frame_time, time.time(), compute_s,
+                                     scores, best_sat, tuple(sat_data), map_display)
+            self.buffer.publish(snapshot)
+            self.frames += 1
+            return snapshot
+
+    def _loop(self):
+        next_due = time.monotonic()
+        while not self._stop.is_set():
+            self.run_once()
+            now = time.monotonic()
+            missed = math.floor((now - next_due) / self.interval)
+            if missed > 0:
+                self.skipped += missed
+            next_due += (max(missed, 0) + 1) * self.interval
+            if self._wake.wait(max(0.0, next_due - time.monotonic())):
+                self._wake.clear()
+                next_due = time.monotonic()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def request(self):
+        """Compute the next frame now instead of waiting for the next slot."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self, now=None):
+        snapshot = self.latest()
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "compute_ms": self.last_compute_s * 1000,
+            "avg_compute_ms": self.avg_compute_s * 1000,
+            "age_s": snapshot.age(now) if snapshot is not None else None,
+        }
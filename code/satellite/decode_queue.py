@@ -0,0 +1,396 @@
+import heapq, json, os, signal, subprocess, threading, time
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows): one process at a time should own the jobs file
+    fcntl = None
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+satdump_bin = os.getenv("SATTRACK_SATDUMP_BIN", "satdump")
+decode_workers = int(os.getenv("SATTRACK_DECODE_WORKERS", "0"))
+decode_priority = os.getenv("SATTRACK_DECODE_PRIORITY", "elevation")
+decode_jobs_file = os.path.join(base_dir, "decode_jobs.json")
+decode_history = 200
+
+
+class DecodeJob(NamedTuple):
+    job_id: str
+    iq_file: str
+    sat_name: str
+    out_dir: str
+    submitted: float
+    max_elevation: Optional[float] = None
+    state: str = "queued"
+    attempts: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    returncode: Optional[int] = None
+    size_bytes: int = 0
+    owner: Optional[int] = None
+    updated: float = 0.0
+    owner_start: Optional[int] = None
+
+
+def free_cores():
+    """Cores not already busy, from the load average; at least one, and one is left for the UI and SDR."""
+    cpus = os.cpu_count() or 1
+    try:
+        busy = os.getloadavg()[0]
+    except (OSError, AttributeError):
+        busy = 0.0
+    return max(1, min(cpus - 1, int(cpus - busy)))
+
+
+def _process_start(pid):
+    """Start time of process ``pid`` in clock ticks since boot, or None where /proc can't tell."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        # the command name in field 2 may hold spaces and parentheses; field 22 counts from its end
+        return int(stat[stat.rindex(b")") + 2:].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _alive(pid, start=None):
+    """True while process ``pid`` runs; with ``start`` it must also be the same process, not a reuse of its pid."""
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    if start is not None:
+        now = _process_start(pid)
+        return now is None or now == start
+    return True
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock shared by every process using the jobs file at ``path``."""
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RecordingMarker:
+    """Cross-process "SatDump is receiving live" flag kept next to the jobs file.
+
+    Each recorder (the scheduler's satdump_receiver, the TUI's autotrack
+    run) holds it for the whole pass; a DecodeQueue in any process treats
+    it as a pause. Holders are recorded by pid and process start time, so
+    one left behind by a crashed process stops counting.
+    """
+
+    def __init__(self, jobs_file=None):
+        self.jobs_file = jobs_file or decode_jobs_file
+        self.path = self.jobs_file + ".recording"
+        self.token = f"{os.getpid()}-{id(self)}"
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                holders = json.load(f)
+            return holders if isinstance(holders, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _set(self, held):
+        with _file_lock(self.jobs_file):
+            holders = {token: h for token, h in self._read().items()
+                       if isinstance(h, dict) and _alive(h.get("pid"), h.get("start"))}
+            if held:
+                holders[self.token] = {"pid": os.getpid(), "start": _process_start(os.getpid()), "since": time.time()}
+            else:
+                holders.pop(self.token, None)
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(holders, f)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+    def hold(self):
+        self._set(True)
+
+    def release(self):
+        self._set(False)
+
+    def active(self):
+        """True while a live process holds the marker."""
+        return any(isinstance(h, dict) and _alive(h.get("pid"), h.get("start")) for h in self._read().values())
+
+
+def priority_key(job, policy=None):
+    """Heap key: highest-elevation pass first (newest breaks ties), or plain newest first."""
+    policy = policy or decode_priority
+    if policy == "newest":
+        return (-job.submitted, job.job_id)
+    el = job.max_elevation if job.max_elevation is not None else -90.0
+    return (-el, -job.submitted, job.job_id)
+
+
+class DecodeQueue:
+    """Persistent priority queue of SatDump IQ decodes run by a bounded worker pool.
+
+    Jobs are kept in a JSON file that several processes (the TUI and the
+    headless scheduler) may share: every write happens under a file lock
+    and first merges the file back in, the most recently updated copy of
+    each job winning, and a worker claims a job under the same lock, so a
+    job submitted by one process can be decoded by another but never by
+    both. Jobs left running by a process that has died go back in the
+    queue on load; owners are matched by pid and process start time, so a
+    reused pid doesn't keep a job "running". While ``paused_when()`` is
+    true or any process holds the RecordingMarker (a live recording is in
+    progress) no new decode starts and running decoders are stopped with
+    SIGSTOP, then continued afterwards, so the SDR never competes with them
+    for CPU or disk.
+    """
+
+    def __init__(self, jobs_file=None, workers=None, paused_when=None, policy=None):
+        self.jobs_file = jobs_file or decode_jobs_file
+        self.workers = int(workers or decode_workers or free_cores())
+        self.paused_when = paused_when or (lambda: False)
+        self.marker = RecordingMarker(self.jobs_file)
+        self.policy = policy or decode_priority
+        self.jobs = {}
+        self.paused = False
+        self._heap = []
+        self._procs = {}
+        self._cond = threading.Condition()
+        self._stop = False
+        self._threads = []
+        self._done_bytes = 0
+        self._done_seconds = 0.0
+        self._mtime = None
+        self._load()
+
+    def _load(self):
+        with self._cond, _file_lock(self.jobs_file):
+            self._merge()
+            now = time.time()
+            for job in list(self.jobs.values()):
+                if job.state == "running" and not _alive(job.owner, job.owner_start):
+                    self._put(job._replace(state="queued", started=None, owner=None, owner_start=None, updated=now))
+            self._write()
+
+    def _read(self):
+        try:
+            self._mtime = os.path.getmtime(self.jobs_file)
+            with open(self.jobs_file, encoding="utf-8") as f:
+                return [DecodeJob(**fields) for fields in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+    def _put(self, job):
+        self.jobs[job.job_id] = job
+        if job.state == "queued":
+            heapq.heappush(self._heap, (priority_key(job, self.policy), job.job_id))
+
+    def _merge(self):
+        """Fold the jobs file into memory, keeping the later update of each job; needs the file lock."""
+        for job in self._read():
+            mine = self.jobs.get(job.job_id)
+            if mine is None or job.updated > mine.updated:
+                self._put(job)
+
+    def _write(self):
+        finished = sorted((j for j in self.jobs.values() if j.state in ("done", "failed")),
+                          key=lambda j: j.finished or 0)
+        for old in finished[:-decode_history]:
+            del self.jobs[old.job_id]
+        tmp = self.jobs_file + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump([j._asdict() for j in self.jobs.values()], f)
+            os.replace(tmp, self.jobs_file)
+            self._mtime = os.path.getmtime(self.jobs_file)
+        except OSError:
+            pass
+
+    def _refresh(self):
+        """Pick up jobs other processes wrote since our last read or write."""
+        try:
+            mtime = os.path.getmtime(self.jobs_file)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            with _file_lock(self.jobs_file):
+                self._merge()
+
+    def submit(self, iq_file, sat_name, max_elevation=None, out_dir=None):
+        """Queue ``iq_file`` for decoding; a file already queued or running is not added twice."""
+        with self._cond, _file_lock(self.jobs_file):
+            self._merge()
+            for job in self.jobs.values():
+                if job.iq_file == iq_file and job.state in ("queued", "running"):
+                    return job
+            now = time.time()
+            job = DecodeJob(
+                job_id=f"{int(now * 1000):x}-{os.getpid()}-{len(self.jobs)}",
+                iq_file=iq_file,
+                sat_name=sat_name,
+                out_dir=out_dir or os.path.splitext(iq_file)[0] + "_decoded",
+                submitted=now,
+                max_elevation=None if max_elevation is None else float(max_elevation),
+                updated=now,
+            )
+            self._put(job)
+            self._write()
+            self._cond.notify()
+            return job
+
+    def _update(self, job_id, **changes):
+        with self._cond, _file_lock(self.jobs_file):
+            self._merge()
+            job = self.jobs[job_id]._replace(updated=time.time(), **changes)
+            self.jobs[job_id] = job
+            self._write()
+            return job
+
+    def _claim(self, job_id):
+        """Mark a queued job as running in this process, unless another process got to it first."""
+        with _file_lock(self.jobs_file):
+            self._merge()
+            job = self.jobs.get(job_id)
+            if job is None or job.state != "queued":
+                return None
+            now = time.time()
+            job = job._replace(state="running", owner=os.getpid(), owner_start=_process_start(os.getpid()),
+                               started=now, updated=now)
+            self.jobs[job_id] = job
+            self._write()
+            return job
+
+    def _next_job(self):
+        with self._cond:
+            while not self._stop:
+                if not self.paused:
+                    self._refresh()
+                    while self._heap:
+                        _, job_id = heapq.heappop(self._heap)
+                        job = self.jobs.get(job_id)
+                        if job is not None and job.state == "queued":
+                            job = self._claim(job_id)
+                            if job is not None:
+                                return job
+                self._cond.wait(1.0)
+            return None
+
+    def _run_job(self, job):
+        try:
+            size = os.path.getsize(job.iq_file)
+        except OSError:
+            self._update(job.job_id, state="failed", finished=time.time(), returncode=None, owner=None)
+            return
+        os.makedirs(job.out_dir, exist_ok=True)
+        job = self._update(job.job_id, attempts=job.attempts + 1, size_bytes=size)
+        cmd = [satdump_bin, "decode", job.sat_name, job.iq_file, "--outdir", job.out_dir]
+        with open(os.path.join(job.out_dir, "decode.log"), "ab") as log:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT)
+            with self._cond:
+                self._procs[job.job_id] = proc
+                if self.paused:
+                    self._signal(proc, "SIGSTOP")
+            returncode = proc.wait()
+        with self._cond:
+            self._procs.pop(job.job_id, None)
+        if self._stop and returncode != 0:
+            # interrupted by shutdown: leave it queued for the next start
+            self._update(job.job_id, state="queued", started=None, owner=None)
+            return
+        finished = time.time()
+        state = "done" if returncode == 0 else "failed"
+        if state == "done":
+            with self._cond:
+                self._done_bytes += size
+                self._done_seconds += finished - job.started
+        self._update(job.job_id, state=state, finished=finished, returncode=returncode, owner=None)
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                self._run_job(job)
+            except Exception:
+                self._update(job.job_id, state="failed", finished=time.time(), owner=None)
+
+    @staticmethod
+    def _signal(proc, name):
+        sig = getattr(signal, name, None)
+        if sig is not None and proc.poll() is None:
+            try:
+                proc.send_signal(sig)
+            except OSError:
+                pass
+
+    def _watch_pause(self):
+        while not self._stop:
+            try:
+                paused = bool(self.paused_when()) or self.marker.active()
+            except Exception:
+                paused = False
+            with self._cond:
+                if paused != self.paused:
+                    self.paused = paused
+                    for proc in self._procs.values():
+                        self._signal(proc, "SIGSTOP" if paused else "SIGCONT")
+                    self._cond.notify_all()
+                self._cond.wait(0.5)
+
+    def start(self):
+        if self._threads:
+            return
+        self._threads = [threading.Thread(target=self._watch_pause, daemon=True)]
+        self._threads += [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        """Stop taking jobs and end running decoders; they are resumed on the next start."""
+        with self._cond:
+            self._stop = True
+            for proc in self._procs.values():
+                self._signal(proc, "SIGCONT")
+                if proc.poll() is None:
+                    proc.terminate()
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            states = [j.state for j in self.jobs.values()]
+            return {
+                "queued": states.count("queued"),
+                "running": states.count("running"),
+                "done": states.count("done"),
+                "failed": states.count("failed"),
+                "workers": self.workers,
+                "paused": self.paused,
+                "throughput_mb_s": self._done_bytes / 1e6 / self._done_seconds if self._done_seconds else None,
+            }
+
+    def status_text(self):
+        """One-line colour-markup summary for the decoder panel."""
+        s = self.stats()
+        text = f"Queue {s['queued']} | Running {s['running']}/{s['workers']} | Done {s['done']}"
+        if s["failed"]:
+            text += f" | [red]Failed {s['failed']}[/red]"
+        if s["throughput_mb_s"] is not None:
+            text += f" | {s['throughput_mb_s']:.1f} MB/s"
+        if s["paused"]:
+            text += " | [yellow]paused while recording[/yellow]"
+        return text
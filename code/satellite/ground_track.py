@@ -0,0 +1,40 @@
+import math
+import numpy as np
+
+
+class GroundTrackCache:
+    """Rolling forecast subpoints for every satellite of a Propagator.
+
+    Forecast times sit on a fixed grid of absolute unix multiples of
+    ``step``, so moving the window forward only drops the samples that
+    have expired and propagates the newly exposed tail; between grid
+    ticks an update propagates nothing at all.
+    """
+
+    def __init__(self, propagator, points, horizon_s):
+        self.propagator = propagator
+        self.points = max(1, int(points))
+        self.step = max(1.0, float(horizon_s) / max(1, self.points - 1))
+        self.first_k = None
+        self.lat = np.empty((len(propagator), 0))
+        self.lon = np.empty((len(propagator), 0))
+
+    def update(self, now):
+        """Return (lat, lon) arrays of shape (n_satellites, points) starting at the first grid time >= now."""
+        first_k = math.ceil(now / self.step)
+        if self.first_k is None or first_k - self.first_k >= self.lat.shape[1] or first_k < self.first_k:
+            keep = 0
+        else:
+            keep = self.lat.shape[1] - (first_k - self.first_k)
+        lat = self.lat[:, self.lat.shape[1] - keep:]
+        lon = self.lon[:, self.lon.shape[1] - keep:]
+
+        missing = self.points - keep
+        if missing > 0:
+            times = (first_k + keep + np.arange(missing)) * self.step
+            tail = self.propagator.propagate_unix(times)
+            lat = np.concatenate([lat, tail.lat], axis=1)
+            lon = np.concatenate([lon, tail.lon], axis=1)
+
+        self.first_k, self.lat, self.lon = first_k, lat, lon
+        return lat, lon
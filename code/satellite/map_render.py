@@ -0,0 +1,138 @@
+import os
+import numpy as np
+
+map_hires = os.getenv("SATTRACK_MAP_HIRES", "1") != "0"
+braille_base = 0x2800
+# dot bit for sub-cell pixel (row 0-3, column 0-1) of a braille character
+braille_bits = np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]], dtype=np.uint8)
+
+
+class MapRenderer:
+    """Equirectangular map drawn straight to urwid text markup.
+
+    The background rows are joined into strings once. A frame is a sparse
+    overlay of ``(row, col) -> (attr, char)`` cells: rows without overlay
+    cells are emitted as their cached string, and rows with cells are split
+    around them, so nothing is rebuilt or reparsed for the untouched map.
+
+    With ``hires`` the forecast tracks are drawn on the 2x4 dot grid inside
+    each braille character (8x the cells) as continuous polylines, and the
+    track dots are OR-ed into the coastline glyph of every cell they cross.
+    A cell takes the colour of the highest-numbered track passing through it.
+    """
+
+    def __init__(self, base_map, hires=None):
+        self.rows = ["".join(row) for row in base_map]
+        self.h = len(self.rows)
+        self.w = len(self.rows[0]) if self.rows else 0
+        self.hires = map_hires if hires is None else hires
+        codes = np.array([[ord(ch) for ch in row] for row in self.rows], dtype=np.int64).reshape(self.h, self.w)
+        is_braille = (codes >= braille_base) & (codes <= braille_base + 0xFF)
+        self.base_bits = np.where(is_braille, codes - braille_base, 0).astype(np.uint8).ravel()
+
+    def pixels(self, lat, lon):
+        """Sub-cell dot coordinates (y, x) as floats, on a grid of 4 rows x 2 columns per cell."""
+        y = (90.0 - np.asarray(lat, dtype=float)) / 180.0 * (self.h * 4)
+        x = (np.asarray(lon, dtype=float) + 180.0) / 360.0 * (self.w * 2)
+        return y, x
+
+    def cells(self, lat, lon):
+        """Vectorised map cell (rows, cols) for arrays of latitude/longitude in degrees."""
+        if self.hires:
+            y, x = self.pixels(lat, lon)
+            rows, cols = np.floor(y / 4).astype(int), np.floor(x / 2).astype(int)
+        else:
+            rows = ((90.0 - np.asarray(lat, dtype=float)) / 180.0 * (self.h - 1)).astype(int)
+            cols = ((np.asarray(lon, dtype=float) + 180.0) / 360.0 * (self.w - 1)).astype(int)
+        return np.clip(rows, 0, self.h - 1), np.clip(cols, 0, self.w - 1)
+
+    def track_dots(self, lat, lon):
+        """Dots (track, y, x) of the polylines through each row of ``lat``/``lon`` (n_tracks, n_points).
+
+        Longitude is unwrapped first so a segment crossing the antimeridian
+        is drawn the short way round and wrapped back onto the map.
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.degrees(np.unwrap(np.radians(np.asarray(lon, dtype=float)), axis=1))
+        y, x = self.pixels(lat, lon)
+        n_tracks, n_points = y.shape
+        if n_points < 2:
+            track = np.repeat(np.arange(n_tracks), n_points)
+            return track, y.ravel(), x.ravel()
+        y0, x0 = y[:, :-1].ravel(), x[:, :-1].ravel()
+        dy, dx = np.diff(y, axis=1).ravel(), np.diff(x, axis=1).ravel()
+        steps = np.maximum(np.ceil(np.maximum(np.abs(dy), np.abs(dx))), 1).astype(int)
+        seg = np.repeat(np.arange(len(steps)), steps)
+        offsets = np.cumsum(steps) - steps
+        u = (np.arange(len(seg)) - offsets[seg]) / steps[seg]
+        track = seg // (n_points - 1)
+        ys = np.concatenate([y0[seg] + u * dy[seg], y[:, -1]])
+        xs = np.concatenate([x0[seg] + u * dx[seg], x[:, -1]])
+        return np.concatenate([track, np.arange(n_tracks)]), ys, xs
+
+    def track_cells(self, lat, lon, colours):
+        """Overlay cells for hi-res tracks: coastline bits OR track bits, coloured per track."""
+        track, y, x = self.track_dots(lat, lon)
+        yi = np.clip(np.floor(y).astype(int), 0, self.h * 4 - 1)
+        xi = np.floor(x).astype(int) % (self.w * 2)
+        idx = (yi >> 2) * self.w + (xi >> 1)
+        bits = np.zeros(self.h * self.w, dtype=np.uint8)
+        np.bitwise_or.at(bits, idx, braille_bits[yi & 3, xi & 1])
+        owner = np.full(self.h * self.w, -1)
+        np.maximum.at(owner, idx, track)
+
+        touched = np.flatnonzero(bits)
+        glyphs = (self.base_bits[touched] | bits[touched]).astype(np.int64) + braille_base
+        return {(i // self.w, i % self.w): (colours[t % len(colours)], chr(g))
+                for i, t, g in zip(touched.tolist(), owner[touched].tolist(), glyphs.tolist())}
+
+    def overlay(self, positions, forecast_lat, forecast_lon, observer_lat, observer_lon, colours, max_tracks):
+        """Overlay cells for forecast tracks, the observer and current positions, later ones on top."""
+        cells = {}
+        n = min(len(forecast_lat), max_tracks)
+        if n and self.hires:
+            cells = self.track_cells(forecast_lat[:n], forecast_lon[:n], colours)
+        elif n:
+            rows, cols = self.cells(forecast_lat[:n], forecast_lon[:n])
+            for i, (track_rows, track_cols) in enumerate(zip(rows.tolist(), cols.tolist())):
+                mark = (colours[i % len(colours)], "*")
+                for r, c in zip(track_rows, track_cols):
+                    cells[r, c] = mark
+
+        r, c = self.cells(observer_lat, observer_lon)
+        cells[int(r), int(c)] = ("red", "O")
+
+        if positions:
+            rows, cols = self.cells([p[0] for p in positions], [p[1] for p in positions])
+            for i, (r, c) in enumerate(zip(rows.tolist(), cols.tolist())):
+                cells[r, c] = (colours[i % len(colours)], str(i + 1))
+        return cells
+
+    def render(self, cells):
+        """urwid markup for the background with ``cells`` drawn over it."""
+        by_row = {}
+        for (r, c), cell in cells.items():
+            by_row.setdefault(r, []).append((c, cell))
+
+        markup = []
+        plain = []
+        last = self.h - 1
+        for r, row in enumerate(self.rows):
+            end = "\n" if r < last else ""
+            overlay = by_row.get(r)
+            if not overlay:
+                plain.append(row + end)
+                continue
+            pos = 0
+            for c, (attr, ch) in sorted(overlay, key=lambda item: item[0]):
+                if c > pos:
+                    plain.append(row[pos:c])
+                if plain:
+                    markup.append("".join(plain))
+                    plain = []
+                markup.append((attr, ch))
+                pos = c + 1
+            plain.append(row[pos:] + end)
+        if plain:
+            markup.append("".join(plain))
+        return markup
@@ -0,0 +1,200 @@
+import ctypes, ctypes.util, os, select, struct, threading, time
+from collections import deque
+from pathlib import Path
+
+watch_backend = os.getenv("SATTRACK_OUTPUT_WATCH", "auto")
+watch_interval = float(os.getenv("SATTRACK_OUTPUT_WATCH_INTERVAL", "1.0"))
+image_extensions = (".png", ".jpg", ".jpeg", ".bmp")
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+watch_mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+event_header = struct.Struct("iIII")
+
+
+def _inotify_libc():
+    """libc with the inotify calls, or None where they are not available."""
+    if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class OutputWatcher:
+    """Reports image products appearing anywhere under ``root`` from a daemon thread.
+
+    With inotify every directory is watched and a product is reported once
+    its writer closes it (or it is moved in), so nothing is ever re-listed.
+    Without inotify each poll only stats the directories; a directory is
+    listed again only when its mtime moved, and files are picked out by
+    ctime against a per-directory watermark, so memory is O(directories)
+    rather than O(files seen). Files are reported after ``settle`` seconds
+    without change so half-written images are not announced.
+
+    The UI thread only calls ``drain()``, which pops from a bounded deque
+    and never touches the filesystem.
+    """
+
+    def __init__(self, root, extensions=image_extensions, backend=None, interval=None,
+                 settle=1.0, max_pending=256):
+        self.root = Path(root)
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.interval = watch_interval if interval is None else float(interval)
+        self.settle = float(settle)
+        self.pending = deque(maxlen=max_pending)
+        self.reported = 0
+        self.dropped = 0
+        self.last_error = None
+        backend = backend or watch_backend
+        self._libc = _inotify_libc() if backend in ("auto", "inotify") else None
+        self.backend = "inotify" if self._libc is not None else "scan"
+        self._index = {}
+        self._watches = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _wanted(self, name):
+        return name.lower().endswith(self.extensions)
+
+    def _emit(self, path):
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(Path(path))
+        self.reported += 1
+
+    def drain(self, max_n=100):
+        """New product paths since the last call, oldest first; never blocks."""
+        out = []
+        try:
+            while len(out) < max_n:
+                out.append(self.pending.popleft())
+        except IndexError:
+            pass
+        return out
+
+    def _scan_dir(self, path, entry, cutoff):
+        """Emit settled products newer than the directory's watermark and record its subdirectories."""
+        last_mark = entry[1]
+        subdirs, unsettled = [], False
+        try:
+            with os.scandir(path) as it:
+                for de in it:
+                    if de.is_dir(follow_symlinks=False):
+                        subdirs.append(de.path)
+                    elif self._wanted(de.name):
+                        changed = de.stat(follow_symlinks=False).st_ctime_ns
+                        if changed > cutoff:
+                            unsettled = True
+                        elif last_mark is not None and changed > last_mark:
+                            self._emit(de.path)
+        except OSError:
+            return
+        entry[1:] = [cutoff, unsettled, subdirs]
+
+    def _poll(self, baseline=False):
+        now = time.time_ns()
+        cutoff = now - int(self.settle * 1e9)
+        stack, seen = [str(self.root)], set()
+        while stack:
+            path = stack.pop()
+            seen.add(path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            entry = self._index.get(path)
+            if entry is None:
+                # [dir mtime, ctime watermark, has unsettled files, subdirectories];
+                # a directory that appears after the baseline reports everything in it
+                entry = self._index[path] = [None, None if baseline else 0, False, []]
+            if entry[0] != mtime or entry[2]:
+                entry[0] = mtime
+                self._scan_dir(path, entry, cutoff)
+            stack.extend(entry[3])
+        for gone in set(self._index) - seen:
+            del self._index[gone]
+
+    def _run_scan(self):
+        self._poll(baseline=True)
+        while not self._stop.wait(self.interval):
+            try:
+                self._poll()
+            except Exception as e:
+                self.last_error = e
+
+    def _add_watch(self, fd, path):
+        wd = self._libc.inotify_add_watch(fd, os.fsencode(path), watch_mask)
+        if wd >= 0:
+            self._watches[wd] = path
+
+    def _watch_tree(self, fd, path, report):
+        for dirpath, dirnames, filenames in os.walk(path):
+            self._add_watch(fd, dirpath)
+            if report:
+                for name in filenames:
+                    if self._wanted(name):
+                        self._emit(os.path.join(dirpath, name))
+
+    def _run_inotify(self):
+        fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            self.backend = "scan"
+            return self._run_scan()
+        try:
+            self._watch_tree(fd, str(self.root), report=False)
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                buf = os.read(fd, 64 * 1024)
+                pos = 0
+                while pos + event_header.size <= len(buf):
+                    wd, mask, _, length = event_header.unpack_from(buf, pos)
+                    pos += event_header.size
+                    name = buf[pos:pos + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                    pos += length
+                    if mask & IN_Q_OVERFLOW:
+                        # events were lost; re-arm watches without re-announcing old files
+                        self.dropped += 1
+                        self._watch_tree(fd, str(self.root), report=False)
+                        continue
+                    if mask & IN_IGNORED:
+                        self._watches.pop(wd, None)
+                        continue
+                    parent = self._watches.get(wd)
+                    if parent is None or not name:
+                        continue
+                    path = os.path.join(parent, name)
+                    if mask & IN_ISDIR:
+                        if mask & (IN_CREATE | IN_MOVED_TO):
+                            self._watch_tree(fd, path, report=True)
+                    elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and self._wanted(name):
+                        self._emit(path)
+        except Exception as e:
+            self.last_error = e
+        finally:
+            os.close(fd)
+            self._watches.clear()
+
+    def start(self):
+        """Take a baseline of ``root`` (creating it if needed) and watch it from a daemon thread."""
+        if self._thread is not None:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        target = self._run_inotify if self.backend == "inotify" else self._run_scan
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,131 @@
+import json, math, os
+from passes import PassRecord, predict_passes
+from propagation import Propagator
+
+pass_cache_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "passes_cache.json")
+pass_cache_days = float(os.getenv("SATTRACK_PASS_CACHE_DAYS", "3"))
+pass_cache_max_move_km = float(os.getenv("SATTRACK_PASS_CACHE_KM", "5"))
+pass_cache_version = 1
+
+
+def tle_epoch(sat):
+    """TLE epoch of an EarthSatellite as a Julian date, rounded well below a millisecond."""
+    return round(sat.model.jdsatepoch + sat.model.jdsatepochF, 9)
+
+
+def catalog_number(sat):
+    return str(sat.model.satnum)
+
+
+def _distance_km(lat1, lon1, lat2, lon2):
+    rlat1, rlon1, rlat2, rlon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    a = math.sin((rlat2 - rlat1) / 2) ** 2 + math.cos(rlat1) * math.cos(rlat2) * math.sin((rlon2 - rlon1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(min(1.0, a)))
+
+
+def _predict(propagator, start, duration, min_elevation):
+    shard_predict = getattr(propagator, "predict_passes", None)
+    if shard_predict is not None:
+        return shard_predict(start, duration, min_elevation)
+    return predict_passes(propagator, start, duration, min_elevation)
+
+
+class PassCache:
+    """On-disk pass schedule, one entry per catalog number.
+
+    An entry is reused while its TLE epoch matches the loaded satellite,
+    the observer is within ``max_move_km`` of where it was computed and it
+    still covers the requested horizon. Stale or short entries are
+    recomputed together in one batched prediction and written back.
+    Entries of other satellites are kept, so switching targets never
+    throws predictions away; only entries whose prediction window has
+    ended, or that were computed for an observer more than ``max_move_km``
+    away, are expired.
+    """
+
+    def __init__(self, observer_lat, observer_lon, min_elevation=20, path=None,
+                 days=None, max_move_km=None):
+        self.path = path or pass_cache_file
+        self.observer_lat = round(float(observer_lat), 3)
+        self.observer_lon = round(float(observer_lon), 3)
+        self.min_elevation = float(min_elevation)
+        self.days = pass_cache_days if days is None else float(days)
+        self.max_move_km = pass_cache_max_move_km if max_move_km is None else float(max_move_km)
+        self.entries = self._load()
+        self.last_predicted = 0
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != pass_cache_version:
+                return {}
+            return data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": pass_cache_version, "entries": self.entries}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _valid(self, entry, sat, now, horizon):
+        return (entry is not None
+                and entry.get("epoch") == tle_epoch(sat)
+                and entry.get("min_el") == self.min_elevation
+                and entry.get("end", 0) >= now + horizon
+                and _distance_km(entry.get("lat", 0), entry.get("lon", 0),
+                                 self.observer_lat, self.observer_lon) <= self.max_move_km)
+
+    def _expired(self, entry, now):
+        """True for an entry no satellite or observer here can reuse: its window is over, or it was for another site."""
+        return (entry.get("end", 0) < now
+                or _distance_km(entry.get("lat", 0), entry.get("lon", 0),
+                                self.observer_lat, self.observer_lon) > self.max_move_km)
+
+    def passes(self, satellites, now, horizon, propagator=None):
+        """PassRecord lists for ``satellites`` covering at least [now, now + horizon].
+
+        ``propagator`` may cover exactly ``satellites``; it is used when every
+        entry needs predicting, so a process-sharded propagator can do the batch.
+        """
+        horizon = max(horizon, 0.0)
+        result = [None] * len(satellites)
+        missing = []
+        for i, sat in enumerate(satellites):
+            entry = self.entries.get(catalog_number(sat))
+            if self._valid(entry, sat, now, horizon):
+                entry["passes"] = [p for p in entry["passes"] if p[2] >= now]
+                result[i] = [PassRecord(sat.name, *p) for p in entry["passes"]]
+            else:
+                missing.append(i)
+
+        self.last_predicted = len(missing)
+        expired = [key for key, entry in self.entries.items() if self._expired(entry, now)]
+        for key in expired:
+            del self.entries[key]
+        if missing:
+            window = max(horizon, self.days * 86400.0)
+            if propagator is not None and len(missing) == len(satellites):
+                predicted = _predict(propagator, now, window, self.min_elevation)
+            else:
+                prop = Propagator([satellites[i] for i in missing], self.observer_lat, self.observer_lon)
+                predicted = predict_passes(prop, now, window, self.min_elevation)
+            for i, passes in zip(missing, predicted):
+                sat = satellites[i]
+                result[i] = passes
+                self.entries[catalog_number(sat)] = {
+                    "epoch": tle_epoch(sat),
+                    "lat": self.observer_lat,
+                    "lon": self.observer_lon,
+                    "min_el": self.min_elevation,
+                    "end": now + window,
+                    "passes": [list(p[1:]) for p in passes],
+                }
+        if missing or expired:
+            self.save()
+        return result
@@ -0,0 +1,157 @@
+from typing import NamedTuple
+import numpy as np
+
+pass_sample_step = 120.0
+slow_orbit_rad_per_min = 2 * np.pi / 240.0
+slow_orbit_step_factor = 10
+pass_peak_margin = 5.0
+pass_time_tolerance = 0.5
+pass_chunk_samples = 1440
+
+
+class PassRecord(NamedTuple):
+    """One pass above ``min_elevation``; times are unix seconds, angles degrees.
+
+    ``aos``/``los`` are clipped to the prediction window when the pass was
+    already in progress at its start or continues past its end.
+    """
+    sat_name: str
+    aos: float
+    tca: float
+    los: float
+    max_el: float
+    aos_az: float
+    los_az: float
+
+    def seconds_until(self, now):
+        return max(0.0, self.aos - now)
+
+    def in_progress(self, now):
+        return self.aos <= now <= self.los
+
+
+def _bisect_crossing(propagator, sat_idx, t_below, t_above, min_elevation):
+    """Vectorised bisection for el == min_elevation between paired brackets."""
+    lo = np.array(t_below, dtype=float)
+    hi = np.array(t_above, dtype=float)
+    while len(lo) and np.max(np.abs(hi - lo)) > pass_time_tolerance:
+        mid = 0.5 * (lo + hi)
+        _, el = propagator.look_angles_pairs(sat_idx, mid)
+        above = el > min_elevation
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    return hi
+
+
+def _refine_peak(propagator, sat_idx, lo, hi):
+    """Vectorised golden-section search for the elevation maximum in [lo, hi]."""
+    inv_phi = (np.sqrt(5.0) - 1.0) / 2.0
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    a = hi - inv_phi * (hi - lo)
+    b = lo + inv_phi * (hi - lo)
+    _, fa = propagator.look_angles_pairs(sat_idx, a)
+    _, fb = propagator.look_angles_pairs(sat_idx, b)
+    while len(lo) and np.max(hi - lo) > pass_time_tolerance:
+        left = fa > fb
+        hi = np.where(left, b, hi)
+        lo = np.where(left, lo, a)
+        new = np.where(left, hi - inv_phi * (hi - lo), lo + inv_phi * (hi - lo))
+        _, f_new = propagator.look_angles_pairs(sat_idx, new)
+        a, b, fa, fb = (np.where(left, new, b), np.where(left, a, new),
+                        np.where(left, f_new, fb), np.where(left, fa, f_new))
+    tca = 0.5 * (lo + hi)
+    _, el = propagator.look_angles_pairs(sat_idx, tca)
+    return tca, el
+
+
+def _scan_group(propagator, indices, start, duration, step, min_elevation):
+    """Coarse-sample one group of satellites and refine its passes.
+
+    Returns flat arrays (sat_idx, tca, max_el, aos, los) over all passes found.
+    """
+    grid = start + np.arange(0.0, duration + step, step)
+    grid[-1] = min(grid[-1], start + duration)
+    n = len(grid)
+    el = np.empty((len(indices), n))
+    for i in range(0, n, pass_chunk_samples):
+        _, el[:, i:i + pass_chunk_samples] = propagator.look_angles_unix(grid[i:i + pass_chunk_samples], indices)
+    el = np.nan_to_num(el, nan=-90.0) - min_elevation
+
+    padded = np.pad(el, ((0, 0), (1, 1)), constant_values=-np.inf)
+    peaks = (padded[:, 1:-1] >= padded[:, :-2]) & (padded[:, 1:-1] > padded[:, 2:]) & (el > -pass_peak_margin)
+    row, k = np.nonzero(peaks)
+
+    # nearest grid sample at or below the threshold on each side of a peak
+    idx = np.broadcast_to(np.arange(n), el.shape)
+    below = el <= 0
+    last_below = np.maximum.accumulate(np.where(below, idx, -1), axis=1)[row, k]
+    next_below = np.minimum.accumulate(np.where(below, idx, n)[:, ::-1], axis=1)[:, ::-1][row, k]
+    # a grazing pass may clear the threshold only between samples: its peak sample is below
+    # too, so bracket AOS and LOS with the (lower) neighbours on either side of the peak
+    grazing = below[row, k]
+    last_below = np.where(grazing, np.maximum(k - 1, 0), last_below)
+    next_below = np.where(grazing, np.minimum(k + 1, n - 1), next_below)
+
+    # one candidate per (satellite, bracket); plateaus and wobbles yield duplicates
+    if len(row):
+        _, first = np.unique(np.stack([row, last_below, next_below], axis=1), axis=0, return_index=True)
+        row, k, last_below, next_below = row[first], k[first], last_below[first], next_below[first]
+    sat_idx = np.asarray(indices, dtype=int)[row]
+
+    tca, max_el = _refine_peak(propagator, sat_idx, grid[np.maximum(k - 1, 0)], grid[np.minimum(k + 1, n - 1)])
+    keep = max_el > min_elevation
+    sat_idx, tca, max_el = sat_idx[keep], tca[keep], max_el[keep]
+    last_below, next_below = last_below[keep], next_below[keep]
+
+    aos = np.full(len(sat_idx), grid[0])
+    rising = last_below >= 0
+    aos[rising] = _bisect_crossing(propagator, sat_idx[rising], grid[last_below[rising]], tca[rising], min_elevation)
+    los = np.full(len(sat_idx), grid[-1])
+    setting = next_below < n
+    los[setting] = _bisect_crossing(propagator, sat_idx[setting], grid[next_below[setting]], tca[setting], min_elevation)
+    ok = (aos <= tca) & (tca <= los) & (aos < los)
+    return sat_idx[ok], tca[ok], max_el[ok], aos[ok], los[ok]
+
+
+def predict_passes(propagator, start, duration, min_elevation=0.0, step=None):
+    """Predict every pass of every satellite in ``propagator`` over a window.
+
+    Elevations are sampled on a coarse grid for all satellites in one batched
+    call; local maxima within ``pass_peak_margin`` of the threshold are then
+    refined by golden-section search (so passes shorter than a sample step
+    are not lost) and AOS/LOS by bisection, all vectorised across passes.
+    High orbits (GEO, Molniya) change slowly and are sampled more coarsely.
+    Returns a list of PassRecord lists, one per satellite, sorted by AOS.
+    """
+    step = float(step or pass_sample_step)
+    n_sats = len(propagator)
+    out = [[] for _ in range(n_sats)]
+    if n_sats == 0 or duration <= 0:
+        return out
+
+    # mean motion in rad/min; below the cutoff an orbit takes more than four hours
+    motion = np.array([sat.model.no_kozai for sat in propagator.satellites])
+    slow = motion < slow_orbit_rad_per_min
+    results = []
+    for indices, group_step in ((np.nonzero(~slow)[0], step), (np.nonzero(slow)[0], step * slow_orbit_step_factor)):
+        if len(indices):
+            results.append(_scan_group(propagator, indices, start, duration, group_step, min_elevation))
+    sat_idx, tca, max_el, aos, los = (np.concatenate(cols) for cols in zip(*results))
+
+    aos_az, _ = propagator.look_angles_pairs(sat_idx, aos)
+    los_az, _ = propagator.look_angles_pairs(sat_idx, los)
+
+    for j in np.argsort(aos, kind="stable"):
+        s = int(sat_idx[j])
+        out[s].append(PassRecord(propagator.satellites[s].name, float(aos[j]), float(tca[j]), float(los[j]),
+                                 float(max_el[j]), float(aos_az[j]), float(los_az[j])))
+    return out
+
+
+def next_pass(passes, now):
+    """First pass in ``passes`` that has not yet ended at ``now``."""
+    for p in passes:
+        if p.los >= now:
+            return p
+    return None
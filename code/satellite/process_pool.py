@@ -0,0 +1,113 @@
+import multiprocessing, os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from passes import predict_passes
+from propagation import Propagator, PropagationResult, skyfield_time_to_jd, unix_to_jd
+from tle_catalog import SnapshotSatellite, satrec_elements
+
+compute_processes = int(os.getenv("SATTRACK_COMPUTE_PROCS", "0"))
+result_fields = ("lat", "lon", "alt_km", "az", "el", "range_km", "range_rate_km_s", "speed_m_s")
+
+_shard = None
+
+
+def _init_shard(elements, names, observer):
+    global _shard
+    _shard = Propagator([SnapshotSatellite(e, n) for e, n in zip(elements, names)], *observer)
+
+
+def _propagate_shard(whole, frac, ut1):
+    res = _shard._propagate_all(whole, frac, ut1)
+    return np.stack([getattr(res, f) for f in result_fields]), res.error
+
+
+def _topocentric_shard(whole, frac, ut1):
+    _, r, _ = _shard._array.sgp4(whole, frac)
+    x, y, z, _, _ = _shard._earth_fixed(r, whole, ut1)
+    az, el, rng, _, _, _ = _shard._topocentric(x, y, z)
+    return np.stack([az, el, rng])
+
+
+def _passes_shard(start, duration, min_elevation, step):
+    return predict_passes(_shard, start, duration, min_elevation, step)
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    # never fork the threaded UI process itself
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ProcessPropagator(Propagator):
+    """Propagator whose batched calls are sharded across worker processes.
+
+    Each worker owns a contiguous slice of the satellites, rebuilt once from
+    their SGP4 elements, so only time arrays go out and stacked float arrays
+    come back; no skyfield objects are pickled. Whole-list propagation,
+    topocentric look angles and pass prediction run on the shards in
+    parallel; the small per-satellite calls used for pointing stay
+    in-process through the base class.
+    """
+
+    def __init__(self, satellites, observer_lat, observer_lon, observer_alt_m=0.0, workers=None):
+        super().__init__(satellites, observer_lat, observer_lon, observer_alt_m)
+        workers = max(1, min(int(workers or compute_processes or 1), len(self.satellites) or 1))
+        elements = satrec_elements(self._satrecs)
+        names = [sat.name for sat in self.satellites]
+        observer = (self.observer_lat, self.observer_lon, self.observer_alt_m)
+        bounds = np.linspace(0, len(self.satellites), workers + 1).astype(int)
+        self._shards = []
+        ctx = _context()
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if hi > lo:
+                pool = ProcessPoolExecutor(1, mp_context=ctx, initializer=_init_shard,
+                                           initargs=(elements[lo:hi], names[lo:hi], observer))
+                self._shards.append(pool)
+
+    @property
+    def workers(self):
+        return len(self._shards)
+
+    def _map(self, fn, *args):
+        futures = [pool.submit(fn, *args) for pool in self._shards]
+        return [f.result() for f in futures]
+
+    def _propagate_all(self, whole, frac, ut1):
+        if not self._shards:
+            return super()._propagate_all(whole, frac, ut1)
+        parts = self._map(_propagate_shard, whole, frac, ut1)
+        stacked = np.concatenate([p[0] for p in parts], axis=1)
+        error = np.concatenate([p[1] for p in parts], axis=0)
+        return PropagationResult(self._unix(whole, frac), *stacked, error=error)
+
+    def topocentric(self, t):
+        if not self._shards:
+            return super().topocentric(t)
+        az, el, rng = np.concatenate(self._map(_topocentric_shard, *skyfield_time_to_jd(t)), axis=1)
+        return az, el, rng
+
+    def look_angles_unix(self, unix, indices=None):
+        if indices is not None or not self._shards:
+            return super().look_angles_unix(unix, indices)
+        az, el, _ = np.concatenate(self._map(_topocentric_shard, *unix_to_jd(unix)), axis=1)
+        return az, el
+
+    def predict_passes(self, start, duration, min_elevation=0.0, step=None):
+        """``passes.predict_passes`` over every shard in parallel; one PassRecord list per satellite."""
+        result = []
+        for part in self._map(_passes_shard, start, duration, min_elevation, step):
+            result.extend(part)
+        return result
+
+    def close(self):
+        for pool in self._shards:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._shards = []
+
+
+def make_propagator(satellites, observer_lat, observer_lon, workers=None):
+    """ProcessPropagator when SATTRACK_COMPUTE_PROCS (or ``workers``) asks for processes, else Propagator."""
+    workers = compute_processes if workers is None else workers
+    if workers > 0 and satellites:
+        return ProcessPropagator(satellites, observer_lat, observer_lon, workers=workers)
+    return Propagator(satellites, observer_lat, observer_lon)
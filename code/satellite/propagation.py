@@ -0,0 +1,227 @@
+import numpy as np
+from sgp4.api import SatrecArray
+from skyfield.sgp4lib import theta_GMST1982
+
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+EARTH_ROTATION_RAD_S = 7.292115146706979e-5
+UNIX_EPOCH_JD = 2440587.5
+DAY_S = 86400.0
+
+
+class PropagationResult:
+    """Arrays shaped (n_satellites, n_times) for one batched propagation.
+
+    lat/lon/az/el are degrees, alt_km/range_km kilometres, range_rate_km_s
+    is the topocentric range rate (positive when receding) and speed_m_s
+    the inertial speed of the satellite relative to the observer.
+    """
+    __slots__ = ("unix", "lat", "lon", "alt_km", "az", "el", "range_km",
+                 "range_rate_km_s", "speed_m_s", "error")
+
+    def __init__(self, unix, lat, lon, alt_km, az, el, range_km, range_rate_km_s, speed_m_s, error):
+        self.unix = unix
+        self.lat = lat
+        self.lon = lon
+        self.alt_km = alt_km
+        self.az = az
+        self.el = el
+        self.range_km = range_km
+        self.range_rate_km_s = range_rate_km_s
+        self.speed_m_s = speed_m_s
+        self.error = error
+
+
+def geodetic_to_ecef_km(lat_deg, lon_deg, alt_km=0.0):
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    n = WGS84_A_KM / np.sqrt(1 - WGS84_E2 * np.sin(lat) ** 2)
+    return np.array([
+        (n + alt_km) * np.cos(lat) * np.cos(lon),
+        (n + alt_km) * np.cos(lat) * np.sin(lon),
+        (n * (1 - WGS84_E2) + alt_km) * np.sin(lat),
+    ])
+
+
+def ecef_to_geodetic(x, y, z):
+    """Vectorised ECEF (km) to WGS84 lat/lon (deg) and height (km)."""
+    lon = np.arctan2(y, x)
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p * (1 - WGS84_E2))
+    for _ in range(3):
+        sin_lat = np.sin(lat)
+        n = WGS84_A_KM / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+        lat = np.arctan2(z + WGS84_E2 * n * sin_lat, p)
+    sin_lat = np.sin(lat)
+    n = WGS84_A_KM / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    cos_lat = np.cos(lat)
+    alt = np.where(np.abs(cos_lat) > 1e-9, p / np.where(cos_lat == 0, 1, cos_lat) - n,
+                   np.abs(z) - n * (1 - WGS84_E2))
+    return np.degrees(lat), np.degrees(lon), alt
+
+
+def skyfield_time_to_jd(t):
+    """Split a skyfield Time into (whole, utc_fraction, ut1_fraction) arrays, as skyfield feeds SGP4."""
+    whole = np.atleast_1d(t.whole).astype(float)
+    utc_fraction = np.atleast_1d(t.tai_fraction - t._leap_seconds() / DAY_S).astype(float)
+    ut1_fraction = np.atleast_1d(t.ut1_fraction).astype(float)
+    whole, utc_fraction, ut1_fraction = np.broadcast_arrays(whole, utc_fraction, ut1_fraction)
+    return whole, utc_fraction, ut1_fraction
+
+
+def unix_to_jd(unix):
+    """Split unix seconds into (whole, utc_fraction, ut1_fraction); UT1 is taken as UTC."""
+    days = np.atleast_1d(np.asarray(unix, dtype=float)) / DAY_S
+    whole = np.floor(days) + UNIX_EPOCH_JD
+    fraction = days - np.floor(days)
+    return whole, fraction, fraction
+
+
+class Propagator:
+    """Batched SGP4 propagation of a fixed satellite list against one observer.
+
+    All satellites are evaluated for all requested times in a single
+    SatrecArray call, then reduced to geodetic and topocentric quantities
+    with NumPy, so one call replaces the per-satellite ``sat.at(t)`` loops.
+    """
+
+    def __init__(self, satellites, observer_lat, observer_lon, observer_alt_m=0.0):
+        self.satellites = list(satellites)
+        self.observer_lat = float(observer_lat)
+        self.observer_lon = float(observer_lon)
+        self.observer_alt_m = float(observer_alt_m)
+        self._satrecs = [sat.model for sat in self.satellites]
+        self._array = SatrecArray(self._satrecs) if self._satrecs else None
+        self._subarrays = {}
+
+        self._obs_ecef = geodetic_to_ecef_km(self.observer_lat, self.observer_lon, self.observer_alt_m / 1000.0)
+        lat = np.radians(self.observer_lat)
+        lon = np.radians(self.observer_lon)
+        # rows are the local east, north and up unit vectors in ECEF
+        self._enu = np.array([
+            [-np.sin(lon), np.cos(lon), 0.0],
+            [-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)],
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)],
+        ])
+
+    def __len__(self):
+        return len(self.satellites)
+
+    def index(self, sat):
+        return self.satellites.index(sat)
+
+    def close(self):
+        """Release worker resources; nothing to do for in-process propagation."""
+
+    def propagate(self, t):
+        """Propagate every satellite at skyfield Time ``t`` (scalar or array)."""
+        return self._propagate_all(*skyfield_time_to_jd(t))
+
+    def propagate_unix(self, unix):
+        """Propagate every satellite at the given unix timestamps."""
+        return self._propagate_all(*unix_to_jd(unix))
+
+    def propagate_pairs(self, sat_indices, unix):
+        """Propagate satellite ``sat_indices[k]`` at ``unix[k]``; results are 1-D."""
+        whole, frac, ut1 = unix_to_jd(unix)
+        e, r, v = self._sgp4_pairs(sat_indices, whole, frac)
+        return self._reduce(r, v, whole, frac, ut1, e)
+
+    def look_angles_unix(self, unix, indices=None):
+        """Only (az, el) in degrees for every satellite (or ``indices``) at the given unix timestamps."""
+        whole, frac, ut1 = unix_to_jd(unix)
+        array = self._array if indices is None else self._subarray(indices)
+        if array is None:
+            empty = np.empty((0, len(whole)))
+            return empty, empty
+        _, r, _ = array.sgp4(whole, frac)
+        return self._look(r, whole, ut1)
+
+    def _subarray(self, indices):
+        key = tuple(int(i) for i in indices)
+        if not key:
+            return None
+        if key not in self._subarrays:
+            self._subarrays[key] = SatrecArray([self._satrecs[i] for i in key])
+        return self._subarrays[key]
+
+    def topocentric(self, t):
+        """(az, el, range_km) for every satellite at skyfield Time ``t``, skipping the geodetic reduction."""
+        whole, frac, ut1 = skyfield_time_to_jd(t)
+        if self._array is None:
+            empty = np.empty((0, len(whole)))
+            return empty, empty, empty
+        _, r, _ = self._array.sgp4(whole, frac)
+        x, y, z, _, _ = self._earth_fixed(r, whole, ut1)
+        az, el, rng, _, _, _ = self._topocentric(x, y, z)
+        return az, el, rng
+
+    def look_angles_pairs(self, sat_indices, unix):
+        """(az, el) in degrees for satellite ``sat_indices[k]`` at ``unix[k]``."""
+        whole, frac, ut1 = unix_to_jd(unix)
+        _, r, _ = self._sgp4_pairs(sat_indices, whole, frac)
+        return self._look(r, whole, ut1)
+
+    def _sgp4_pairs(self, sat_indices, whole, frac):
+        sat_indices = np.asarray(sat_indices, dtype=int)
+        r = np.empty((len(sat_indices), 3))
+        v = np.empty((len(sat_indices), 3))
+        e = np.zeros(len(sat_indices), dtype=np.uint8)
+        for idx in np.unique(sat_indices):
+            sel = sat_indices == idx
+            e[sel], r[sel], v[sel] = self._satrecs[idx].sgp4_array(whole[sel], frac[sel])
+        return e, r, v
+
+    def _propagate_all(self, whole, frac, ut1):
+        if self._array is None:
+            empty = np.empty((0, len(whole)))
+            return PropagationResult(self._unix(whole, frac), *([empty] * 8), error=empty.astype(np.uint8))
+        e, r, v = self._array.sgp4(whole, frac)
+        return self._reduce(r, v, whole, frac, ut1, e)
+
+    def _unix(self, whole, frac):
+        return (whole - UNIX_EPOCH_JD + frac) * DAY_S
+
+    def _earth_fixed(self, r, whole, ut1):
+        # TEME -> pseudo earth fixed; r is (..., n_times, 3) with times on the last axis but one
+        theta, _ = theta_GMST1982(whole, ut1)
+        cos_t, sin_t = np.cos(theta), np.sin(theta)
+        x = cos_t * r[..., 0] + sin_t * r[..., 1]
+        y = -sin_t * r[..., 0] + cos_t * r[..., 1]
+        return x, y, r[..., 2], cos_t, sin_t
+
+    def _topocentric(self, x, y, z):
+        dx = x - self._obs_ecef[0]
+        dy = y - self._obs_ecef[1]
+        dz = z - self._obs_ecef[2]
+        east = self._enu[0, 0] * dx + self._enu[0, 1] * dy
+        north = self._enu[1, 0] * dx + self._enu[1, 1] * dy + self._enu[1, 2] * dz
+        up = self._enu[2, 0] * dx + self._enu[2, 1] * dy + self._enu[2, 2] * dz
+        rng = np.sqrt(dx * dx + dy * dy + dz * dz)
+        az = np.degrees(np.arctan2(east, north)) % 360.0
+        el = np.degrees(np.arcsin(np.clip(up / rng, -1.0, 1.0)))
+        return az, el, rng, dx, dy, dz
+
+    def _look(self, r, whole, ut1):
+        x, y, z, _, _ = self._earth_fixed(r, whole, ut1)
+        az, el, _, _, _, _ = self._topocentric(x, y, z)
+        return az, el
+
+    def _reduce(self, r, v, whole, frac, ut1, error):
+        x, y, z, cos_t, sin_t = self._earth_fixed(r, whole, ut1)
+        w = EARTH_ROTATION_RAD_S
+        vx = cos_t * v[..., 0] + sin_t * v[..., 1] + w * y
+        vy = -sin_t * v[..., 0] + cos_t * v[..., 1] - w * x
+        vz = v[..., 2]
+
+        lat, lon, alt = ecef_to_geodetic(x, y, z)
+        az, el, rng, dx, dy, dz = self._topocentric(x, y, z)
+        range_rate = (dx * vx + dy * vy + dz * vz) / rng
+
+        # relative velocity back in an inertial frame: add the earth rotation of the baseline
+        ivx = vx - w * dy
+        ivy = vy + w * dx
+        speed = np.sqrt(ivx * ivx + ivy * ivy + vz * vz) * 1000.0
+
+        return PropagationResult(self._unix(whole, frac), lat, lon, alt, az, el, rng, range_rate, speed, error)
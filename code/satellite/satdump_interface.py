@@ -1,38 +1,293 @@
-import subprocess, os, time, threading
-from datetime import datetime
+import subprocess, os, time, threading, selectors
+from collections import deque
+from datetime import datetime, timezone
+from satdump_log import SatdumpLog
+
+satdump_bin = os.getenv("SATTRACK_SATDUMP_BIN", "satdump")
+kill_grace_sec = 5.0
+progress_interval_sec = 1.0
+max_partial_line = 64 * 1024
+
+
+class TimerWheel:
+    """hashed timer wheel; schedule() and cancel() are O(1), advance() fires whatever is due"""
+
+    def __init__(self, tick=0.25, slots=512):
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.current = None
+
+    def _tick_of(self, when):
+        return int(when // self.tick)
+
+    def schedule(self, when, callback):
+        """run callback() at unix time ``when`` (no earlier than the next tick); returns a cancellable handle"""
+        # round up: a tick fires once its start has passed, so a deadline is never cut short
+        due = -int(-when // self.tick)
+        if self.current is not None:
+            due = max(due, self.current + 1)
+        timer = [due, callback, False]
+        self.slots[due % len(self.slots)].append(timer)
+        return timer
+
+    @staticmethod
+    def cancel(timer):
+        if timer is not None:
+            timer[2] = True
+
+    def advance(self, now):
+        """fire every timer due at or before ``now``"""
+        target = self._tick_of(now)
+        if self.current is None:
+            self.current = target - 1
+        while self.current < target:
+            self.current += 1
+            slot = self.slots[self.current % len(self.slots)]
+            if not slot:
+                continue
+            due = [t for t in slot if t[0] <= self.current]
+            slot[:] = [t for t in slot if t[0] > self.current and not t[2]]
+            for timer in due:
+                if not timer[2]:
+                    timer[2] = True
+                    timer[1]()
+
+    def next_delay(self, now):
+        return max(0.0, (self.current + 1) * self.tick - now) if self.current is not None else self.tick
+
+
+class Recording:
+    """one satdump process and what is known about it so far"""
+
+    def __init__(self, sat_name, device, outfile, cmd, duration_sec):
+        self.sat_name = sat_name
+        self.device = device
+        self.outfile = outfile
+        self.cmd = cmd
+        self.duration_sec = duration_sec
+        self.proc = None
+        self.log = SatdumpLog()
+        self.started = None
+        self.finished = None
+        self.returncode = None
+        self.bytes_written = 0
+        self.rate_bps = 0.0
+        self.stop_requested = False
+        self.on_finished = []
+        self.timers = []
+        self._partial = b""
+        self._last_bytes = (None, 0)
+
+    @property
+    def running(self):
+        return self.finished is None
+
+    def elapsed(self, now=None):
+        end = self.finished if self.finished is not None else (time.time() if now is None else now)
+        return end - self.started if self.started is not None else 0.0
+
+    def progress(self, now=None):
+        return {
+            "satellite": self.sat_name,
+            "device": self.device,
+            "outfile": self.outfile,
+            "running": self.running,
+            "elapsed_sec": self.elapsed(now),
+            "remaining_sec": max(0.0, self.duration_sec - self.elapsed(now)) if self.running else 0.0,
+            "bytes_written": self.bytes_written,
+            "rate_bps": self.rate_bps,
+            "returncode": self.returncode,
+        }
+
+
+class ReceiverSupervisor:
+    """single thread that owns every satdump child process
+
+    output pipes are non-blocking and multiplexed with a selector, so they are
+    drained continuously no matter how many recordings run; stop deadlines,
+    kill escalation and progress polling all live on one timer wheel instead
+    of a sleeping thread per recording. other threads only enqueue calls.
+    """
+
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.wheel = TimerWheel()
+        self._calls = deque()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def call_soon(self, fn, *args):
+        self._calls.append((fn, args))
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def launch(self, rec):
+        """start rec.cmd now; the pipe and timers are attached on the supervisor thread"""
+        rec.proc = subprocess.Popen(rec.cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT)
+        rec.started = time.time()
+        os.set_blocking(rec.proc.stdout.fileno(), False)
+        self.call_soon(self._attach, rec)
+
+    def _attach(self, rec):
+        self.selector.register(rec.proc.stdout, selectors.EVENT_READ, rec)
+        if rec.duration_sec is not None:
+            rec.timers.append(self.wheel.schedule(rec.started + rec.duration_sec, lambda: self._terminate(rec)))
+        self._schedule_progress(rec)
+        if rec.stop_requested:
+            self._terminate(rec)
+
+    def _schedule_progress(self, rec):
+        def poll():
+            self._update_bytes(rec)
+            if rec.running:
+                self._schedule_progress(rec)
+        rec.timers.append(self.wheel.schedule(time.time() + progress_interval_sec, poll))
+
+    def _update_bytes(self, rec):
+        size = 0
+        folder, base = os.path.split(rec.outfile)
+        try:
+            size = os.path.getsize(rec.outfile)
+        except OSError:
+            # satdump may add its own extension to the baseband file name
+            try:
+                with os.scandir(folder) as it:
+                    size = sum(e.stat().st_size for e in it if e.name.startswith(base) and e.is_file())
+            except OSError:
+                pass
+        now = time.time()
+        last_t, last_size = rec._last_bytes
+        if last_t is not None and now > last_t:
+            rec.rate_bps = (size - last_size) / (now - last_t)
+        rec._last_bytes = (now, size)
+        rec.bytes_written = size
+
+    def stop(self, rec):
+        rec.stop_requested = True
+        self.call_soon(self._terminate, rec)
+
+    def _terminate(self, rec):
+        if rec.proc is None or rec.proc.poll() is not None:
+            return
+        rec.proc.terminate()
+        rec.timers.append(self.wheel.schedule(time.time() + kill_grace_sec, lambda: self._kill(rec)))
+
+    @staticmethod
+    def _kill(rec):
+        if rec.proc.poll() is None:
+            rec.proc.kill()
+
+    def _read(self, rec):
+        try:
+            data = os.read(rec.proc.stdout.fileno(), 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if data:
+            # progress output redraws with carriage returns; treat them as line ends
+            lines = (rec._partial + data.replace(b"\r", b"\n")).split(b"\n")
+            rec._partial = lines.pop()[-max_partial_line:]
+            for line in lines:
+                rec.log.feed(line.decode("utf-8", "replace"))
+            return
+        if rec._partial:
+            rec.log.feed(rec._partial.decode("utf-8", "replace"))
+            rec._partial = b""
+        self.selector.unregister(rec.proc.stdout)
+        rec.proc.stdout.close()
+        rec.returncode = rec.proc.wait()
+        self._update_bytes(rec)
+        rec.finished = time.time()
+        for timer in rec.timers:
+            self.wheel.cancel(timer)
+        rec.timers = []
+        for callback in rec.on_finished:
+            try:
+                callback(rec)
+            except Exception:
+                pass
+
+    def _run(self):
+        while True:
+            now = time.time()
+            self.wheel.advance(now)
+            # only the wake pipe registered means nothing is running and no timer can matter
+            idle = len(self.selector.get_map()) == 1 and not self._calls
+            for key, _ in self.selector.select(None if idle else self.wheel.next_delay(time.time())):
+                if key.data is None:
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except BlockingIOError:
+                        pass
+                else:
+                    self._read(key.data)
+            while self._calls:
+                fn, args = self._calls.popleft()
+                fn(*args)
+
 
 class satdump_receiver:
-    def __init__(self, sample_rate=2_400_000, gain=35):
+    def __init__(self, sample_rate=2_400_000, gain=35, signal_store=None, decode_queue=None):
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.output_dir = os.path.join(base_dir, "transmissions")
         self.sample_rate = sample_rate
         self.gain = gain
-        self.recording_process = None
+        self.signal_store = signal_store
+        self.decode_queue = decode_queue
+        self.supervisor = ReceiverSupervisor()
+        self.recordings = {}
+        self.marker = None
+        self._marker_lock = threading.Lock()
         self.current_satellite = None
-        self.is_recording = False
 
         os.makedirs(self.output_dir, exist_ok=True)
 
+    @property
+    def is_recording(self):
+        return any(rec.running for rec in self.recordings.values())
+
     def list_satellites(self):
         """query satdump for list of available decoders"""
         try:
-            cmd = ["satdump", "--list"]
+            cmd = [satdump_bin, "--list"]
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             sats = [line.strip() for line in result.stdout.splitlines() if line.strip()]
             return sats
         except Exception as e:
             return [f"error listing satellites: {e}"]
 
-    def start_recording(self, sat_name, center_freq_hz, duration_sec, rtl_device="0"):
-        """start rf recording for specified satellite"""
-        if self.is_recording:
-            raise RuntimeError("already recording")
+    def start_recording(self, sat_name, center_freq_hz, duration_sec, rtl_device="0", decode=False, max_elevation=None,
+                        satellite=None, norad=None, pointing=None):
+        """start rf recording for specified satellite on one sdr; other devices may record at the same time
 
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        outfile = os.path.join(self.output_dir, f"{sat_name}_{timestamp}.iq")
-        self.current_satellite = sat_name
+        with ``decode`` the finished recording goes on the decode queue, ranked by ``max_elevation``.
+        ``sat_name`` is the satdump pipeline; the signal store pass is filed under ``satellite`` and
+        ``norad`` when given, and ``pointing(t)`` may add servo/target/predicted columns to its rows
+        """
+        rtl_device = str(rtl_device)
+        current = self.recordings.get(rtl_device)
+        if current is not None and current.running:
+            raise RuntimeError(f"device {rtl_device} already recording {current.sat_name}")
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        outfile = os.path.join(self.output_dir, f"{sat_name}_{timestamp}_dev{rtl_device}.iq")
         cmd = [
-            "satdump",
+            satdump_bin,
             "recv",
             sat_name,
             "--samplerate", str(self.sample_rate),
@@ -42,31 +297,79 @@ class satdump_receiver:
             "--output", outfile
         ]
 
-        self.recording_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        self.is_recording = True
+        rec = Recording(sat_name, rtl_device, outfile, cmd, duration_sec)
+        rec.on_finished.append(self._release_marker)
+        if decode:
+            rec.on_finished.append(lambda r: self.queue_decode(r.outfile, r.sat_name, max_elevation))
+        with self._marker_lock:
+            # other processes' decode queues hold off until the last recording here ends
+            if self.marker is None:
+                from decode_queue import RecordingMarker
+                self.marker = RecordingMarker()
+            self.marker.hold()
+            try:
+                self.supervisor.launch(rec)
+            except Exception:
+                if not self.is_recording:
+                    self.marker.release()
+                raise
+            self.recordings[rtl_device] = rec
+        self.current_satellite = sat_name
+        if self.signal_store is not None:
+            self._record_signal(rec, satellite or sat_name, norad, pointing)
+        return outfile
 
-        def auto_stop():
-            time.sleep(duration_sec)
-            self.stop_recording()
+    def _release_marker(self, rec):
+        with self._marker_lock:
+            if not self.is_recording:
+                self.marker.release()
 
-        threading.Thread(target=auto_stop, daemon=True).start()
-        return outfile
+    def _record_signal(self, rec, satellite, norad=None, pointing=None):
+        from signal_store import SignalRecorder
+
+        def sample(t):
+            row = rec.log.signal()
+            if pointing is not None:
+                row.update(pointing(t))
+            return row
+
+        writer = self.signal_store.open_pass(satellite, norad, start=rec.started)
+        SignalRecorder(writer, sample, alive=lambda: rec.running).start()
+
+    def stop_recording(self, rtl_device=None, wait=False, timeout=kill_grace_sec * 2):
+        """stop one device's recording (or all) gracefully; returns False if nothing was recording"""
+        if rtl_device is None:
+            targets = [rec for rec in self.recordings.values() if rec.running]
+        else:
+            rec = self.recordings.get(str(rtl_device))
+            targets = [rec] if rec is not None and rec.running else []
+        for rec in targets:
+            self.supervisor.stop(rec)
+        if wait:
+            deadline = time.time() + timeout
+            while any(rec.running for rec in targets) and time.time() < deadline:
+                time.sleep(0.05)
+        return bool(targets)
+
+    def progress(self):
+        """bytes written, elapsed and remaining time for every recording this session"""
+        now = time.time()
+        return [rec.progress(now) for rec in self.recordings.values()]
 
-    def stop_recording(self):
-        """stop recording gracefully"""
-        if not self.is_recording:
-            return False
-        self.recording_process.terminate()
-        self.recording_process.wait(timeout=5)
-        self.is_recording = False
-        return True
+    def queue_decode(self, iq_file, sat_name, max_elevation=None):
+        """queue iq data for background decoding; decodes wait while any recording is running"""
+        if self.decode_queue is None:
+            from decode_queue import DecodeQueue
+            self.decode_queue = DecodeQueue(paused_when=lambda: self.is_recording)
+            self.decode_queue.start()
+        return self.decode_queue.submit(iq_file, sat_name, max_elevation)
 
     def decode_recording(self, iq_file, sat_name):
         """decode iq data using satdump api"""
         out_dir = os.path.splitext(iq_file)[0] + "_decoded"
         os.makedirs(out_dir, exist_ok=True)
         cmd = [
-            "satdump",
+            satdump_bin,
             "decode",
             sat_name,
             iq_file,
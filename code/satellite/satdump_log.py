@@ -0,0 +1,235 @@
+import itertools, re, threading, time
+from collections import deque
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+log_capacity = 400
+event_capacity = 256
+
+
+class LogRing:
+    """Fixed-capacity ring of raw log lines with a running sequence number.
+
+    A reader remembers the last sequence it saw and asks for ``since(seq)``,
+    so it only ever handles lines that arrived after its previous look.
+    """
+
+    def __init__(self, capacity=log_capacity):
+        self._lines = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.seq = 0
+
+    def append(self, line):
+        with self._lock:
+            self._lines.append(line)
+            self.seq += 1
+            return self.seq
+
+    def since(self, seq, max_n=None):
+        """(lines newer than ``seq``, current seq); lines that fell off the ring are skipped."""
+        with self._lock:
+            n = min(self.seq - seq, len(self._lines))
+            if max_n is not None:
+                n = min(n, max_n)
+            lines = list(itertools.islice(self._lines, len(self._lines) - n, None)) if n > 0 else []
+            return lines, self.seq
+
+    def tail(self, n):
+        return self.since(self.seq - n)[0]
+
+    def __len__(self):
+        return len(self._lines)
+
+
+class PassStart(NamedTuple):
+    t: float
+    satellite: str
+
+
+class PassEnd(NamedTuple):
+    t: float
+    satellite: str
+
+
+class SignalReport(NamedTuple):
+    t: float
+    snr_db: float
+    peak_snr_db: Optional[float]
+
+
+class LockChange(NamedTuple):
+    t: float
+    stage: str
+    locked: bool
+    ber: Optional[float]
+
+
+class ProductWritten(NamedTuple):
+    t: float
+    path: str
+
+
+class LogError(NamedTuple):
+    t: float
+    message: str
+
+
+# "[12:34:56 - 18/10/2026] (I) message"
+line_prefix = re.compile(r"^(?:\[(?P<clock>\d\d:\d\d:\d\d)\s*-\s*(?P<date>\d\d/\d\d/\d{4})\]\s*)?(?:\((?P<level>[A-Z])\)\s*)?")
+pass_start_re = re.compile(r"\b(?:AOS|Pass start(?:ed|ing)?|Starting (?:pass|live processing|tracking|recording))\b(?:\s+(?:of|for))?[\s:,-]*(?P<sat>[^,(]*)", re.I)
+pass_end_re = re.compile(r"\b(?:LOS|Pass (?:end|ended|finished|over)|Stop(?:ping|ped) (?:pass|live processing|tracking|recording))\b(?:\s+(?:of|for))?[\s:,-]*(?P<sat>[^,(]*)", re.I)
+snr_re = re.compile(r"(?<!Peak )\bSNR\s*:?\s*(?P<snr>-?\d+(?:\.\d+)?)\s*dB", re.I)
+peak_re = re.compile(r"\bPeak SNR\s*:?\s*(?P<peak>-?\d+(?:\.\d+)?)", re.I)
+lock_re = re.compile(r"\b(?P<stage>Viterbi|Deframer|Sync|Demodulator)\s*:?\s*(?P<state>SYNCED|LOCKED|NOSYNC|NOT SYNCED|NO SYNC|SYNCING|UNLOCKED)", re.I)
+ber_re = re.compile(r"\bBER\s*:?\s*(?P<ber>\d+(?:\.\d+)?(?:e-?\d+)?)", re.I)
+product_re = re.compile(r"\b(?:Sav(?:ing|ed)|Writ(?:ing|ten)|Wrote)\b.*?(?P<path>[^\s'\"]+\.(?:png|jpe?g|bmp|tiff?|cadu|wav|nc|json))\b", re.I)
+error_re = re.compile(r"\b(?:error|failed|exception|could not|cannot)\b", re.I)
+
+
+def line_time(line, default=None):
+    """Unix time from SatDump's ``[HH:MM:SS - DD/MM/YYYY]`` prefix (local time), else ``default`` or now."""
+    m = line_prefix.match(line)
+    if m["clock"]:
+        try:
+            stamp = datetime.strptime(f"{m['date']} {m['clock']}", "%d/%m/%Y %H:%M:%S")
+            return stamp.timestamp()
+        except ValueError:
+            pass
+    return time.time() if default is None else default
+
+
+def parse_line(line, t=None):
+    """Structured events found in one SatDump output line, in the order they apply."""
+    m = line_prefix.match(line)
+    level = m["level"]
+    body = line[m.end():]
+    t = line_time(line, t)
+    events = []
+
+    if level == "E" or (level not in ("I", "D") and error_re.search(body)):
+        return [LogError(t, body.strip())]
+    s = pass_start_re.search(body)
+    if s:
+        events.append(PassStart(t, s["sat"].strip()))
+    e = pass_end_re.search(body)
+    if e:
+        events.append(PassEnd(t, e["sat"].strip()))
+    snr = snr_re.search(body)
+    if snr:
+        peak = peak_re.search(body)
+        events.append(SignalReport(t, float(snr["snr"]), float(peak["peak"]) if peak else None))
+    locks = list(lock_re.finditer(body))
+    if locks:
+        ber = ber_re.search(body)
+        for lock in locks:
+            stage = lock["stage"].lower()
+            locked = lock["state"].upper() in ("SYNCED", "LOCKED")
+            events.append(LockChange(t, stage, locked, float(ber["ber"]) if ber and stage == "viterbi" else None))
+    p = product_re.search(body)
+    if p:
+        events.append(ProductWritten(t, p["path"]))
+    return events
+
+
+class SignalState:
+    """Running summary of the parsed events, for the decoder panel."""
+
+    def __init__(self):
+        self.satellite = None
+        self.in_pass = False
+        self.snr_db = None
+        self.peak_snr_db = None
+        self.locks = {}
+        self.ber = None
+        self.products = 0
+        self.errors = 0
+        self.last_error = None
+        self.updated = None
+
+    def apply(self, event):
+        self.updated = event.t
+        if isinstance(event, PassStart):
+            self.satellite = event.satellite or self.satellite
+            self.in_pass = True
+            self.snr_db = self.peak_snr_db = self.ber = None
+            self.locks = {}
+        elif isinstance(event, PassEnd):
+            self.in_pass = False
+        elif isinstance(event, SignalReport):
+            self.snr_db = event.snr_db
+            peak = max(event.snr_db, event.peak_snr_db if event.peak_snr_db is not None else event.snr_db)
+            self.peak_snr_db = peak if self.peak_snr_db is None else max(self.peak_snr_db, peak)
+        elif isinstance(event, LockChange):
+            self.locks[event.stage] = event.locked
+            if event.ber is not None:
+                self.ber = event.ber
+        elif isinstance(event, ProductWritten):
+            self.products += 1
+        elif isinstance(event, LogError):
+            self.errors += 1
+            self.last_error = event.message
+
+    def text(self):
+        """One-line colour-markup summary."""
+        parts = [f"Pass: {self.satellite or '-'}{' (live)' if self.in_pass else ''}"]
+        if self.snr_db is not None:
+            parts.append(f"SNR {self.snr_db:.1f} dB (peak {self.peak_snr_db:.1f})")
+        for stage in ("viterbi", "deframer"):
+            if stage in self.locks:
+                colour = "green" if self.locks[stage] else "red"
+                state = "SYNCED" if self.locks[stage] else "NOSYNC"
+                parts.append(f"{stage.title()} [{colour}]{state}[/{colour}]")
+        if self.ber is not None:
+            parts.append(f"BER {self.ber:.4f}")
+        parts.append(f"Products {self.products}")
+        if self.errors:
+            parts.append(f"[red]Errors {self.errors}[/red]")
+        return " | ".join(parts)
+
+
+class SatdumpLog:
+    """Raw line ring, bounded event history and signal summary for one SatDump process.
+
+    ``feed`` is called from the process reader thread; the UI reads
+    ``lines.since(seq)`` and ``events_since(seq)`` without blocking on it.
+    """
+
+    def __init__(self, capacity=log_capacity, events=event_capacity):
+        self.lines = LogRing(capacity)
+        self.events = deque(maxlen=events)
+        self.event_seq = 0
+        self.state = SignalState()
+        self._lock = threading.Lock()
+
+    def feed(self, line, t=None):
+        line = line.rstrip()
+        self.lines.append(line)
+        events = parse_line(line, t)
+        if events:
+            with self._lock:
+                for event in events:
+                    self.state.apply(event)
+                    self.event_seq += 1
+                    self.events.append((self.event_seq, event))
+        return events
+
+    def summary(self):
+        """(event seq, colour-markup signal summary) taken together under the lock."""
+        with self._lock:
+            return self.event_seq, self.state.text()
+
+    def signal(self):
+        """Current SNR, BER and Viterbi/deframer lock (1, 0, or -1 when unknown) as store columns."""
+        with self._lock:
+            state = self.state
+            return {
+                "snr_db": state.snr_db if state.snr_db is not None else float("nan"),
+                "ber": state.ber if state.ber is not None else float("nan"),
+                "viterbi": int(state.locks["viterbi"]) if "viterbi" in state.locks else -1,
+                "deframer": int(state.locks["deframer"]) if "deframer" in state.locks else -1,
+            }
+
+    def events_since(self, seq):
+        """(events newer than ``seq``, current event seq)."""
+        with self._lock:
+            return [e for s, e in self.events if s > seq], self.event_seq
@@ -1,30 +1,42 @@
-﻿from skyfield.api import EarthSatellite, load, Topos, wgs84
+﻿import time
+_startup_t0 = time.perf_counter()
 from datetime import datetime, timezone, timedelta
-import requests, time, urllib3, re, os, threading, math
-import numpy as np
-import urwid
-from rich.console import Console
-import subprocess, queue, json
+import re, os, sys, threading, math, argparse
+import subprocess, json
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
+import urwid
 
-try:
-    from gpiozero import AngularServo
-    from gpiozero.pins.pigpio import PiGPIOFactory
-    GPIO_AVAILABLE = True
-except ImportError:
-    GPIO_AVAILABLE = False
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-console = Console()
+# skyfield, numpy, requests and the GPIO stack are imported by load_heavy_modules(),
+# which runs in the background while the setup form is up.
+np = urllib3 = None
+load = Topos = None
+Propagator = predict_passes = next_pass = PassCache = None
+build_pointing_table = pointing_window = GroundTrackCache = MapRenderer = ComputeWorker = None
+make_propagator = None
+load_catalog = TleRefresher = OutputWatcher = SatdumpLog = None
+SignalStore = SignalRecorder = DecodeQueue = RecordingMarker = ServoLoop = plan_table_pass = None
+AngularServo = PiGPIOFactory = None
+GPIO_AVAILABLE = False
+startup_timings = [("stdlib + urwid imports", time.perf_counter() - _startup_t0)]
+_heavy_loader = None
+_heavy_error = None
+_servo_instance = None
 
-tle_url = "https://celestrak.org/NORAD/elements/gp.php?GROUP=weather"
 tle_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "satellites.txt")
+satdump_bin = os.getenv("SATTRACK_SATDUMP_BIN", "satdump")
 ui_update_interval = float(os.getenv("SATTRACK_UPDATE_INTERVAL", "0.1"))
-map_update_interval = float(os.getenv("SATTRACK_MAP_UPDATE_INTERVAL", "0.5"))
+map_update_interval = float(os.getenv("SATTRACK_MAP_UPDATE_INTERVAL", "0.25"))
 compute_update_interval = float(os.getenv("SATTRACK_PASS_UPDATE_INTERVAL", "60"))
 map_forecast_points = int(os.getenv("SATTRACK_MAP_POINTS", "30"))
 map_forecast_length = float(os.getenv("SATTRACK_MAP_HORIZON_MIN", "30"))
 max_satellites = int(os.getenv("SATTRACK_max_satellites", "8"))
+best_lookahead_samples = 10
+best_lookahead_step = 30
+next_pass_horizon = float(os.getenv("SATTRACK_PASS_HORIZON_H", "24")) * 3600
+pointing_retry_min = 5.0
+pointing_retry_max = 300.0
 
 colourlist = ["white", "cyan", "dark_blue", "dark_gray", "blue", "magenta", "red", "yellow"]
 palette = [
@@ -96,91 +108,50 @@ class SatellitePreviewButton(urwid.Button):
     def mouse_event(self, size, event, button, col, row, focus):
         return super().mouse_event(size, event, button, col, row, focus)
 
-def satellite_to_servo_coords(sat_az, sat_el):
-    import math
-
-    AZ_MIN, AZ_MAX = -135.0, 135.0
-    EL_MIN, EL_MAX = -90.0, 90.0
+servo_az_limits = (-135.0, 135.0)
+servo_el_limits = (-90.0, 90.0)
+# same as trajectory.limit_tolerance: angles this close outside a limit count as reachable
+servo_limit_tolerance = 1e-9
 
-    def normalize_angle_deg(a):
-        return ((a + 180.0) % 360.0) - 180.0
-
-    az_rad = math.radians(float(sat_az))
-    alt_rad = math.radians(float(sat_el))
 
+def _servo_branch(az_rad, alt_rad):
     east = math.cos(alt_rad) * math.sin(az_rad)
     north = math.cos(alt_rad) * math.cos(az_rad)
     up = math.sin(alt_rad)
+    servo_az = ((math.degrees(math.atan2(east, north)) + 180.0) % 360.0) - 180.0
+    from_zenith = math.degrees(math.acos(max(-1.0, min(1.0, up))))
+    sign_north = math.copysign(1.0, north) if abs(north) > 1e-9 else math.copysign(1.0, math.cos(az_rad))
+    return servo_az, max(-75.0, min(75.0, from_zenith * sign_north))
 
-    az_from_vector = math.degrees(math.atan2(east, north))
-    az_from_vector = normalize_angle_deg(az_from_vector)
 
-    ang_from_zenith_rad = math.acos(max(-1.0, min(1.0, up)))
-    ang_from_zenith_deg = math.degrees(ang_from_zenith_rad)
-    if abs(north) > 1e-9:
-        sign_north = math.copysign(1.0, north)
-    else:
-        sign_north = math.copysign(1.0, math.cos(az_rad))
-    signed_el = ang_from_zenith_deg * sign_north
-    if signed_el > 75.0:
-        signed_el = 75.0
-    if signed_el < -75.0:
-        signed_el = -75.0
-
-    servo_az = az_from_vector
-    servo_el = signed_el
-
-    def feasible(a_az, a_el):
-        return (AZ_MIN <= a_az <= AZ_MAX) and (EL_MIN <= a_el <= EL_MAX)
-
-    if feasible(servo_az, servo_el):
-        return servo_az, servo_el, False
-
-    az2_deg = normalize_angle_deg(az_from_vector + 180.0)
-    az2_rad = math.radians(az2_deg)
-    east2 = math.cos(alt_rad) * math.sin(az2_rad)
-    north2 = math.cos(alt_rad) * math.cos(az2_rad)
-    up2 = up
-    az_from_vector2 = math.degrees(math.atan2(east2, north2))
-    az_from_vector2 = normalize_angle_deg(az_from_vector2)
-
-    ang2 = math.degrees(math.acos(max(-1.0, min(1.0, up2))))
-    if abs(north2) > 1e-9:
-        sign_n2 = math.copysign(1.0, north2)
-    else:
-        sign_n2 = math.copysign(1.0, math.cos(az2_rad))
-    signed_el2 = ang2 * sign_n2
-    if signed_el2 > 75.0:
-        signed_el2 = 75.0
-    if signed_el2 < -75.0:
-        signed_el2 = -75.0
-
-    servo_az2 = az_from_vector2
-    servo_el2 = signed_el2
-    if feasible(servo_az2, servo_el2):
-        return servo_az2, servo_el2, True
-
-    def clamp_cost(azv, elv):
-        azc = max(AZ_MIN, min(AZ_MAX, azv))
-        elc = max(EL_MIN, min(EL_MAX, elv))
-        return abs(azv - azc) + abs(elv - elc)
-
-    cost_direct = clamp_cost(servo_az, servo_el)
-    cost_flip = clamp_cost(servo_az2, servo_el2)
-
-    if cost_flip < cost_direct:
-        final_az = max(AZ_MIN, min(AZ_MAX, servo_az2))
-        final_el = max(EL_MIN, min(EL_MAX, servo_el2))
-        return final_az, final_el, True
-    else:
-        final_az = max(AZ_MIN, min(AZ_MAX, servo_az))
-        final_el = max(EL_MIN, min(EL_MAX, servo_el))
-        return final_az, final_el, False
+def _servo_excess(servo_az, servo_el):
+    return (abs(servo_az - max(servo_az_limits[0], min(servo_az_limits[1], servo_az)))
+            + abs(servo_el - max(servo_el_limits[0], min(servo_el_limits[1], servo_el))))
+
+
+def satellite_to_servo_coords(sat_az, sat_el):
+    """servo (az, el, flipped) for one satellite az/el.
+
+    The direct solution if the servos reach it, else the 180 deg flipped one
+    if that needs less clamping, clamped to the limits. trajectory.servo_coords
+    is the same rule over arrays.
+    """
+    alt_rad = math.radians(float(sat_el))
+    direct = _servo_branch(math.radians(float(sat_az)), alt_rad)
+    flip = _servo_branch(math.radians(((direct[0] + 180.0 + 180.0) % 360.0) - 180.0), alt_rad)
+    tol = servo_limit_tolerance
+    reachable = (servo_az_limits[0] - tol <= direct[0] <= servo_az_limits[1] + tol
+                 and servo_el_limits[0] - tol <= direct[1] <= servo_el_limits[1] + tol)
+    flipped = not reachable and _servo_excess(*flip) < _servo_excess(*direct)
+    servo_az, servo_el = flip if flipped else direct
+    return (max(servo_az_limits[0], min(servo_az_limits[1], servo_az)),
+            max(servo_el_limits[0], min(servo_el_limits[1], servo_el)), flipped)
 
 class servo_controller:
     def __init__(self):
         self.azimuth_angle = 0
         self.elevation_angle = 0
+        self.init_error = None
         
         if GPIO_AVAILABLE:
             try:
@@ -206,7 +177,7 @@ class servo_controller:
                 self.hardware_available = True
             except Exception as e:
                 self.hardware_available = False
-                print(f"Warning: Could not initialise servo hardware: {e}")
+                self.init_error = f"Could not initialise servo hardware: {e}"
         else:
             self.hardware_available = False
     
@@ -237,6 +208,81 @@ class servo_controller:
             return True
         return False
 
+@contextmanager
+def startup_step(label):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings.append((label, time.perf_counter() - t0))
+
+def load_heavy_modules():
+    """Import the propagation, network and GPIO stacks and bring up the servo hardware."""
+    global np, urllib3, load, Topos, Propagator, predict_passes, next_pass, PassCache
+    global build_pointing_table, pointing_window, GroundTrackCache, MapRenderer, ComputeWorker, load_catalog, TleRefresher
+    global make_propagator, OutputWatcher, SatdumpLog, SignalStore, SignalRecorder, DecodeQueue, RecordingMarker, ServoLoop, plan_table_pass
+    global AngularServo, PiGPIOFactory, GPIO_AVAILABLE, _servo_instance, _heavy_error
+    try:
+        with startup_step("[bg] numpy"):
+            import numpy as np
+        with startup_step("[bg] skyfield"):
+            from skyfield.api import load, Topos
+        with startup_step("[bg] requests/urllib3"):
+            import requests, urllib3
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        with startup_step("[bg] tracker modules"):
+            from propagation import Propagator
+            from passes import predict_passes, next_pass
+            from pass_cache import PassCache
+            from pointing import build_pointing_table, pointing_window
+            from ground_track import GroundTrackCache
+            from map_render import MapRenderer
+            from compute_worker import ComputeWorker
+            from process_pool import make_propagator
+            from tle_catalog import load_catalog
+            from tle_refresh import TleRefresher
+            from output_watcher import OutputWatcher
+            from satdump_log import SatdumpLog
+            from signal_store import SignalStore, SignalRecorder
+            from decode_queue import DecodeQueue, RecordingMarker
+            from servo_loop import ServoLoop
+            from trajectory import plan_table_pass
+        with startup_step("[bg] TLE catalog"):
+            try:
+                load_catalog(tle_file)
+            except OSError:
+                pass
+        with startup_step("[bg] gpiozero/pigpio"):
+            try:
+                from gpiozero import AngularServo
+                from gpiozero.pins.pigpio import PiGPIOFactory
+                GPIO_AVAILABLE = True
+            except ImportError:
+                GPIO_AVAILABLE = False
+        with startup_step("[bg] servo controller"):
+            _servo_instance = servo_controller()
+    except Exception as e:
+        _heavy_error = e
+
+def start_heavy_loader():
+    global _heavy_loader
+    if _heavy_loader is None:
+        _heavy_loader = threading.Thread(target=load_heavy_modules, daemon=True)
+        _heavy_loader.start()
+
+def wait_for_heavy_modules():
+    """Block until load_heavy_modules has finished; re-raises its import error, if any."""
+    start_heavy_loader()
+    with startup_step("waiting for background loader"):
+        _heavy_loader.join()
+    if _heavy_error is not None:
+        raise _heavy_error
+
+def print_startup_profile():
+    print("Startup profile ([bg] steps overlap the setup form)")
+    for label, seconds in startup_timings:
+        print(f"  {label:<34} {seconds * 1000:9.1f} ms")
+
 class VerticalSlider(urwid.Pile):
     def __init__(self, min_val, max_val, initial_val, callback=None, label="", height=12):
         self.min_val = min_val
@@ -432,92 +478,44 @@ class LabeledSlider(urwid.Pile):
         if self.callback:
             self.callback(value)
 
-    def glide_to(self, target=0.0, seconds=3.0, steps=60):
-        import threading, time
-        start = self.slider.current_val
-        delta = target - start
-        if steps <= 0 or seconds <= 0 or abs(delta) < 1e-9:
-            self.set_value(target)
-            if self.callback:
-                self.callback(target)
-            return
-
-        step_dt = seconds / float(steps)
-        def runner():
-            for i in range(1, steps + 1):
-                v = start + delta * (i / float(steps))
-                self.slider.set_value(v)
-                self.value_text.set_text(f"{v:.3f} deg")
-                if self.callback:
-                    try:
-                        self.callback(v)
-                    except Exception:
-                        pass
-                time.sleep(step_dt)
-            self.slider.set_value(target)
-            self.value_text.set_text(f"{target:.3f} deg")
-            if self.callback:
-                try:
-                    self.callback(target)
-                except Exception:
-                    pass
-        threading.Thread(target=runner, daemon=True).start()
-
     def keypress(self, size, key):
         if key == ' ':
-            self.glide_to(target=0.0, seconds=3.0, steps=100)
+            # centre the axis; the servo loop's motion profile does the slewing
+            self.set_value(0.0)
+            if self.callback:
+                self.callback(0.0)
             return None
         return self.slider.keypress(size, key)
     
     def selectable(self):
         return True
 
-def check_connection():
-    try:
-        requests.get("https://www.google.com", timeout=5, verify=False)
-        return True, "[green]Internet connected[/green]"
-    except:
-        return False, "[red]No internet[/red]"
-
 def fetch_tle_data():
-    try:
-        r = requests.get(tle_url, timeout=10, verify=False)
-        r.raise_for_status()
-        lines = r.text.encode("utf-8").decode("utf-8-sig").splitlines()
-        
-        cleaned = []
-        i = 0
-        while i < len(lines) - 2:
-            if lines[i+1].startswith("1 ") and lines[i+2].startswith("2 "):
-                cleaned.extend([lines[i].strip(), lines[i+1].strip(), lines[i+2].strip()])
-                i += 3
-            else:
-                i += 1
-        
-        with open(tle_file, "w", encoding="utf-8") as f:
-            f.write("\n".join(cleaned))
-        return True, "[green]TLE data updated[/green]"
-    except Exception as e:
-        return False, f"[red]TLE fetch error: {e}[/red]"
+    """Blocking TLE refresh, used only when there is no local file to start from."""
+    changed, messages = TleRefresher(tle_file).refresh()
+    if os.path.exists(tle_file):
+        return True, messages
+    return False, messages + ["[red]No TLE data available[/red]"]
 
 def get_satellites(names):
     try:
-        lines = open(tle_file).read().splitlines()
+        catalog = load_catalog(tle_file)
     except FileNotFoundError:
         return [], ["[red]TLE file not found[/red]"]
     
-    sats, used_names, messages = [], set(), []
+    sats, used_ids, messages = [], set(), []
     
     for name in names:
         found = False
-        for i in range(0, len(lines), 3):
-            line_name = lines[i].strip()
-            if name.upper() in line_name.upper() and line_name not in used_names:
-                sats.append(EarthSatellite(lines[i+1], lines[i+2], line_name))
-                used_names.add(line_name)
+        for entry in catalog.resolve(name):
+            if entry.norad not in used_ids:
+                sats.append(catalog.satellite(entry))
+                used_ids.add(entry.norad)
                 found = True
         if not found:
             messages.append(f"[bright_yellow]'{name}' not found[/bright_yellow]")
+    if catalog.errors:
+        messages.append(f"[yellow]{catalog.errors} malformed TLE entries skipped[/yellow]")
     
     messages = [
         m.replace("[/red]", "[/yellow]")
@@ -526,89 +524,172 @@ def get_satellites(names):
     ]
     return sats[:8], messages
 
-def select_best_satellite(satellites, observer, ts):
+def score_satellites(el_now, el_future, dist_km):
+    """Vectorised visibility score per satellite; 0 for anything below the horizon now."""
     def sigmoid(x):
         return 1 / (1 + np.exp(-x))
+    avg_el = np.mean(el_future, axis=1)
+    dist_factor = np.where(dist_km > 0, 1 / np.sqrt(np.maximum(dist_km, 1e-9)), 0.01)
+    score = 19265 * sigmoid((el_now - 10) / 5) * sigmoid((avg_el - 10) / 5) * dist_factor
+    return np.where(el_now > 0, score, 0.0)
+
+def rank_satellites(satellites, score):
+    scores = {sat: float(s) for sat, s in zip(satellites, score)}
+    if not len(score) or not np.max(score) > 0:
+        return scores, None
+    return scores, satellites[int(np.argmax(score))]
+
+def lookahead_offsets():
+    return [i * best_lookahead_step for i in range(best_lookahead_samples)]
+
+def select_best_satellite(satellites, observer, ts, propagator=None):
+    if propagator is None:
+        propagator = Propagator(satellites, observer.latitude.degrees, observer.longitude.degrees)
     now = datetime.now(timezone.utc)
-    t_now = ts.utc(now)
-    future_times = ts.utc([now + timedelta(seconds=i * 30) for i in range(10)])
-    
-    best_sat, best_score, scores = None, -1, {}
-    
-    for sat in satellites:
-        sat_diff = sat - observer
-        el_now, _, _ = sat_diff.at(t_now).altaz()
-        current_el = el_now.degrees
-        
-        if current_el <= 0:
-            scores[sat] = 0
-            continue
-        
-        future_elevations = [sat_diff.at(t).altaz()[0].degrees for t in future_times]
-        avg_el = np.mean(future_elevations)
-        dist_km = sat_diff.at(t_now).distance().km
-        dist_factor = 1 / np.sqrt(dist_km) if dist_km > 0 else 0.01
-        
-        score = 19265 * sigmoid((current_el - 10) / 5) * sigmoid((avg_el - 10) / 5) * dist_factor
-        scores[sat] = score
-        
-        if score > best_score:
-            best_score, best_sat = score, sat
-    
-    return scores, best_sat
+    t = ts.from_datetimes([now + timedelta(seconds=s) for s in lookahead_offsets()])
+    _, el, dist_km = propagator.topocentric(t)
+    return rank_satellites(propagator.satellites, score_satellites(el[:, 0], el, dist_km[:, 0]))
 
 def find_next_pass(sat, observer, ts, min_elevation=20):
-    now = datetime.now(timezone.utc)
-    
-    for minutes_ahead in range(0, 1440):
-        check_time = now + timedelta(minutes=minutes_ahead)
-        t = ts.from_datetime(check_time)
-        diff = sat - observer
-        el, _, _ = diff.at(t).altaz()
-        
-        if el.degrees >= min_elevation:
-            seconds_until = minutes_ahead * 60
-            return seconds_until
-    
-    return None
+    now = time.time()
+    prop = Propagator([sat], observer.latitude.degrees, observer.longitude.degrees)
+    upcoming = next_pass(predict_passes(prop, now, next_pass_horizon, min_elevation)[0], now)
+    if upcoming is None:
+        return None
+    return upcoming.seconds_until(now)
+
+def telemetry_rows(entry, now_ts):
+    """(label, value) rows of the live telemetry box for one sat_data entry."""
+    name, az, el, lat, lon, alt, gc_dist, sl_dist, speed, upcoming = entry
+    if upcoming is not None:
+        next_pass_seconds = upcoming.seconds_until(now_ts)
+        if upcoming.in_progress(now_ts):
+            next_pass_str = "In pass"
+        elif next_pass_seconds < 60:
+            next_pass_str = f"{int(next_pass_seconds)}s"
+        elif next_pass_seconds < 3600:
+            minutes = int(next_pass_seconds // 60)
+            seconds = int(next_pass_seconds % 60)
+            next_pass_str = f"{minutes}m {seconds}s"
+        else:
+            hours = int(next_pass_seconds // 3600)
+            minutes = int((next_pass_seconds % 3600) // 60)
+            next_pass_str = f"{hours}h {minutes}m"
+        pass_max_str = f"{upcoming.max_el:.1f} deg"
+    else:
+        next_pass_str = f">{next_pass_horizon / 3600:.0f}h"
+        pass_max_str = "-"
+
+    return [
+        ("Azimuth", f"{az:.1f} deg"),
+        ("Elevation", f"{el:.1f} deg"),
+        ("Latitude", f"{lat:.3f} deg"),
+        ("Longitude", f"{lon:.3f} deg"),
+        ("Altitude", f"{alt:.1f} km"),
+        ("GC Distance", f"{gc_dist:.1f} km"),
+        ("SL Distance", f"{sl_dist:.1f} km"),
+        ("Speed", f"{speed:.1f} m/s"),
+        ("Next Pass", next_pass_str),
+        ("Pass Max El", pass_max_str),
+    ]
 
-def latlon_to_map(lat, lon):
-    row = int((90 - lat) / 180 * (h - 1))
-    col = int((lon + 180) / 360 * (w - 1))
-    return max(0, min(h-1, row)), max(0, min(w-1, col))
+class TelemetryTable:
+    """Live telemetry boxes built once and updated in place.
 
-def draw_map_frame(positions, satellites, ts, observer_lat, observer_lon):
-    frame = [row.copy() for row in ascii_map]
-    now = datetime.now(timezone.utc)
-    steps = max(1, map_forecast_points)
-    step_min = map_forecast_length / max(1, steps - 1)
-    forecast_times = [ts.utc(now + timedelta(minutes=i * step_min)) for i in range(steps)]
-    
-    for i, sat in enumerate(satellites[:max_satellites]):
-        colour = colourlist[i % len(colourlist)]
-        for t in forecast_times:
-            sub = wgs84.subpoint(sat.at(t))
-            lat, lon = sub.latitude.degrees, sub.longitude.degrees
-            r, c = latlon_to_map(lat, lon)
-            frame[r][c] = f"[{colour}]*[/{colour}]"
-
-    r_obs, c_obs = latlon_to_map(observer_lat, observer_lon)
-    frame[r_obs][c_obs] = "[red]O[/red]"
-
-    for i, (lat, lon) in enumerate(positions):
-        colour = colourlist[i % len(colourlist)]
-        r, c = latlon_to_map(lat, lon)
-        frame[r][c] = f"[{colour}]{i+1}[/{colour}]"
-    
-    return "\n".join("".join(row) for row in frame)
+    The boxes are only rebuilt when the number of satellites shown or the
+    row labels change. Otherwise each update compares the formatted strings
+    and calls set_text only on the cells that differ, so urwid re-renders
+    just those rows and reuses its cached canvases for the rest.
+    """
+
+    def __init__(self):
+        self.widget = urwid.Columns([], dividechars=1)
+        self._labels = None
+        self._cells = []
+        self._shown = []
+
+    def _build(self, n, labels):
+        contents, self._cells, self._shown = [], [], []
+        for _ in range(n):
+            header = urwid.Text("", align='center')
+            values = [urwid.Text("", align='right') for _ in labels]
+            rows = [urwid.Columns([('weight', 1, urwid.Text(label)), ('weight', 1, value)])
+                    for label, value in zip(labels, values)]
+            contents.append((urwid.LineBox(urwid.Pile([header] + rows)), self.widget.options('weight', 1)))
+            self._cells.append([header] + values)
+            self._shown.append([None] * (len(labels) + 1))
+        self.widget.contents = contents
+        self._labels = labels
+
+    def update(self, boxes):
+        """``boxes`` is a list of (header, [(label, value), ...]), one per satellite shown."""
+        labels = [label for label, _ in boxes[0][1]] if boxes else []
+        if len(boxes) != len(self._cells) or labels != self._labels:
+            self._build(len(boxes), labels)
+        for (header, rows), cells, shown in zip(boxes, self._cells, self._shown):
+            texts = [header] + [value for _, value in rows]
+            for k, text in enumerate(texts):
+                if shown[k] != text:
+                    cells[k].set_text(text)
+                    shown[k] = text
+
+class LogView:
+    """Scrolling log panel kept as a short stack of fixed-size line chunks.
+
+    New lines only go into the newest chunk and old ones are trimmed off the
+    oldest, so a tick re-lays out at most two small Text widgets and the
+    others keep their cached canvases.
+    """
+
+    def __init__(self, lines=40, chunk=8):
+        self.widget = urwid.Pile([])
+        self.lines = lines
+        self.chunk = chunk
+        self._chunks = []
+        self._count = 0
+
+    def extend(self, lines):
+        lines = lines[-self.lines:]
+        if not lines:
+            return
+        contents = self.widget.contents
+        dirty = set()
+        for line in lines:
+            if not self._chunks or len(self._chunks[-1]) == self.chunk:
+                self._chunks.append([])
+                contents.append((urwid.Text("", wrap='clip'), self.widget.options()))
+            self._chunks[-1].append(line)
+            dirty.add(len(self._chunks) - 1)
+        self._count += len(lines)
+
+        dropped = 0
+        while self._count > self.lines:
+            excess = self._count - self.lines
+            if excess >= len(self._chunks[0]):
+                self._count -= len(self._chunks.pop(0))
+                dropped += 1
+            else:
+                del self._chunks[0][:excess]
+                self._count -= excess
+                dirty.add(dropped)
+        if dropped:
+            del contents[:dropped]
+        for i in dirty:
+            if i >= dropped:
+                contents[i - dropped][0].set_text("\n".join(self._chunks[i - dropped]))
+
+    def clear(self):
+        self.widget.contents.clear()
+        self._chunks = []
+        self._count = 0
 
 class AutoTrackRunner:
     def __init__(self, cfg_path: Path):
         self.cfg_path = Path(cfg_path)
         self.proc = None
-        self.q = queue.Queue()
+        self.log = SatdumpLog()
         self.alive = False
-        self._tail = []
+        self.marker = None
 
     def write_config(self, *, sta_lat, sta_lon, sta_alt_m=0, sat_names, sdr="rtlsdr",
                      samplerate=2_400_000, gain_db=None, record=False, out_dir=None):
@@ -634,18 +715,18 @@ class AutoTrackRunner:
         self.cfg_path.write_text(json.dumps(cfg, indent=2))
 
     def start(self):
-        cmd = ["satdump", "autotrack", str(self.cfg_path)]
+        cmd = [satdump_bin, "autotrack", str(self.cfg_path)]
         self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
         self.alive = True
+        # autotrack receives live for its whole run: decode queues in every process hold off meanwhile
+        self.marker = RecordingMarker()
+        self.marker.hold()
 
         def reader():
             for line in self.proc.stdout:
-                line = line.rstrip()
-                self._tail.append(line)
-                if len(self._tail) > 400:
-                    self._tail = self._tail[-400:]
-                self.q.put(line)
+                self.log.feed(line)
             self.alive = False
+            self.marker.release()
 
         threading.Thread(target=reader, daemon=True).start()
 
@@ -657,18 +738,12 @@ class AutoTrackRunner:
             except subprocess.TimeoutExpired:
                 self.proc.kill()
         self.alive = False
+        if self.marker is not None:
+            self.marker.release()
 
-    def get_new_lines(self, max_n=100):
-        out = []
-        try:
-            while len(out) < max_n:
-                out.append(self.q.get_nowait())
-        except queue.Empty:
-            pass
-        return out
-
-    def tail_text(self, n=200):
-        return "\n".join(self._tail[-n:])
+    def new_lines(self, seq, max_n=None):
+        """(raw lines after ``seq``, latest seq), see ``LogRing.since``."""
+        return self.log.lines.since(seq, max_n)
 
 class satelliteapp:
     def __init__(self):
@@ -680,28 +755,41 @@ class satelliteapp:
         self.metrics_row_offset = 0
         self.current_mode = "satellite_tracking"
         self.current_sat_page = 0
-        self.servo_controller = servo_controller()
+        self.servo_controller = _servo_instance or servo_controller()
+        self.servo_loop = ServoLoop(self.servo_controller, self.servo_command)
         self.update_interval = ui_update_interval
         self.map_update_interval = map_update_interval
         self.pass_update_interval = compute_update_interval
         self.hover_satellite_index = None
         self.tracking_locked = False
         self.locked_satellite_index = None
-        self._glide_state = None
-        self.last_tracked_flipped = False
-        self._glide_thread = None
-        self._glide_gen = 0
+        self.pointing_table = None
+        self.trajectory = None
+        self._pointing_building = False
+        self._pointing_lock = threading.Lock()
+        self._pointing_failure = None
+        self.pointing_error = None
         self._auto_prev = False
         self.last_tracked_index = None
         self.decoder_ui = None
         self.dec_target_text = None
         self.dec_status = None
         self.dec_log = None
+        self.dec_signal = None
+        self.dec_queue = None
+        self._log_seq = 0
+        self._signal_seq = 0
         self.dec_imgs = None
-        self._bg_computing = False
-        self._bg_result = None
-        self._last_map_update = 0.0
+        self.compute_worker = ComputeWorker(self.compute_frame, self.map_update_interval)
         self._next_pass_cache = {}
+        self.propagator = None
+        self.pass_cache = None
+        self.ground_track = None
+        self.map_renderer = None
+        self._shown_map = None
+        self.tle_refresher = None
+        self._tle_reload_pending = False
+        self.tle_status = ""
         self.auto_tracking_enabled = False
         self.selected_satellite_index = 0
         self.current_az = 0.0
@@ -711,8 +799,12 @@ class satelliteapp:
         self.autotrack_cfg = base_dir / "autotrack_runtime.json"
         self.autotrack_out = base_dir / "satdump_out"
         self.autotrack_runner = None
-        self.autotrack_seen = set()
-        self.autotrack_last_images = []
+        self.output_watcher = None
+        self.signal_store = None
+        self.signal_recorder = None
+        self.decode_queue = None
+        self._shown_queue = None
+        self.autotrack_last_images = deque(maxlen=12)
         self.autotrack_sdr = "rtlsdr"
         self.autotrack_samplerate = 2_400_000
         self.autotrack_gain = None
@@ -727,7 +819,10 @@ class satelliteapp:
             sel = self.satellites[idx].name
 
         self.dec_status = urwid.Text("", align='left')
-        self.dec_log = urwid.Text("", align='left')
+        self.dec_log = LogView()
+        self.dec_signal = urwid.Text("", align='left')
+        self.dec_queue = urwid.Text("", align='left')
+        self._shown_queue = None
         self.dec_imgs = urwid.Text("", align='left')
         self.dec_target_text = urwid.Text(f"target satellite: {sel}")
 
@@ -745,9 +840,15 @@ class satelliteapp:
             ('pack', urwid.Divider()),
             ('pack', urwid.Text("Status:")),
             ('pack', self.dec_status),
+            ('pack', urwid.Divider()),
+            ('pack', urwid.Text("Signal:")),
+            ('pack', self.dec_signal),
+            ('pack', urwid.Divider()),
+            ('pack', urwid.Text("Decode queue:")),
+            ('pack', self.dec_queue),
         ])
 
-        log_box = urwid.LineBox(urwid.Filler(self.dec_log, valign='top'), title="SatDump Output")
+        log_box = urwid.LineBox(self.dec_log.widget, title="SatDump Output")
         img_box = urwid.LineBox(urwid.Filler(self.dec_imgs, valign='top'), title="New Images")
 
         self.decoder_ui = urwid.Columns([
@@ -767,48 +868,6 @@ class satelliteapp:
             sel = self.satellites[idx].name
         self.dec_target_text.set_text(f"Target Satellite: {sel}")
 
-    def _start_glide_to(self, target_az, target_el, seconds=2.0):
-        import time
-        target_az = max(-135.0, min(135.0, float(target_az)))
-        target_el = max(-90.0,  min(90.0,  float(target_el)))
-        start_az = float(getattr(self.servo_controller, "azimuth_angle", 0.0))
-        start_el = float(getattr(self.servo_controller, "elevation_angle", 0.0))
-        self._glide_state = {
-            "t0": time.time(),
-            "dur": max(0.01, float(seconds)),
-            "start_az": start_az,
-            "start_el": start_el,
-            "target_az": target_az,
-            "target_el": target_el,
-        }
-
-    def _step_glide(self):
-        """advance an in-progress glide. returns True if gliding, else False."""
-        if not self._glide_state:
-            return False
-        import time
-        gs = self._glide_state
-        t = time.time()
-        alpha = (t - gs["t0"]) / gs["dur"]
-        if alpha >= 1.0:
-            v_az = gs["target_az"]
-            v_el = gs["target_el"]
-            self._glide_state = None
-        else:
-            if alpha < 0.0:
-                alpha = 0.0
-            v_az = gs["start_az"] + (gs["target_az"] - gs["start_az"]) * alpha
-            v_el = gs["start_el"] + (gs["target_el"] - gs["start_el"]) * alpha
-
-        self.servo_controller.set_azimuth(v_az)
-        self.servo_controller.set_elevation(v_el)
-        if hasattr(self, 'az_slider_widget'):
-            self.az_slider_widget.set_value(v_az)
-        if hasattr(self, 'el_slider_widget'):
-            self.el_slider_widget.set_value(v_el)
-        return self._glide_state is not None
-
-
     def autotrack_start(self, button):
         if not self.satellites:
             self.dec_status.set_text("No satellites loaded.")
@@ -827,68 +886,136 @@ class satelliteapp:
             record=False,
             out_dir=self.autotrack_out
         )
-        self.autotrack_seen.clear()
-        self.autotrack_last_images = []
         self.autotrack_out.mkdir(parents=True, exist_ok=True)
+        self.start_output_watcher()
         self.autotrack_runner = runner
+        self._log_seq = self._signal_seq = 0
+        self.dec_log.clear()
         self.autotrack_runner.start()
+        self.start_signal_recording(runner, idx)
         self.dec_status.set_text("Running")
 
+    def start_signal_recording(self, runner, idx):
+        """Record SatDump's signal health next to servo and predicted pointing for this pass."""
+        self.stop_signal_recording()
+        if self.signal_store is None:
+            self.signal_store = SignalStore()
+        sat = self.satellites[idx]
+        writer = self.signal_store.open_pass(sat.name, sat.model.satnum)
+        self.signal_recorder = SignalRecorder(writer, lambda t: self._signal_sample(runner, idx, t),
+                                              alive=lambda: runner.alive)
+        self.signal_recorder.start()
+
+    def start_decode_queue(self):
+        """Work through the shared IQ decode queue in the background; it holds off while SatDump is receiving live here or in the scheduler.
+
+        Autotrack decodes live, so the TUI never adds jobs itself: the queue
+        holds recordings from the headless scheduler and earlier sessions.
+        """
+        if self.decode_queue is None:
+            self.decode_queue = DecodeQueue(
+                paused_when=lambda: self.autotrack_runner is not None and self.autotrack_runner.alive)
+            self.decode_queue.start()
+
+    def stop_signal_recording(self):
+        if self.signal_recorder is not None:
+            self.signal_recorder.stop()
+            self.signal_recorder = None
+
+    def _signal_sample(self, runner, idx, t):
+        row = runner.log.signal()
+        row["servo_az"] = float(self.servo_controller.azimuth_angle)
+        row["servo_el"] = float(self.servo_controller.elevation_angle)
+        if self.propagator is not None and idx < len(self.satellites):
+            az, el = self.propagator.look_angles_unix(np.array([t]), [idx])
+            az, el = float(az[0, 0]), float(el[0, 0])
+            row["predicted_az"], row["predicted_el"] = az, el
+            row["target_az"], row["target_el"], _ = satellite_to_servo_coords(az, el)
+        return row
+
+    def start_output_watcher(self):
+        """Watch the SatDump output tree for new images; the baseline is taken on the watcher thread."""
+        if self.output_watcher is None:
+            self.output_watcher = OutputWatcher(self.autotrack_out)
+            self.output_watcher.start()
+
     def autotrack_stop(self, button):
         if self.autotrack_runner:
             self.autotrack_runner.stop()
             self.autotrack_runner = None
+        self.stop_signal_recording()
         self.dec_status.set_text("Stopped")
 
-    def _compute_satellite_frame_bg(self):
-        """Compute scores, telemetry, and map in a background thread.
-        Stores results in self._bg_result to be consumed by the UI thread.
-        """
-        try:
-            if not self.satellites or not self.observer or not self.ts:
-                self._bg_result = None
-                return
-            now = datetime.now(timezone.utc)
-            t = self.ts.from_datetime(now)
+    def compute_frame(self, frame_time):
+        """Scores, telemetry rows and map markup for unix time ``frame_time``.
 
-            scores, best_sat = select_best_satellite(self.satellites, self.observer, self.ts)
+        Runs on the compute worker thread, which owns propagation; refreshed
+        TLEs are swapped in here so no frame ever mixes old and new elements.
+        """
+        if self._tle_reload_pending:
+            self.reload_tle()
+        if not self.satellites or not self.observer or not self.ts or not self.propagator:
+            return None
+        now = datetime.fromtimestamp(frame_time, timezone.utc)
+        t = self.ts.from_datetimes([now + timedelta(seconds=s) for s in lookahead_offsets()])
 
-            positions, sat_data = [], []
-            obs_lat = self.observer.latitude.degrees
-            obs_lon = self.observer.longitude.degrees
-            for sat in self.satellites:
-                sp = sat.at(t).subpoint()
-                diff = sat - self.observer
-                el, az, _ = diff.at(t).altaz()
-                lat, lon, alt = sp.latitude.degrees, sp.longitude.degrees, sp.elevation.km
-                positions.append((lat, lon))
+        frame = self.propagator.propagate(t)
+        scores, best_sat = rank_satellites(
+            self.satellites, score_satellites(frame.el[:, 0], frame.el, frame.range_km[:, 0]))
 
-                sl_dist = diff.at(t).distance().km
-                gc_dist = self._haversine_km(obs_lat, obs_lon, lat, lon)
-                rv = diff.at(t).velocity.m_per_s
-                speed = (rv[0]**2 + rv[1]**2 + rv[2]**2)**0.5
+        if self.ground_track is None:
+            map_prop = Propagator(self.satellites[:max_satellites], self.observer_lat, self.observer_lon)
+            self.ground_track = GroundTrackCache(map_prop, map_forecast_points, map_forecast_length * 60.0)
+        forecast_lat, forecast_lon = self.ground_track.update(frame_time)
 
-                np_key = sat.name
-                now_ts = time.time()
-                cache_entry = self._next_pass_cache.get(np_key)
-                if cache_entry and (now_ts - cache_entry[0]) < self.pass_update_interval:
-                    next_pass_seconds = cache_entry[1]
-                else:
-                    next_pass_seconds = find_next_pass(sat, self.observer, self.ts, min_elevation=20)
-                    self._next_pass_cache[np_key] = (now_ts, next_pass_seconds)
-                sat_data.append((sat.name, az, el, lat, lon, alt, gc_dist, sl_dist, speed, next_pass_seconds))
+        self._refresh_next_passes()
 
-            map_display = draw_map_frame(positions, self.satellites, self.ts, self.observer_lat, self.observer_lon)
+        positions, sat_data = [], []
+        obs_lat = self.observer.latitude.degrees
+        obs_lon = self.observer.longitude.degrees
+        for i, sat in enumerate(self.satellites):
+            lat, lon, alt = float(frame.lat[i, 0]), float(frame.lon[i, 0]), float(frame.alt_km[i, 0])
+            az, el = float(frame.az[i, 0]), float(frame.el[i, 0])
+            positions.append((lat, lon))
+
+            sl_dist = float(frame.range_km[i, 0])
+            gc_dist = self._haversine_km(obs_lat, obs_lon, lat, lon)
+            speed = float(frame.speed_m_s[i, 0])
+
+            upcoming = self._next_pass_cache.get(sat.name, (0.0, None))[1]
+            sat_data.append((sat.name, az, el, lat, lon, alt, gc_dist, sl_dist, speed, upcoming))
+
+        if self.map_renderer is None:
+            self.map_renderer = MapRenderer(ascii_map)
+        map_display = self.map_renderer.render(self.map_renderer.overlay(
+            positions, forecast_lat, forecast_lon, self.observer_lat, self.observer_lon, colourlist, max_satellites))
+        return scores, best_sat, sat_data, map_display
+
+    def frame_stats_text(self):
+        stats = self.compute_worker.stats()
+        age = f"{stats['age_s']:.1f}s old" if stats["age_s"] is not None else "no frame"
+        colour = "yellow" if stats["age_s"] is not None and stats["age_s"] > 3 * self.map_update_interval else "dark_gray"
+        errors = f", {stats['errors']} failed" if stats["errors"] else ""
+        return f"[{colour}]frame {stats['compute_ms']:.0f} ms, {age}, {stats['skipped']} skipped{errors}[/{colour}]"
+
+    def _refresh_next_passes(self, min_elevation=20):
+        """Refresh next-pass records once any entry is stale, via the on-disk pass cache."""
+        now_ts = time.time()
+        stale = False
+        for sat in self.satellites:
+            entry = self._next_pass_cache.get(sat.name)
+            if (entry is None or (now_ts - entry[0]) >= self.pass_update_interval
+                    or (entry[1] is not None and entry[1].los < now_ts)):
+                stale = True
+                break
+        if not stale:
+            return
 
-            self._bg_result = {
-                'scores': scores,
-                'best_sat': best_sat,
-                'sat_data': sat_data,
-                'map_display': map_display,
-            }
-            self._last_map_update = time.time()
-        finally:
-            self._bg_computing = False
+        if self.pass_cache is None or self.pass_cache.min_elevation != min_elevation:
+            self.pass_cache = PassCache(self.observer_lat, self.observer_lon, min_elevation)
+        predicted = self.pass_cache.passes(self.satellites, now_ts, next_pass_horizon, self.propagator)
+        for sat, passes in zip(self.satellites, predicted):
+            self._next_pass_cache[sat.name] = (now_ts, next_pass(passes, now_ts))
 
     def setup_data(self, names, coords):
         self.observer_lat, self.observer_lon = map(float, coords.split())
@@ -897,36 +1024,62 @@ class satelliteapp:
 
         if len(names) == 1 and names[0].strip().lower() == 'best':
             try:
-                lines = open(tle_file, encoding='utf-8').read().splitlines()
+                all_sats = load_catalog(tle_file).satellites()
             except FileNotFoundError:
                 self.satellites = []
                 return ["[bright_red]TLE file not found[/bright_red]"]
 
-            all_sats = []
-            for i in range(0, len(lines) - 2, 3):
-                n = lines[i].strip()
-                l1 = lines[i+1].strip() if i+1 < len(lines) else None
-                l2 = lines[i+2].strip() if i+2 < len(lines) else None
-                if l1 and l2 and l1.startswith('1 ') and l2.startswith('2 '):
-                    try:
-                        all_sats.append(EarthSatellite(l1, l2, n))
-                    except Exception:
-                        pass
-
             if not all_sats:
                 self.satellites = []
                 return ["[bright_red]No satellites parsed from TLE file[/bright_red]"]
 
-            scores, _ = select_best_satellite(all_sats, self.observer, self.ts)
+            candidates = make_propagator(all_sats, self.observer_lat, self.observer_lon)
+            try:
+                scores, _ = select_best_satellite(all_sats, self.observer, self.ts, candidates)
+            finally:
+                candidates.close()
             ranked = [s for s in sorted(all_sats, key=lambda s: scores.get(s, 0), reverse=True) if scores.get(s, 0) > 0]
             picked = ranked[:4]
             self.satellites = picked
+            self._set_propagator(make_propagator(self.satellites, self.observer_lat, self.observer_lon))
             picked_names = ", ".join(s.name for s in picked) if picked else "none"
             return [f"[white]Auto-selected best: {picked_names}[/white]"]
 
         self.satellites, messages = get_satellites(names)
+        self._set_propagator(make_propagator(self.satellites, self.observer_lat, self.observer_lon))
         return messages
 
+    def start_tle_refresh(self, force=False):
+        """Keep satellites.txt current in the background; the tracker keeps using what is loaded."""
+        if self.tle_refresher is None:
+            self.tle_refresher = TleRefresher(tle_file)
+        self.tle_refresher.start(on_update=self._on_tle_updated, force=force)
+
+    def _on_tle_updated(self, messages):
+        self.tle_status = messages[-1] if messages else ""
+        self._tle_reload_pending = True
+
+    def reload_tle(self):
+        """Swap in refreshed elements for the tracked satellites, keeping their order and indices."""
+        self._tle_reload_pending = False
+        catalog = load_catalog(tle_file)
+        sats = []
+        for sat in self.satellites:
+            entry = catalog.get(sat.model.satnum)
+            sats.append(catalog.satellite(entry) if entry is not None else sat)
+        self.satellites = sats
+        self._set_propagator(make_propagator(self.satellites, self.observer_lat, self.observer_lon))
+        self._next_pass_cache = {}
+        self.pointing_table = None
+        if self.tracking_locked and self.locked_satellite_index is not None:
+            self._request_pointing_table(self.locked_satellite_index)
+
+    def _set_propagator(self, propagator):
+        old, self.propagator = self.propagator, propagator
+        self.ground_track = None
+        if old is not None:
+            old.close()
+
     def _haversine_km(self, lat1, lon1, lat2, lon2):
         """Fast spherical great-circle distance (approximate) in kilometers."""
         rlat1, rlon1, rlat2, rlon2 = map(math.radians, [lat1, lon1, lat2, lon2])
@@ -949,9 +1102,7 @@ class satelliteapp:
                 parts.append(f"[gray]{name} ({score:.1f})[/gray]")
         return " | ".join(parts)
     
-    def create_metrics_table(self, sat_data):
-        boxes = []
-        
+    def update_metrics_table(self, sat_data):
         if len(sat_data) > 4:
             satellites_per_page = 4
             total_pages = (len(sat_data) + satellites_per_page - 1) // satellites_per_page
@@ -963,51 +1114,15 @@ class satelliteapp:
             
             self.page_info_text = f"Page {self.current_sat_page + 1} of {total_pages}"
         else:
+            start_idx = 0
             display_data = sat_data
             self.page_info_text = None
-        
-        for i, (name, az, el, lat, lon, alt, gc_dist, sl_dist, speed, next_pass_seconds) in enumerate(display_data):
-            if len(sat_data) > 4:
-                actual_index = self.current_sat_page * 4 + i
-                header = urwid.Text(f"{actual_index+1}. {name}", align='center')
-            else:
-                header = urwid.Text(f"{i+1}. {name}", align='center')
-            
-            if next_pass_seconds is not None:
-                if next_pass_seconds < 60:
-                    next_pass_str = f"{int(next_pass_seconds)}s"
-                elif next_pass_seconds < 3600:
-                    minutes = int(next_pass_seconds // 60)
-                    seconds = int(next_pass_seconds % 60)
-                    next_pass_str = f"{minutes}m {seconds}s"
-                else:
-                    hours = int(next_pass_seconds // 3600)
-                    minutes = int((next_pass_seconds % 3600) // 60)
-                    next_pass_str = f"{hours}h {minutes}m"
-            else:
-                next_pass_str = ">24h"
-            
-            metrics = [
-                ("Azimuth", f"{az.degrees:.1f} deg"),
-                ("Elevation", f"{el.degrees:.1f} deg"),
-                ("Latitude", f"{lat:.3f} deg"),
-                ("Longitude", f"{lon:.3f} deg"),
-                ("Altitude", f"{alt:.1f} km"),
-                ("GC Distance", f"{gc_dist:.1f} km"),
-                ("SL Distance", f"{sl_dist:.1f} km"),
-                ("Speed", f"{speed:.1f} m/s"),
-                ("Next Pass", next_pass_str),
-            ]
-            
-            rows = [urwid.Columns([
-                ('weight', 1, urwid.Text(m_name)),
-                ('weight', 1, urwid.Text(m_val, align='right'))
-            ]) for m_name, m_val in metrics]
-            
-            pile = urwid.Pile([header] + rows)
-            boxes.append(('weight', 1, urwid.LineBox(pile)))
-        
-        return urwid.Columns(boxes, dividechars=1)
+
+        now_ts = time.time()
+        self.telemetry_table.update([
+            (f"{start_idx + i + 1}. {entry[0]}", telemetry_rows(entry, now_ts))
+            for i, entry in enumerate(display_data)
+        ])
     
     def cycle_satellite_page(self, direction):
         if len(self.satellites) > 5:
@@ -1032,10 +1147,9 @@ class satelliteapp:
             el_sf, az_sf, _ = diff.at(t).altaz()
             self.current_az = az_sf.degrees
             self.current_el = el_sf.degrees
-            g_az, g_el, flipped = satellite_to_servo_coords(self.current_az, self.current_el)
-            self._start_glide_to(g_az, g_el, seconds=2.0)
+            g_az, g_el, _ = satellite_to_servo_coords(self.current_az, self.current_el)
+            self.servo_loop.move_to(g_az, g_el)
             self.last_tracked_index = idx
-            self.last_tracked_flipped = bool(flipped)
 
         self.update_servo_display()
     
@@ -1054,64 +1168,107 @@ class satelliteapp:
             self.locked_satellite_index = sat_index
             self.hover_satellite_index = sat_index
             self.current_az, self.current_el = self.preview_satellite_position(sat_index)
+            self.pointing_table = None
+            self.trajectory = None
+            self._request_pointing_table(sat_index)
 
         self.update_servo_display()
 
-    def update_satellite_position(self):
+    def _request_pointing_table(self, sat_index):
+        """Build the locked satellite's pointing table, and the servo trajectory of its pass, in the background."""
+        with self._pointing_lock:
+            failure = self._pointing_failure
+            backing_off = failure is not None and failure[0] == sat_index and time.time() < failure[2]
+            if self._pointing_building or not self.propagator or backing_off:
+                return
+            self._pointing_building = True
+
+        def worker():
+            try:
+                now_ts = time.time()
+                propagator = self.propagator
+                start, end = pointing_window(propagator, sat_index, now_ts)
+                table = build_pointing_table(propagator, sat_index, start, end)
+                plan = plan_table_pass(table, start=(self.servo_loop.az, self.servo_loop.el))
+                if self.locked_satellite_index == sat_index and self.propagator is propagator:
+                    self.pointing_table = table
+                    self.trajectory = plan
+                with self._pointing_lock:
+                    self._pointing_failure = None
+                    self.pointing_error = None
+            except Exception as e:
+                # back off, so a satellite that cannot be tabulated does not start a build every servo tick
+                with self._pointing_lock:
+                    failure = self._pointing_failure
+                    count = failure[1] + 1 if failure is not None and failure[0] == sat_index else 1
+                    delay = min(pointing_retry_max, pointing_retry_min * 2 ** (count - 1))
+                    self._pointing_failure = (sat_index, count, time.time() + delay)
+                    self.pointing_error = f"pointing table failed: {e} (retry in {delay:.0f} s)"
+            finally:
+                with self._pointing_lock:
+                    self._pointing_building = False
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _locked_look_angles(self, idx, now_ts=None):
+        """Az/el of a locked satellite at unix time now_ts (default now) from its pointing table.
+
+        None while no table covers now_ts: one is requested in the background
+        and the servo loop holds its last target meanwhile.
+        """
+        now_ts = time.time() if now_ts is None else now_ts
+        table = self.pointing_table
+        if table is not None and table.sat_index == idx and table.covers(now_ts):
+            return table.at(now_ts)
+        self._request_pointing_table(idx)
+        return None
+
+    def servo_command(self, t):
+        """Servo target at unix time t for the servo loop: (az, el), either may be None, or None to hold.
+
+        Runs on the servo loop thread in every screen; it never touches widgets.
+        """
         if not self.satellites or not self.observer or not self.ts:
-            return
+            return None
 
         if self.selected_satellite_index >= len(self.satellites):
             self.selected_satellite_index = 0
 
-        if self._step_glide():
-            return
-
         try:
             if not (self.auto_tracking_enabled and self.tracking_locked and self.locked_satellite_index is not None):
                 self._auto_prev = False
                 self.last_tracked_index = None
-                return
+                return None
 
             idx = self.locked_satellite_index
             if not (0 <= idx < len(self.satellites)):
-                return
-
-            sat = self.satellites[idx]
-            now = datetime.now(timezone.utc)
-            t = self.ts.from_datetime(now)
-            diff = sat - self.observer
-            el, az, _ = diff.at(t).altaz()
-
-            self.current_az = az.degrees
-            self.current_el = el.degrees
-
-            servo_az, servo_el, flipped = satellite_to_servo_coords(self.current_az, self.current_el)
-            jump = (self.last_tracked_index != idx) or (not self._auto_prev and self.auto_tracking_enabled) or (self.last_tracked_flipped != bool(flipped))
+                return None
+
+            look = self._locked_look_angles(idx, t)
+            if look is None:
+                return None
+            self.current_az, self.current_el = look
+
+            # during a planned pass the flip configuration is fixed; jumps (a new target, a flip
+            # outside a plan) are slewed by the servo loop's motion profile
+            plan = self.trajectory
+            if plan is not None and plan.sat_index == idx and plan.covers(t):
+                servo_az, servo_el = plan.at(t)
+            else:
+                plan = None
+                servo_az, servo_el, _ = satellite_to_servo_coords(self.current_az, self.current_el)
 
             self._auto_prev = self.auto_tracking_enabled
             self.last_tracked_index = idx
-            self.last_tracked_flipped = bool(flipped)
-
-            if jump:
-                self._start_glide_to(servo_az, servo_el, seconds=2.0)
-                return
 
-            if self.current_el > 0 and servo_el >= -70:
-                self.servo_controller.set_azimuth(servo_az)
-                self.servo_controller.set_elevation(servo_el)
-                if hasattr(self, 'az_slider_widget'):
-                    self.az_slider_widget.set_value(servo_az)
-                if hasattr(self, 'el_slider_widget'):
-                    self.el_slider_widget.set_value(servo_el)
-            else:
-                self.servo_controller.set_elevation(0)
-                if hasattr(self, 'el_slider_widget'):
-                    self.el_slider_widget.set_value(0)
+            if plan is not None or (self.current_el > 0 and servo_el >= -70):
+                return servo_az, servo_el
+            return None, 0.0
 
         except Exception:
             self.current_az = 0.0
             self.current_el = 0.0
+            return None
 
 
     def preview_satellite_position(self, sat_index):
@@ -1146,7 +1303,19 @@ class satelliteapp:
                 self.selected_sat_text.set_text(f"Target: {name}")
 
         if hasattr(self, 'position_text'):
-            self.position_text.set_text(f"Az: {self.current_az:.3f} deg | El: {self.current_el:.3f} deg")
+            position = f"Az: {self.current_az:.3f} deg | El: {self.current_el:.3f} deg"
+            if self.pointing_error:
+                position += f" | {self.pointing_error}"
+            self.position_text.set_text(position)
+
+        # the servo loop owns the servos; the sliders only mirror its target
+        target_az, target_el = self.servo_loop.target()
+        for widget, value in ((getattr(self, 'az_slider_widget', None), target_az),
+                              (getattr(self, 'el_slider_widget', None), target_el)):
+            if widget is not None and value is not None and value != widget.slider.current_val:
+                widget.set_value(value)
+        if hasattr(self, 'servo_stats_text'):
+            self.servo_stats_text.set_text(parse_colours(self.servo_loop.stats_text()))
     
     def create_auto_tracking_widget(self):
         toggle_text = "DISABLE Auto Track" if self.auto_tracking_enabled else "ENABLE Auto Track"
@@ -1214,13 +1383,13 @@ class satelliteapp:
         self.update_servo_display()
     
     def on_azimuth_change(self, value):
-        self.servo_controller.set_azimuth(value)
+        self.servo_loop.move_to(az=value)
         if self.auto_tracking_enabled:
             self.auto_tracking_enabled = False
             self.update_servo_display()
     
     def on_elevation_change(self, value):
-        self.servo_controller.set_elevation(value)
+        self.servo_loop.move_to(el=value)
         if self.auto_tracking_enabled:
             self.auto_tracking_enabled = False
             self.update_servo_display()
@@ -1241,6 +1410,7 @@ class satelliteapp:
 
         status_text = "Hardware Available" if self.servo_controller.hardware_available else "Simulation Mode"
         status_widget = urwid.Text(f"Status: {status_text}", align='center')
+        self.servo_stats_text = urwid.Text("", align='center')
 
         instructions = urwid.Text(
             "Up/Down: ±1 deg  |  Shift+Up/Down: ±10 deg\n" +
@@ -1252,6 +1422,7 @@ class satelliteapp:
         manual_control = urwid.Pile([
             ('pack', urwid.Divider()),
             ('pack', status_widget),
+            ('pack', self.servo_stats_text),
             ('pack', urwid.Divider()),
             ('pack', urwid.Columns([
                 ('weight', 1, self.az_slider_widget),
@@ -1280,6 +1451,8 @@ class satelliteapp:
     
     def switch_mode(self, button, mode):
         self.current_mode = mode
+        if mode == "decoder":
+            self.start_output_watcher()
         self.update_main_content()
     
     def update_main_content(self):
@@ -1403,7 +1576,6 @@ class satelliteapp:
             return
 
         if self.current_mode == "servo_control":
-            self.update_satellite_position()
             self.update_servo_display()
             
         if not self.satellites or self.current_mode != "satellite_tracking":
@@ -1411,44 +1583,44 @@ class satelliteapp:
                 self.loop.set_alarm_in(self.update_interval, lambda loop, data: self.update_display())
             return
 
-        now_ts = time.time()
-        if (not self._bg_computing and
-            (self._bg_result is None or (now_ts - self._last_map_update) >= self.map_update_interval)):
-            self._bg_computing = True
-            threading.Thread(target=self._compute_satellite_frame_bg, daemon=True).start()
-
-        if self._bg_result is not None:
-            scores = self._bg_result['scores']
-            best_sat = self._bg_result['best_sat']
-            sat_data = self._bg_result['sat_data']
-            map_display = self._bg_result['map_display']
-
-            status_line = self.create_status_line(scores, best_sat)
+        snapshot = self.compute_worker.latest()
+        if snapshot is not None:
+            map_display = snapshot.map_display
+
+            status_line = self.create_status_line(snapshot.scores, snapshot.best_sat)
             if hasattr(self, 'page_info_text') and self.page_info_text:
                 status_line += f" | {self.page_info_text}"
-
-            metrics = self.create_metrics_table(sat_data)
-
-            self.status_text.set_text(parse_colours(status_line))
-            self.map_text.set_text(parse_colours(map_display))
-            self.metrics_placeholder.original_widget = metrics
+            if self.tle_status:
+                status_line += f" | {self.tle_status}"
+            status_line += f" | {self.frame_stats_text()} | {self.servo_loop.stats_text()}"
+
+            self.update_metrics_table(snapshot.sat_data)
+
+            if status_line != self._shown_status:
+                self.status_text.set_text(parse_colours(status_line))
+                self._shown_status = status_line
+            if map_display is not self._shown_map:
+                self.map_text.set_text(map_display)
+                self._shown_map = map_display
         
         if self.current_mode == "decoder":
-            if self.autotrack_runner and self.autotrack_runner.alive:
-                if self.autotrack_runner.get_new_lines():
-                    self.dec_log.set_text(self.autotrack_runner.tail_text(200))
-
-            new = []
-            if self.autotrack_out.exists():
-                for ext in ("*.png","*.jpg","*.jpeg","*.bmp"):
-                    for p in self.autotrack_out.glob(f"**/{ext}"):
-                        if p not in self.autotrack_seen:
-                            self.autotrack_seen.add(p)
-                            new.append(p)
-
+            runner = self.autotrack_runner
+            if runner:
+                lines, self._log_seq = runner.new_lines(self._log_seq)
+                self.dec_log.extend(lines)
+                seq, summary = runner.log.summary()
+                if seq != self._signal_seq:
+                    self.dec_signal.set_text(parse_colours(summary))
+                    self._signal_seq = seq
+            if self.decode_queue is not None:
+                queue_text = "IQ backlog (scheduler recordings): " + self.decode_queue.status_text()
+                if queue_text != self._shown_queue:
+                    self.dec_queue.set_text(parse_colours(queue_text))
+                    self._shown_queue = queue_text
+
+            new = self.output_watcher.drain() if self.output_watcher else []
             if new:
                 self.autotrack_last_images.extend(new)
-                self.autotrack_last_images = self.autotrack_last_images[-12:]
                 names = [f"- {p.name}" for p in reversed(self.autotrack_last_images)]
                 self.dec_imgs.set_text("\n".join(names))
 
@@ -1458,7 +1630,9 @@ class satelliteapp:
     def create_main_widget(self):
         self.status_text = urwid.Text("", align='center')
         self.map_text = urwid.Text("", align='center')
-        self.metrics_placeholder = urwid.WidgetPlaceholder(urwid.SolidFill())
+        self.telemetry_table = TelemetryTable()
+        self._shown_status = None
+        self.metrics_placeholder = urwid.WidgetPlaceholder(self.telemetry_table.widget)
         
         sat_tracking_btn = urwid.AttrMap(urwid.Button("Satellite Tracking", on_press=self.switch_mode, user_data="satellite_tracking"), 'button', 'button_focus')
         servo_control_btn = urwid.AttrMap(urwid.Button("Servo Control", on_press=self.switch_mode, user_data="servo_control"), 'button', 'button_focus')
@@ -1518,7 +1692,10 @@ class satelliteapp:
                 return True
     
     def run(self, names, coords):
-        messages = self.setup_data(names, coords)
+        with startup_step("setup_data"):
+            messages = self.setup_data(names, coords)
+        if self.servo_controller.init_error:
+            messages.append(f"[yellow]{self.servo_controller.init_error}[/yellow]")
         if messages:
             self.show_loading_screen(messages, duration=3.0, title="Loading telemetry and ephemerides")
 
@@ -1526,7 +1703,10 @@ class satelliteapp:
         if not self.satellites:
             self.show_loading_screen(["[red]No satellites found[/red]"], duration=5.0, title="")
             return
-        self.show_loading_task(lambda: (self._compute_satellite_frame_bg() or ["[green]Map ready[/green]"]), title=parse_colours("[white]Preparing map[/white]"))
+        self.show_loading_task(lambda: (self.compute_worker.run_once() and None) or ["[green]Map ready[/green]"], title=parse_colours("[white]Preparing map[/white]"))
+        self.compute_worker.start()
+        self.servo_loop.start()
+        self.start_decode_queue()
         self.running = True
         self.loop = urwid.MainLoop(self.create_main_widget(), palette=palette, unhandled_input=self.unhandled_input)
         self.loop.set_alarm_in(self.update_interval, lambda loop, data: self.update_display())
@@ -1536,6 +1716,17 @@ class satelliteapp:
         except KeyboardInterrupt:
             self.running = False
         finally:
+            self.compute_worker.stop()
+            self.servo_loop.stop()
+            if self.propagator is not None:
+                self.propagator.close()
+            if self.tle_refresher is not None:
+                self.tle_refresher.stop()
+            if self.output_watcher is not None:
+                self.output_watcher.stop()
+            self.stop_signal_recording()
+            if self.decode_queue is not None:
+                self.decode_queue.stop()
             try:
                 if os.name == 'nt':
                     os.system('cls')
@@ -1607,6 +1798,9 @@ def get_user_input_ui():
     boxed = urwid.AttrMap(urwid.LineBox(form, title="Setup"), 'border')
     centered = urwid.Filler(urwid.Padding(boxed, align='center', width=('relative', 60)), valign='middle')
     loop = urwid.MainLoop(centered, palette=palette)
+    shown_at = time.perf_counter() - _startup_t0
+    loop.set_alarm_in(0, lambda loop, data: startup_timings.append(("setup form shown (since start)", shown_at)))
+    start_heavy_loader()
     loop.run()
 
     if result["cancel"]:
@@ -1614,27 +1808,25 @@ def get_user_input_ui():
     return result["names"], result["coords"], result["fetch"]
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Satellite tracker")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import/initialisation timing breakdown on exit")
+    args = parser.parse_args()
+
     names, coords, fetch_requested = get_user_input_ui()
     if names and coords:
+        wait_for_heavy_modules()
         app = satelliteapp()
-        if fetch_requested:
-            msgs = app.show_loading_task(
-                lambda: (
-                    (lambda connected_msg, tle_msg: [connected_msg, tle_msg])(
-                        *(
-                            (lambda connected, msg: (
-                                msg,
-                                fetch_tle_data()[1] if connected else "[yellow]Using local TLE file[/yellow]"
-                            ))(*check_connection())
-                        )
-                    )
-                ),
-                title="Fetching TLEs"
-            )
+        if not os.path.exists(tle_file):
+            msgs = app.show_loading_task(lambda: fetch_tle_data()[1], title="Fetching TLEs")
             if msgs:
                 app.show_loading_screen(msgs, duration=2.0, title="TLE/Network Messages")
         else:
-            app.show_loading_screen(["[white]Using local TLE file[/white]"], duration=1.2, title="")
+            note = "refreshing now" if fetch_requested else "refreshing in the background when due"
+            app.show_loading_screen([f"[white]Using local TLE file, {note}[/white]"], duration=1.2, title="")
+        app.start_tle_refresh(force=fetch_requested)
 
         app.show_loading_screen(["[white]Starting satellite tracker. Press 'q' to quit.[/white]"], duration=1.0, title="")
-        app.run(names, coords)
\ No newline at end of file
+        app.run(names, coords)
+    if args.profile_startup:
+        print_startup_profile()
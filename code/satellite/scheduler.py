@@ -0,0 +1,467 @@
+"""Headless pass scheduler: plans receptions for every loaded satellite and runs them.
+
+Run from the repository root, e.g.
+``python3 code/satellite/scheduler.py --coords "-31.95 115.86" --dry-run``.
+"""
+import argparse, bisect, json, os, sys, threading, time
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, base_dir)
+
+import numpy as np
+from pass_cache import PassCache, catalog_number
+from propagation import Propagator
+from servo_loop import ServoLoop
+from trajectory import plan_trajectory, rotator_feasibility, trajectory_step
+from tle_catalog import load_catalog
+
+
+def parse_weights(weights):
+    """(elevation, value, history) score weights from "a,b,c" or a sequence of three numbers."""
+    try:
+        parsed = tuple(float(w) for w in (weights.split(",") if isinstance(weights, str) else weights))
+    except (TypeError, ValueError):
+        parsed = ()
+    if len(parsed) != 3:
+        raise ValueError(f"schedule weights must be three numbers \"elevation,value,history\", got {weights!r}")
+    return parsed
+
+
+tle_file = os.path.join(base_dir, "satellites.txt")
+schedule_hours = float(os.getenv("SATTRACK_SCHEDULE_HOURS", "48"))
+schedule_min_elevation = float(os.getenv("SATTRACK_SCHEDULE_MIN_EL", "15"))
+try:
+    schedule_weights = parse_weights(os.getenv("SATTRACK_SCHEDULE_WEIGHTS", "1,1,1"))
+except ValueError as e:
+    raise ValueError(f"SATTRACK_SCHEDULE_WEIGHTS: {e}") from None
+schedule_gap = float(os.getenv("SATTRACK_SCHEDULE_GAP_S", "60"))
+schedule_lead = float(os.getenv("SATTRACK_SCHEDULE_LEAD_S", "60"))
+rotator_step = float(os.getenv("SATTRACK_SCHEDULE_ROTATOR_STEP_S", "10"))
+# longer "passes" are geostationary or high orbits that never set; they are not scheduled
+schedule_max_pass = float(os.getenv("SATTRACK_SCHEDULE_MAX_PASS_MIN", "30")) * 60
+schedule_targets_file = os.getenv("SATTRACK_SCHEDULE_TARGETS", os.path.join(base_dir, "schedule_targets.json"))
+schedule_cache_file = os.path.join(base_dir, "schedule_passes.json")
+
+# SatDump pipeline, L-band downlink frequency and relative worth of a pass, by satellite name;
+# override or extend with a JSON file of the same shape at SATTRACK_SCHEDULE_TARGETS
+default_targets = {
+    "METOP-B": {"pipeline": "metop_ahrpt", "frequency_hz": 1701.3e6, "value": 1.0},
+    "METOP-C": {"pipeline": "metop_ahrpt", "frequency_hz": 1701.3e6, "value": 1.0},
+    "METEOR-M2 3": {"pipeline": "meteor_hrpt", "frequency_hz": 1700.0e6, "value": 0.9},
+    "METEOR-M2 4": {"pipeline": "meteor_hrpt", "frequency_hz": 1700.0e6, "value": 0.9},
+    "FENGYUN 3B": {"pipeline": "fengyun3_ab_ahrpt", "frequency_hz": 1704.5e6, "value": 0.7},
+    "FENGYUN 3C": {"pipeline": "fengyun3_c_ahrpt", "frequency_hz": 1701.4e6, "value": 0.7},
+}
+untargeted_value = 0.1
+unknown_history = 0.5
+
+
+def load_targets(path=None):
+    """default_targets, overridden per satellite (name or catalog number) by the JSON targets file."""
+    targets = {k.upper(): dict(v) for k, v in default_targets.items()}
+    try:
+        with open(path or schedule_targets_file, encoding="utf-8") as f:
+            for key, value in json.load(f).items():
+                targets[str(key).upper()] = dict(value)
+    except (OSError, ValueError, AttributeError):
+        pass
+    return targets
+
+
+class ScheduledPass(NamedTuple):
+    sat_name: str
+    norad: str
+    aos: float
+    tca: float
+    los: float
+    max_el: float
+    aos_az: float
+    los_az: float
+    score: float
+    pipeline: Optional[str]
+    frequency_hz: Optional[float]
+
+    def overlaps(self, other, gap=0.0):
+        return self.aos < other.los + gap and other.aos < self.los + gap
+
+
+def resolve_conflicts(candidates, gap=None, pinned=None):
+    """Highest total score set of passes with at least ``gap`` seconds between them.
+
+    Weighted interval scheduling: passes sorted by LOS, and for each the best
+    plan either skips it or takes it after the last pass that ends ``gap``
+    before its AOS. ``pinned`` (the pass being received) is always kept.
+    Returns (plan sorted by AOS, {rejected pass: the planned pass it lost to}).
+    """
+    gap = schedule_gap if gap is None else gap
+    pool = [p for p in candidates if pinned is None or (p != pinned and not p.overlaps(pinned, gap))]
+    pool.sort(key=lambda p: p.los)
+    ends = [p.los + gap for p in pool]
+    best = [0.0] * (len(pool) + 1)
+    take = [False] * len(pool)
+    prev = [0] * len(pool)
+    for j, p in enumerate(pool):
+        prev[j] = bisect.bisect_right(ends, p.aos, 0, j)
+        with_p = best[prev[j]] + p.score
+        take[j] = with_p > best[j]
+        best[j + 1] = with_p if take[j] else best[j]
+    plan = []
+    j = len(pool) - 1
+    while j >= 0:
+        if take[j]:
+            plan.append(pool[j])
+            j = prev[j] - 1
+        else:
+            j -= 1
+    if pinned is not None:
+        plan.append(pinned)
+    plan.sort(key=lambda p: p.aos)
+
+    rejected = {}
+    starts = [p.aos for p in plan]
+    for p in candidates:
+        if p in plan:
+            continue
+        k = bisect.bisect_left(starts, p.aos)
+        for q in plan[max(0, k - 2):k + 2]:
+            if p.overlaps(q, gap):
+                rejected[p] = q
+                break
+    return plan, rejected
+
+
+class Scheduler:
+    """Reception plan over the next ``hours`` for a set of satellites.
+
+    Passes come from a PassCache, so only satellites whose TLE epoch changed
+    since the last update are re-predicted (all of them in one batched
+    call); the others reuse their stored passes. Each pass is scored as
+    ``w_el * max_el / 90 + w_value * target value + w_history * success``,
+    where success is the mean deframer lock fraction of that satellite's
+    recent passes in the signal store, and overlaps are resolved by
+    ``resolve_conflicts``. ``rotator`` then rates every planned pass for the
+    servo mount ("ok", "changeover" or "clamped"), all passes in one batch.
+    """
+
+    def __init__(self, observer_lat, observer_lon, hours=None, min_elevation=None, weights=None,
+                 gap=None, targets=None, signal_store=None, cache_path=None):
+        self.observer_lat = float(observer_lat)
+        self.observer_lon = float(observer_lon)
+        self.hours = schedule_hours if hours is None else float(hours)
+        self.min_elevation = schedule_min_elevation if min_elevation is None else float(min_elevation)
+        self.weights = schedule_weights if weights is None else parse_weights(weights)
+        self.gap = schedule_gap if gap is None else float(gap)
+        self.targets = targets if targets is not None else load_targets()
+        self.signal_store = signal_store
+        # predict a day beyond the horizon so the stored passes stay valid while it slides forward
+        self.cache = PassCache(self.observer_lat, self.observer_lon, self.min_elevation,
+                               path=cache_path or schedule_cache_file, days=self.hours / 24.0 + 1.0)
+        self.plan = []
+        self.rejected = {}
+        self.rotator = {}
+        self.last_update = {}
+        self._lock = threading.Lock()
+
+    def target(self, sat_name, norad):
+        return self.targets.get(str(sat_name).upper()) or self.targets.get(str(norad))
+
+    def history(self):
+        """Mean deframer lock fraction of the last few stored passes, per catalog number."""
+        if self.signal_store is None:
+            return {}
+        by_sat = {}
+        for p in self.signal_store.passes()[-200:]:
+            if p.norad is None:
+                continue
+            lock = self.signal_store.summary(p.pass_id).get("deframer_lock_fraction")
+            if lock is not None:
+                by_sat.setdefault(str(p.norad), []).append(lock)
+        return {norad: float(np.mean(v[-10:])) for norad, v in by_sat.items()}
+
+    def _score(self, record, norad, target, history):
+        w_el, w_value, w_history = self.weights
+        value = target.get("value", 1.0) if target else untargeted_value
+        success = history.get(norad, unknown_history)
+        return w_el * record.max_el / 90.0 + w_value * value + w_history * success
+
+    def update(self, satellites, now=None, propagator=None, pinned=None):
+        """Re-plan for ``satellites``; only those with a new TLE epoch are propagated again."""
+        t0 = time.perf_counter()
+        now = time.time() if now is None else now
+        horizon = self.hours * 3600.0
+        per_sat = self.cache.passes(satellites, now, horizon, propagator)
+        history = self.history()
+
+        candidates = []
+        for sat, records in zip(satellites, per_sat):
+            norad = catalog_number(sat)
+            target = self.target(sat.name, norad)
+            for r in records:
+                if r.los < now or r.aos > now + horizon or r.los - r.aos > schedule_max_pass:
+                    continue
+                candidates.append(ScheduledPass(
+                    r.sat_name, norad, r.aos, r.tca, r.los, r.max_el, r.aos_az, r.los_az,
+                    self._score(r, norad, target, history),
+                    target.get("pipeline") if target else None,
+                    target.get("frequency_hz") if target else None))
+        plan, rejected = resolve_conflicts(candidates, self.gap, pinned)
+        t1 = time.perf_counter()
+        rotator = self.rotator_check(plan, satellites)
+        with self._lock:
+            self.plan, self.rejected, self.rotator = plan, rejected, rotator
+            self.last_update = {
+                "satellites": len(satellites),
+                "repredicted": self.cache.last_predicted,
+                "candidates": len(candidates),
+                "planned": len(plan),
+                "ms": (time.perf_counter() - t0) * 1000,
+                "rotator_ms": (time.perf_counter() - t1) * 1000,
+            }
+        return plan
+
+    def rotator_check(self, plan, satellites, step=None):
+        """{pass: "ok" | "changeover" | "clamped"} for the servo mount, every pass sampled in one batch.
+
+        "changeover" passes need the mid-pass switch between the direct and
+        the flipped configuration that plan_trajectory places; "clamped" ones
+        have samples neither configuration reaches.
+        """
+        step = rotator_step if step is None else float(step)
+        by_norad = {catalog_number(s): s for s in satellites}
+        plan = [p for p in plan if p.norad in by_norad]
+        if not plan:
+            return {}
+        sats = list({p.norad: by_norad[p.norad] for p in plan}.values())
+        column = {catalog_number(s): i for i, s in enumerate(sats)}
+        aos = np.array([p.aos for p in plan])
+        counts = np.floor((np.array([p.los for p in plan]) - aos) / step).astype(int) + 1
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        times = np.repeat(aos, counts) + step * (np.arange(counts.sum()) - np.repeat(starts, counts))
+        indices = np.repeat([column[p.norad] for p in plan], counts)
+        az, el = Propagator(sats, self.observer_lat, self.observer_lon).look_angles_pairs(indices, times)
+        fit = rotator_feasibility(az, el, starts)
+        return {p: "clamped" if fit["clamped"][k] else "ok" if fit["one_config"][k] else "changeover"
+                for k, p in enumerate(plan)}
+
+    def drop(self, p):
+        """Take ``p`` out of the plan, e.g. when its satellite is no longer loaded."""
+        with self._lock:
+            self.plan = [q for q in self.plan if q != p]
+
+    def next_pass(self, now=None):
+        """First planned pass that has not ended yet."""
+        now = time.time() if now is None else now
+        with self._lock:
+            for p in self.plan:
+                if p.los > now:
+                    return p
+        return None
+
+
+def _utc(t):
+    return datetime.fromtimestamp(t, timezone.utc).strftime("%m-%d %H:%M:%S")
+
+
+def format_plan(plan, rejected=None, rotator=None):
+    rotator = rotator or {}
+    lines = [f"{'AOS (UTC)':<15} {'LOS':<9} {'max el':>6}  {'score':>5}  {'rotator':<10}  satellite / pipeline"]
+    for p in plan:
+        lines.append(f"{_utc(p.aos):<15} {_utc(p.los)[6:]:<9} {p.max_el:6.1f}  {p.score:5.2f}  "
+                     f"{rotator.get(p, '-'):<10}  {p.sat_name} / {p.pipeline or 'track only'}")
+    if rejected:
+        lines.append(f"{len(rejected)} overlapping passes dropped, e.g.:")
+        for p, winner in sorted(rejected.items(), key=lambda kv: kv[0].aos)[:5]:
+            lines.append(f"  {_utc(p.aos)} {p.sat_name} ({p.score:.2f}) lost to {winner.sat_name} ({winner.score:.2f})")
+    return "\n".join(lines)
+
+
+class ScheduleRunner:
+    """Executes a Scheduler's plan: pre-positions the antenna, records and tracks each pass.
+
+    Runs without the TUI. ``replan`` may be called from any thread (e.g. a
+    TLE refresh) and wakes the runner; a pass already being received is
+    pinned so a re-plan never abandons it. Each pass's servo trajectory is
+    planned before AOS and followed by a ServoLoop at its own fixed rate.
+    """
+
+    def __init__(self, scheduler, satellites, receiver=None, servo=None,
+                 device="0", lead=None, log=print):
+        self.scheduler = scheduler
+        self.satellites = list(satellites)
+        self.receiver = receiver
+        self.servo = servo
+        self.servo_loop = ServoLoop(servo, self._servo_command) if servo is not None else None
+        self.device = device
+        self.lead = schedule_lead if lead is None else float(lead)
+        self.log = log
+        self.current = None
+        self.trajectory = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def replan(self, satellites=None):
+        if satellites is not None:
+            self.satellites = list(satellites)
+        self.scheduler.update(self.satellites, pinned=self.current)
+        u = self.scheduler.last_update
+        self.log(f"re-planned: {u['repredicted']}/{u['satellites']} satellites re-predicted, "
+                 f"{u['planned']} of {u['candidates']} passes planned in {u['ms']:.0f} ms")
+        self._wake.set()
+
+    def _wait_until(self, t):
+        """Sleep until unix time ``t``; False if woken early by a re-plan or stop."""
+        while not self._stop.is_set():
+            remaining = t - time.time()
+            if remaining <= 0:
+                return True
+            if self._wake.wait(min(remaining, 60.0)):
+                self._wake.clear()
+                return False
+        return False
+
+    def _servo_command(self, t):
+        """Servo loop command: the planned trajectory (its start point until AOS), else hold."""
+        plan = self.trajectory
+        return plan.at(t) if plan is not None else None
+
+    def _plan(self, p, prop):
+        times = np.arange(p.aos, p.los + trajectory_step, trajectory_step)
+        t0 = time.perf_counter()
+        az, el = prop.look_angles_unix(times)
+        start = (self.servo_loop.az, self.servo_loop.el)
+        plan = plan_trajectory(times, az[0], el[0], start=start)
+        ms = (time.perf_counter() - t0) * 1000
+        self.log(f"trajectory for {p.sat_name}: {plan.describe()}, planned in {ms:.1f} ms")
+        return plan
+
+    def _pointing(self, prop, t):
+        """Signal-store columns for a scheduled pass: servo angles, planned servo target and predicted az/el."""
+        az, el = prop.look_angles_unix(np.array([t]))
+        row = {"predicted_az": float(az[0, 0]), "predicted_el": float(el[0, 0])}
+        if self.servo_loop is not None:
+            row["servo_az"], row["servo_el"] = self.servo_loop.az, self.servo_loop.el
+        plan = self.trajectory
+        if plan is not None:
+            row["target_az"], row["target_el"] = plan.at(t)
+        return row
+
+    def _receive(self, p):
+        sat = next((s for s in self.satellites if catalog_number(s) == p.norad), None)
+        if sat is None:
+            # planned before a TLE refresh dropped it; without this run() would pick it again until LOS
+            self.log(f"skipping {p.sat_name}: catalog number {p.norad} is no longer loaded")
+            self.scheduler.drop(p)
+            return
+        self.current = p
+        try:
+            prop = Propagator([sat], self.scheduler.observer_lat, self.scheduler.observer_lon)
+            if self.servo_loop is not None:
+                self.trajectory = self._plan(p, prop)
+            # a re-plan (e.g. a TLE refresh) wakes the wait early; this pass is pinned, so keep waiting
+            while not self._wait_until(p.aos):
+                if self._stop.is_set():
+                    return
+            if self.receiver is not None and p.pipeline:
+                duration = max(1.0, p.los - time.time())
+                self.receiver.start_recording(p.pipeline, p.frequency_hz, duration, self.device,
+                                              decode=True, max_elevation=p.max_el, satellite=p.sat_name,
+                                              norad=p.norad, pointing=lambda t: self._pointing(prop, t))
+            self.log(f"receiving {p.sat_name} until {_utc(p.los)} (max el {p.max_el:.0f})")
+            while not self._stop.is_set() and time.time() < p.los:
+                self._stop.wait(min(1.0, p.los - time.time()))
+        finally:
+            self.trajectory = None
+            if self.servo_loop is not None:
+                self.servo_loop.move_to(el=0.0)
+            self.current = None
+
+    def run(self):
+        if self.servo_loop is not None:
+            self.servo_loop.start()
+        while not self._stop.is_set():
+            p = self.scheduler.next_pass()
+            if p is None:
+                self._wait_until(time.time() + 3600)
+                continue
+            if p.aos - self.lead > time.time():
+                self.log(f"next: {p.sat_name} at {_utc(p.aos)} UTC (max el {p.max_el:.0f})")
+                if not self._wait_until(p.aos - self.lead):
+                    continue
+            self._receive(p)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self.servo_loop is not None:
+            self.servo_loop.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coords", required=True, help='observer "lat lon" in degrees')
+    parser.add_argument("--satellites", nargs="*", help="names or catalog numbers (default: every satellite in the TLE file)")
+    parser.add_argument("--hours", type=float, default=schedule_hours)
+    parser.add_argument("--weights", help='score weights "elevation,value,history" (default: SATTRACK_SCHEDULE_WEIGHTS)')
+    parser.add_argument("--device", default="0", help="rtl_device index for recordings")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan and exit")
+    parser.add_argument("--no-servo", action="store_true")
+    parser.add_argument("--no-record", action="store_true")
+    args = parser.parse_args()
+    lat, lon = map(float, args.coords.split())
+    try:
+        weights = parse_weights(args.weights) if args.weights is not None else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    def select(catalog):
+        if not args.satellites:
+            return catalog.satellites()
+        entries = {}
+        for name in args.satellites:
+            for entry in catalog.resolve(name):
+                entries.setdefault(entry.norad, entry)
+        return [catalog.satellite(e) for e in entries.values()]
+
+    from signal_store import SignalStore
+    scheduler = Scheduler(lat, lon, hours=args.hours, weights=weights, signal_store=SignalStore())
+    satellites = select(load_catalog(tle_file))
+    scheduler.update(satellites)
+    print(format_plan(scheduler.plan, scheduler.rejected, scheduler.rotator))
+    u = scheduler.last_update
+    print(f"{u['planned']} of {u['candidates']} passes from {u['satellites']} satellites, {u['ms']:.0f} ms "
+          f"({u['rotator_ms']:.0f} ms rotator check)")
+    if args.dry_run:
+        return
+
+    servo = receiver = None
+    if not args.no_servo:
+        import sattrack
+        sattrack.load_heavy_modules()
+        if sattrack._heavy_error is not None:
+            sys.exit(f"servo setup failed: {sattrack._heavy_error} (use --no-servo to schedule without it)")
+        servo = sattrack._servo_instance
+    if not args.no_record:
+        from satdump_interface import satdump_receiver
+        receiver = satdump_receiver(signal_store=scheduler.signal_store)
+    runner = ScheduleRunner(scheduler, satellites, receiver, servo, args.device)
+
+    from tle_refresh import TleRefresher
+    refresher = TleRefresher(tle_file)
+    refresher.start(on_update=lambda messages: runner.replan(select(load_catalog(tle_file))))
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.stop()
+        refresher.stop()
+        if receiver is not None:
+            receiver.stop_recording()
+            if receiver.decode_queue is not None:
+                receiver.decode_queue.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import math, os, threading, time
+from collections import deque
+
+servo_loop_rate = float(os.getenv("SATTRACK_SERVO_RATE", "20"))
+servo_max_speed = float(os.getenv("SATTRACK_SERVO_MAX_SPEED", "90"))
+servo_max_accel = float(os.getenv("SATTRACK_SERVO_MAX_ACCEL", "180"))
+stats_window = 512
+az_limits = (-135.0, 135.0)
+el_limits = (-90.0, 90.0)
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class AxisProfile:
+    """Trapezoidal motion of one servo axis towards a target that may change every tick.
+
+    Each ``step`` accelerates by at most ``accel`` deg/s^2, cruises at
+    ``speed`` deg/s and brakes in time to stop on the target. A new target
+    just replaces the old one and the current velocity carries over, so a
+    pre-empted slew turns round smoothly instead of stopping dead; a moving
+    target (a satellite) is followed with a lag of about v^2 / 2a.
+    """
+
+    def __init__(self, pos, limits, speed=None, accel=None):
+        self.pos = float(pos)
+        self.vel = 0.0
+        self.limits = limits
+        self.speed = float(speed or servo_max_speed)
+        self.accel = float(accel or servo_max_accel)
+
+    def step(self, target, dt):
+        """Advance ``dt`` seconds towards ``target``; returns the new position."""
+        target = max(self.limits[0], min(self.limits[1], target))
+        d = target - self.pos
+        a_dt = self.accel * dt
+        # fastest speed from which braking a_dt per tick still stops on the target
+        stop = math.sqrt(a_dt * a_dt / 4.0 + 2.0 * self.accel * abs(d)) - a_dt / 2.0
+        self.vel += max(-a_dt, min(a_dt, math.copysign(min(self.speed, stop), d) - self.vel))
+        move = self.vel * dt
+        if move * d >= 0.0 and abs(move) >= abs(d):
+            self.pos, self.vel = target, d / dt
+        else:
+            self.pos += move
+        return self.pos
+
+
+class ServoLoop:
+    """Fixed-rate control thread that owns every write to a servo_controller.
+
+    Ticks are scheduled on a monotonic-clock grid. Each tick calls
+    ``command(t)`` with the unix time of the tick; it returns ``(az, el)``
+    servo angles (either may be None to leave that axis alone) or None to
+    hold the last target. Other threads never touch the servos: they call
+    ``move_to`` for manual positioning and read ``az``, ``el`` and ``stats()``.
+
+    Targets are not written directly: each axis follows its target through
+    an ``AxisProfile`` stepped by the loop's own clock, so every slew, glide
+    and manual move shares one speed/acceleration limit and one timing
+    source, and a new target pre-empts the old one on the next tick.
+
+    A tick that runs past the next slot counts as an overrun and the slots
+    it covered are skipped, not queued, so a stall never turns into a burst
+    of stale commands.
+    """
+
+    def __init__(self, servo, command=None, rate=None, speed=None, accel=None):
+        self.servo = servo
+        self.command = command
+        self.rate = max(1.0, float(rate or servo_loop_rate))
+        self.period = 1.0 / self.rate
+        self.az = float(servo.azimuth_angle)
+        self.el = float(servo.elevation_angle)
+        self.axes = (AxisProfile(self.az, az_limits, speed, accel), AxisProfile(self.el, el_limits, speed, accel))
+        self.ticks = 0
+        self.overruns = 0
+        self.missed = 0
+        self.errors = 0
+        self.last_error = None
+        self._target = (None, None)
+        self._late = deque(maxlen=stats_window)
+        self._work = deque(maxlen=stats_window)
+        self._started = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def move_to(self, az=None, el=None):
+        """Hold the servos at (az, el) from the next tick; None leaves that axis's target as it is."""
+        with self._lock:
+            cur_az, cur_el = self._target
+            self._target = (cur_az if az is None else float(az), cur_el if el is None else float(el))
+
+    def target(self):
+        with self._lock:
+            return self._target
+
+    def moving(self):
+        """True while either axis is still slewing towards its target."""
+        return any(axis.vel != 0.0 for axis in self.axes)
+
+    def _write(self, az, el, dt):
+        if az is not None:
+            az = self.axes[0].step(az, dt)
+            if az != self.az and self.servo.set_azimuth(az):
+                self.az = az
+        if el is not None:
+            el = self.axes[1].step(el, dt)
+            if el != self.el and self.servo.set_elevation(el):
+                self.el = el
+
+    def tick(self, t=None, dt=None):
+        """Run one control step on the calling thread, moving the profiles on by ``dt`` (default one period)."""
+        t = time.time() if t is None else t
+        dt = self.period if dt is None else dt
+        commanded = None
+        if self.command is not None:
+            try:
+                commanded = self.command(t)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+        if commanded is not None:
+            self.move_to(*commanded)
+        az, el = self.target()
+        self._write(az, el, dt)
+        self.ticks += 1
+
+    def _loop(self):
+        next_due = time.monotonic()
+        self._started = last = next_due
+        while not self._stop.is_set():
+            start = time.monotonic()
+            # after a stall, resume the profiles from where they were rather than jumping ahead
+            self.tick(dt=min(max(start - last, 0.0), 2 * self.period) or self.period)
+            last = start
+            end = time.monotonic()
+            self._late.append(start - next_due)
+            self._work.append(end - start)
+            next_due += self.period
+            if end > next_due:
+                self.overruns += 1
+                missed = math.floor((end - next_due) / self.period) + 1
+                self.missed += missed
+                next_due += missed * self.period
+            self._stop.wait(max(0.0, next_due - time.monotonic()))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        late = list(self._late)
+        work = list(self._work)
+        elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+        p99 = _percentile(late, 0.99)
+        return {
+            "rate_hz": self.rate,
+            "achieved_hz": self.ticks / elapsed if elapsed > 0 else None,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "missed": self.missed,
+            "errors": self.errors,
+            "jitter_mean_ms": sum(late) / len(late) * 1000 if late else None,
+            "jitter_p99_ms": p99 * 1000 if p99 is not None else None,
+            "jitter_max_ms": max(late) * 1000 if late else None,
+            "work_mean_ms": sum(work) / len(work) * 1000 if work else None,
+            "work_max_ms": max(work) * 1000 if work else None,
+        }
+
+    def stats_text(self):
+        """One-line colour-markup summary of loop timing."""
+        s = self.stats()
+        if s["jitter_p99_ms"] is None:
+            return "[dark_gray]servo loop idle[/dark_gray]"
+        colour = "yellow" if s["overruns"] or s["jitter_p99_ms"] > self.period * 500 else "dark_gray"
+        errors = f", {s['errors']} failed" if s["errors"] else ""
+        return (f"[{colour}]servo {s['achieved_hz']:.0f}/{self.rate:.0f} Hz, jitter p99 {s['jitter_p99_ms']:.1f} ms "
+                f"max {s['jitter_max_ms']:.1f} ms, {s['overruns']} overruns{errors}[/{colour}]")
@@ -0,0 +1,226 @@
+import json, math, os, threading, time
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+import numpy as np
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+signal_store_dir = os.getenv("SATTRACK_SIGNAL_DIR", os.path.join(base_dir, "signal_store"))
+signal_sample_interval = float(os.getenv("SATTRACK_SIGNAL_INTERVAL", "1.0"))
+
+# one row per sample; NaN marks a value that was not known, -1 an unknown lock state.
+# servo_* is where the servos are, target_* the servo angles for the predicted
+# az/el, so their difference is the tracking error at that moment.
+signal_dtype = np.dtype([
+    ("t", "<f8"),
+    ("snr_db", "<f4"),
+    ("ber", "<f4"),
+    ("viterbi", "i1"),
+    ("deframer", "i1"),
+    ("servo_az", "<f4"),
+    ("servo_el", "<f4"),
+    ("target_az", "<f4"),
+    ("target_el", "<f4"),
+    ("predicted_az", "<f4"),
+    ("predicted_el", "<f4"),
+])
+_defaults = {name: (-1 if signal_dtype[name].kind == "i" else math.nan) for name in signal_dtype.names}
+
+
+class PassInfo(NamedTuple):
+    pass_id: str
+    satellite: str
+    norad: Optional[int]
+    start: float
+    end: Optional[float]
+    rows: int
+
+
+def pass_id_for(satellite, norad, start):
+    stamp = datetime.fromtimestamp(start, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    label = str(norad) if norad is not None else "".join(c if c.isalnum() else "_" for c in satellite)
+    return f"{stamp}_{label}"
+
+
+class PassWriter:
+    """Appends sample rows for one pass; rows are buffered and written in blocks."""
+
+    def __init__(self, store, info, flush_rows=16):
+        self.store = store
+        self.info = info
+        self.path = store.data_path(info.pass_id)
+        self.rows = 0
+        self._buffer = []
+        self._flush_rows = flush_rows
+        self._lock = threading.Lock()
+
+    def append(self, t, **values):
+        """One sample at unix time ``t``; columns not given are stored as unknown."""
+        row = dict(_defaults)
+        row.update(values)
+        row["t"] = t
+        with self._lock:
+            self._buffer.append(tuple(row[name] for name in signal_dtype.names))
+            if len(self._buffer) >= self._flush_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        block = np.array(self._buffer, dtype=signal_dtype)
+        with open(self.path, "ab") as f:
+            f.write(block.tobytes())
+        self.rows += len(block)
+        self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self, end=None):
+        with self._lock:
+            self._flush()
+        self.info = self.info._replace(end=time.time() if end is None else end, rows=self.rows)
+        self.store._record(self.info)
+
+
+class SignalStore:
+    """Append-only per-pass signal quality time series.
+
+    Each pass is one flat file of ``signal_dtype`` records next to a small
+    JSON index of pass metadata. Reads memory-map the file, so a range
+    query is a binary search on the time column plus a slice of the map;
+    nothing is parsed and a pass still being written can be read as it
+    grows (a torn trailing record is ignored).
+    """
+
+    def __init__(self, root=None):
+        self.root = root or signal_store_dir
+        self.index_path = os.path.join(self.root, "index.json")
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                raw = json.load(f)
+            return {pid: PassInfo(**fields) for pid, fields in raw.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _record(self, info):
+        with self._lock:
+            self._index[info.pass_id] = info
+            os.makedirs(self.root, exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({pid: p._asdict() for pid, p in self._index.items()}, f)
+            os.replace(tmp, self.index_path)
+
+    def data_path(self, pass_id):
+        return os.path.join(self.root, f"{pass_id}.sig")
+
+    def open_pass(self, satellite, norad=None, start=None):
+        """A PassWriter for a new pass; the pass is indexed immediately so it can be read live."""
+        start = time.time() if start is None else start
+        pass_id = pass_id_for(satellite, norad, start)
+        os.makedirs(self.root, exist_ok=True)
+        info = PassInfo(pass_id, satellite, None if norad is None else int(norad), start, None, 0)
+        self._record(info)
+        return PassWriter(self, info)
+
+    def passes(self, satellite=None, t0=None, t1=None):
+        """PassInfo for passes overlapping [t0, t1] (open-ended where None), oldest first."""
+        with self._lock:
+            infos = list(self._index.values())
+        out = []
+        for p in infos:
+            if satellite is not None and p.satellite != satellite and str(p.norad) != str(satellite):
+                continue
+            end = p.end if p.end is not None else math.inf
+            if (t0 is not None and end < t0) or (t1 is not None and p.start > t1):
+                continue
+            out.append(p)
+        return sorted(out, key=lambda p: p.start)
+
+    def read(self, pass_id, t0=None, t1=None):
+        """Rows of one pass with t0 <= t <= t1, as a read-only memmap slice."""
+        path = self.data_path(pass_id)
+        try:
+            rows = os.path.getsize(path) // signal_dtype.itemsize
+        except OSError:
+            rows = 0
+        if rows == 0:
+            return np.empty(0, dtype=signal_dtype)
+        data = np.memmap(path, dtype=signal_dtype, mode="r", shape=(rows,))
+        t = data["t"]
+        lo = 0 if t0 is None else int(np.searchsorted(t, t0, side="left"))
+        hi = rows if t1 is None else int(np.searchsorted(t, t1, side="right"))
+        return data[lo:hi]
+
+    def query(self, t0=None, t1=None, satellite=None):
+        """{pass_id: rows in [t0, t1]} for every matching pass."""
+        return {p.pass_id: self.read(p.pass_id, t0, t1) for p in self.passes(satellite, t0, t1)}
+
+    def summary(self, pass_id):
+        """Headline numbers for comparing passes: SNR, lock fraction and pointing error."""
+        rows = self.read(pass_id)
+        if not len(rows):
+            return {"samples": 0}
+        snr = rows["snr_db"][~np.isnan(rows["snr_db"])]
+        known = rows["deframer"] >= 0
+        az_err = np.abs((rows["servo_az"] - rows["target_az"] + 180.0) % 360.0 - 180.0)
+        el_err = np.abs(rows["servo_el"] - rows["target_el"])
+        err = np.hypot(az_err, el_err)
+        err = err[~np.isnan(err)]
+        return {
+            "samples": len(rows),
+            "duration_s": float(rows["t"][-1] - rows["t"][0]),
+            "snr_mean_db": float(snr.mean()) if len(snr) else None,
+            "snr_max_db": float(snr.max()) if len(snr) else None,
+            "deframer_lock_fraction": float((rows["deframer"][known] == 1).mean()) if known.any() else None,
+            "pointing_error_mean_deg": float(err.mean()) if len(err) else None,
+            "pointing_error_max_deg": float(err.max()) if len(err) else None,
+        }
+
+
+class SignalRecorder:
+    """Samples ``sample(t)`` every ``interval`` seconds into a PassWriter on a daemon thread.
+
+    ``sample`` returns a dict of column values (or None to skip the slot).
+    The pass is closed when ``alive()`` turns false or ``stop()`` is called.
+    """
+
+    def __init__(self, writer, sample, interval=None, alive=None):
+        self.writer = writer
+        self.sample = sample
+        self.interval = signal_sample_interval if interval is None else float(interval)
+        self.alive = alive or (lambda: True)
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _loop(self):
+        next_due = time.monotonic()
+        try:
+            while not self._stop.is_set() and self.alive():
+                t = time.time()
+                try:
+                    values = self.sample(t)
+                    if values is not None:
+                        self.writer.append(t, **values)
+                except Exception:
+                    self.errors += 1
+                next_due += self.interval
+                if next_due < time.monotonic():
+                    next_due = time.monotonic() + self.interval
+                self._stop.wait(max(0.0, next_due - time.monotonic()))
+        finally:
+            self.writer.close()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
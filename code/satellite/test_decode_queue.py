@@ -0,0 +1,60 @@
+"""DecodeQueue's cross-process pause and owner checks.
+
+Run with ``python3 -m pytest code/satellite``.
+"""
+import json, os, subprocess, sys, time
+
+import decode_queue
+from decode_queue import DecodeJob, DecodeQueue, RecordingMarker
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_pauses_while_another_process_records(tmp_path):
+    jobs_file = str(tmp_path / "decode_jobs.json")
+    holder = subprocess.Popen(
+        [sys.executable, "-c", f"import sys, time; sys.path.insert(0, {here!r}); import decode_queue; "
+                               f"decode_queue.RecordingMarker({jobs_file!r}).hold(); print(flush=True); time.sleep(60)"],
+        stdout=subprocess.PIPE)
+    queue = DecodeQueue(jobs_file=jobs_file, workers=1)
+    try:
+        holder.stdout.readline()
+        queue.start()
+        assert _wait_for(lambda: queue.stats()["paused"])
+        # a holder that dies without releasing stops counting
+        holder.kill()
+        holder.wait()
+        assert _wait_for(lambda: not queue.stats()["paused"])
+    finally:
+        queue.stop()
+        holder.kill()
+        holder.stdout.close()
+
+
+def test_release_clears_the_marker(tmp_path):
+    marker = RecordingMarker(str(tmp_path / "decode_jobs.json"))
+    marker.hold()
+    assert marker.active()
+    marker.release()
+    assert not marker.active()
+
+
+def test_job_of_reused_pid_is_requeued(tmp_path):
+    jobs_file = tmp_path / "decode_jobs.json"
+    start = decode_queue._process_start(os.getpid())
+    jobs = [DecodeJob("mine", "a.iq", "noaa", str(tmp_path), 1.0, state="running",
+                      owner=os.getpid(), owner_start=start, updated=1.0),
+            DecodeJob("reused", "b.iq", "noaa", str(tmp_path), 1.0, state="running",
+                      owner=os.getpid(), owner_start=(start or 0) + 1, updated=1.0)]
+    jobs_file.write_text(json.dumps([j._asdict() for j in jobs]))
+    queue = DecodeQueue(jobs_file=str(jobs_file), workers=1)
+    assert queue.jobs["mine"].state == "running"
+    if start is not None:
+        assert queue.jobs["reused"].state == "queued"
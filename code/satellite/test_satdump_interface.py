@@ -0,0 +1,122 @@
+"""ReceiverSupervisor and TimerWheel driving a stub satdump.
+
+Run with ``python3 -m pytest code/satellite``. ``SATTRACK_SATDUMP_BIN`` points
+at a small script that takes satdump's ``recv`` arguments, writes to its
+``--output`` file and prints progress lines, then exits or sleeps depending on
+the pipeline name.
+"""
+import importlib, signal, sys, time
+
+import pytest
+
+import decode_queue
+import satdump_interface
+
+STUB = r'''#!{python}
+import sys, time
+args = sys.argv[1:]
+pipeline, output = args[1], args[args.index("--output") + 1]
+device = args[args.index("--device") + 1]
+with open(output, "wb") as f:
+    f.write(device.encode() * 4096)
+if pipeline == "flood":
+    # far more than a pipe buffer on both streams before anything else
+    for i in range(20000):
+        sys.stdout.write(f"(D) filler line {{i}} on stdout\n")
+        sys.stderr.write(f"(D) filler line {{i}} on stderr\n")
+    sys.stdout.write("(I) Done\n")
+    sys.exit(0)
+sys.stdout.write("[12:00:00 - 01/01/2024] (I) SNR : 7.5dB, Peak SNR: 9.0dB\r")
+sys.stdout.write("(I) Viterbi : SYNCED BER : 0.012, Deframer : SYNCED\n")
+sys.stdout.flush()
+while True:
+    with open(output, "ab") as f:
+        f.write(b"\0" * 65536)
+    time.sleep(0.05)
+'''
+
+
+@pytest.fixture
+def stub_satdump(tmp_path, monkeypatch):
+    stub = tmp_path / "satdump"
+    stub.write_text(STUB.format(python=sys.executable))
+    stub.chmod(0o755)
+    monkeypatch.setenv("SATTRACK_SATDUMP_BIN", str(stub))
+    module = importlib.reload(satdump_interface)
+    monkeypatch.setattr(module, "progress_interval_sec", 0.1)
+    monkeypatch.setattr(decode_queue, "decode_jobs_file", str(tmp_path / "decode_jobs.json"))
+    yield module
+    monkeypatch.undo()
+    importlib.reload(satdump_interface)
+
+
+@pytest.fixture
+def receiver(stub_satdump, tmp_path):
+    rx = stub_satdump.satdump_receiver()
+    rx.output_dir = str(tmp_path)
+    yield rx
+    rx.stop_recording(wait=True)
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_output_is_drained(stub_satdump, tmp_path):
+    supervisor = stub_satdump.ReceiverSupervisor()
+    rec = stub_satdump.Recording("flood", "0", str(tmp_path / "flood.iq"),
+                                 [stub_satdump.satdump_bin, "recv", "flood", "--device", "0",
+                                  "--output", str(tmp_path / "flood.iq")], 30.0)
+    supervisor.launch(rec)
+    # the stub blocks on a full pipe unless both streams are read as it writes
+    assert _wait_for(lambda: not rec.running)
+    assert rec.returncode == 0
+    assert rec.log.lines.tail(1) == ["(I) Done"]
+    assert rec.log.lines.since(0, 1)[1] == 40001
+
+
+def test_stopped_at_deadline(receiver):
+    receiver.start_recording("noaa", 137_100_000, 0.5, rtl_device="0")
+    rec = receiver.recordings["0"]
+    assert _wait_for(lambda: not rec.running, timeout=5.0)
+    assert rec.returncode == -signal.SIGTERM
+    tick = receiver.supervisor.wheel.tick
+    assert 0.5 <= rec.finished - rec.started < 0.5 + 2 * tick + 0.5
+
+
+def test_progress_is_reported(receiver):
+    receiver.start_recording("noaa", 137_100_000, 30.0, rtl_device="0")
+    rec = receiver.recordings["0"]
+    assert _wait_for(lambda: rec.log.signal()["viterbi"] == 1)
+    assert rec.log.signal() == {"snr_db": 7.5, "ber": 0.012, "viterbi": 1, "deframer": 1}
+    assert _wait_for(lambda: receiver.progress()[0]["bytes_written"] > 65536)
+    progress = receiver.progress()[0]
+    assert progress["running"] and progress["device"] == "0"
+    assert 0 < progress["remaining_sec"] < 30.0
+    assert _wait_for(lambda: receiver.progress()[0]["rate_bps"] > 0)
+
+
+def test_two_devices_record_independently(receiver):
+    receiver.start_recording("noaa", 137_100_000, 30.0, rtl_device="0")
+    receiver.start_recording("meteor", 137_900_000, 30.0, rtl_device="1")
+    first, second = receiver.recordings["0"], receiver.recordings["1"]
+    assert first.outfile != second.outfile
+    with pytest.raises(RuntimeError):
+        receiver.start_recording("noaa", 137_100_000, 30.0, rtl_device="0")
+    assert _wait_for(lambda: first.bytes_written > 0 and second.bytes_written > 0)
+
+    assert receiver.stop_recording("0", wait=True)
+    assert not first.running and second.running
+    size = second.bytes_written
+    assert _wait_for(lambda: second.bytes_written > size)
+    with open(second.outfile, "rb") as f:
+        assert f.read(4096) == b"1" * 4096
+    assert receiver.is_recording
+    assert decode_queue.RecordingMarker().active()
+
+    receiver.stop_recording("1", wait=True)
+    assert not receiver.is_recording
+    assert not decode_queue.RecordingMarker().active()
@@ -0,0 +1,73 @@
+"""trajectory.servo_coords (NumPy, whole arrays) against the scalar satellite_to_servo_coords.
+
+Run with ``python3 -m pytest code/satellite``. The corpora are seeded random
+samples over every az/el plus a grid of the conversion's edge cases.
+"""
+import numpy as np
+import pytest
+
+from sattrack import satellite_to_servo_coords
+from trajectory import az_limits, el_limits, servo_coords
+
+# NumPy's vectorised arctan2/arccos may differ from libm in the last bit
+angle_tolerance = 1e-9
+
+
+def edge_cases():
+    """az on the 45 deg grid, at and just inside/outside the +-135 limits and within 1e-7 deg of
+    east/west (where the north component drops under its 1e-9 cut-off); el at horizon, zenith,
+    nadir, the 75 deg signed-elevation clamp and both signs of zero."""
+    rng = np.random.default_rng(0)
+    az = np.concatenate([np.arange(-720.0, 721.0, 45.0), [-135.0, 135.0, -225.0, 225.0, 495.0, -0.0],
+                         np.nextafter(135.0, [0.0, 200.0]), np.nextafter(-135.0, [0.0, -200.0]),
+                         90.0 + rng.uniform(-1e-7, 1e-7, 16), -90.0 + rng.uniform(-1e-7, 1e-7, 16)])
+    el = np.array([-90.0, -75.0, -15.0, -0.0, 0.0, 1e-12, 15.0, 75.0, 89.9999999, 90.0,
+                   np.nextafter(90.0, 0.0), np.nextafter(15.0, 0.0)])
+    grid_az, grid_el = np.meshgrid(az, el)
+    return grid_az.ravel(), grid_el.ravel()
+
+
+def random_cases(seed, n=20000):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-720.0, 720.0, n), rng.uniform(-90.0, 90.0, n)
+
+
+def _scalar(az, el):
+    rows = [satellite_to_servo_coords(a, e) for a, e in zip(az.tolist(), el.tolist())]
+    servo_az, servo_el, flipped = (np.array(c) for c in zip(*rows))
+    return servo_az, servo_el, flipped.astype(bool)
+
+
+@pytest.mark.parametrize("corpus", ["edges"] + [f"seed{s}" for s in range(8)])
+def test_array_matches_scalar(corpus):
+    az, el = edge_cases() if corpus == "edges" else random_cases(int(corpus[4:]))
+    v_az, v_el, v_flip = servo_coords(az, el)
+    s_az, s_el, s_flip = _scalar(az, el)
+    np.testing.assert_array_equal(v_flip, s_flip)
+    np.testing.assert_allclose(v_az, s_az, rtol=0, atol=angle_tolerance)
+    np.testing.assert_allclose(v_el, s_el, rtol=0, atol=angle_tolerance)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_results_within_servo_limits(seed):
+    az, el = random_cases(seed)
+    servo_az, servo_el, _ = servo_coords(np.concatenate([az, edge_cases()[0]]), np.concatenate([el, edge_cases()[1]]))
+    assert np.all((az_limits[0] <= servo_az) & (servo_az <= az_limits[1]))
+    assert np.all((el_limits[0] <= servo_el) & (servo_el <= el_limits[1]))
+
+
+def test_independent_of_batch():
+    az, el = random_cases(1, 500)
+    whole = servo_coords(az, el)
+    for k in range(0, len(az), 37):
+        one = servo_coords(az[k:k + 1], el[k:k + 1])
+        for column, value in zip(whole, one):
+            assert column[k].tobytes() == value[0].tobytes()
+
+
+def test_limit_seam_is_direct():
+    # a satellite at az 225 lands on -135 deg direct, exactly on the limit; the
+    # last-bit difference between libm and NumPy must not flip one of them over
+    for el in (0.0, 15.0, 45.0):
+        assert satellite_to_servo_coords(225.0, el)[2] is False
+        assert not servo_coords([225.0], [el])[2][0]
@@ -0,0 +1,126 @@
+"""TleRefresher against a local http.server standing in for Celestrak.
+
+Run with ``python3 -m pytest code/satellite``.
+"""
+import os, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import tle_refresh
+from tle_refresh import TleRefresher
+
+ISS = ["ISS (ZARYA)",
+       "1 25544U 98067A   24001.50000000  .00016717  00000-0  10270-3 0  9005",
+       "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50377579432523"]
+NOAA = ["NOAA 19",
+        "1 33591U 09005A   24001.50000000  .00000045  00000-0  49000-4 0  9996",
+        "2 33591  99.1890  60.1234 0013421 300.1234  59.8765 14.12501234770000"]
+METEOR = ["METEOR-M2 3",
+          "1 57166U 23091A   24001.50000000  .00000010  00000-0  20000-4 0  9991",
+          "2 57166  98.7000  80.0000 0003000  90.0000 270.0000 14.23900000 26000"]
+
+
+class Celestrak(BaseHTTPRequestHandler):
+    """Serves ``bodies[group]`` with an ETag; 304 when the request's If-None-Match matches, 500 for unknown groups."""
+
+    bodies = {}
+    requests = []
+
+    def do_GET(self):
+        group = parse_qs(urlparse(self.path).query).get("GROUP", [""])[0]
+        self.requests.append((group, dict(self.headers)))
+        body = self.bodies.get(group)
+        if body is None:
+            self.send_response(500)
+            self.end_headers()
+            return
+        etag = f'"{group}-{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2024 12:00:00 GMT")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def celestrak():
+    Celestrak.bodies = {}
+    Celestrak.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Celestrak)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/gp.php"
+    server.shutdown()
+    server.server_close()
+
+
+def _refresher(tmp_path, url, groups):
+    return TleRefresher(str(tmp_path / "satellites.txt"), groups=groups, base_url=url,
+                        cache_dir=str(tmp_path / "tle_cache"))
+
+
+def _norads(path):
+    with open(path, encoding="utf-8") as f:
+        return {line[2:7].strip() for line in f.read().splitlines() if line.startswith("1 ")}
+
+
+def test_etag_then_not_modified(tmp_path, celestrak, monkeypatch):
+    Celestrak.bodies = {"weather": "\n".join(ISS + NOAA)}
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(tle_refresh.os, "replace", lambda src, dst: (replaced.append((src, dst)), real_replace(src, dst))[1])
+    refresher = _refresher(tmp_path, celestrak, ["weather"])
+
+    changed, _ = refresher.refresh()
+    assert changed
+    tle_path = str(tmp_path / "satellites.txt")
+    assert _norads(tle_path) == {"25544", "33591"}
+    # every file is written to a temporary name and moved into place
+    assert (tle_path + ".tmp", tle_path) in replaced
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+    assert "If-None-Match" not in Celestrak.requests[0][1]
+
+    changed, messages = refresher.refresh()
+    assert not changed
+    assert "already current" in messages[-1]
+    headers = Celestrak.requests[1][1]
+    assert headers["If-None-Match"] == f'"weather-{len(Celestrak.bodies["weather"])}"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 12:00:00 GMT"
+
+
+def test_group_without_copy_keeps_its_satellites(tmp_path, celestrak):
+    (tmp_path / "satellites.txt").write_text("\n".join(ISS + METEOR), encoding="utf-8")
+    Celestrak.bodies = {"weather": "\n".join(NOAA)}
+    refresher = _refresher(tmp_path, celestrak, ["weather", "noaa"])
+
+    changed, messages = refresher.refresh()
+    assert changed
+    assert any("'noaa' not refreshed" in m for m in messages)
+    assert _norads(tmp_path / "satellites.txt") == {"25544", "33591", "57166"}
+
+
+def test_write_error_is_reported_and_retried(tmp_path, celestrak):
+    Celestrak.bodies = {"weather": "\n".join(ISS)}
+    refresher = _refresher(tmp_path, celestrak, ["weather"])
+    tle_path = tmp_path / "satellites.txt"
+    tle_path.mkdir()  # replacing a directory with a file fails with an OSError
+
+    changed, messages = refresher.refresh()
+    assert not changed
+    assert any("TLE file not updated" in m for m in messages)
+
+    tle_path.rmdir()
+    changed, _ = refresher.refresh()  # the group is now a 304, but the file still gets written
+    assert changed
+    assert _norads(tle_path) == {"25544"}
@@ -0,0 +1,273 @@
+import hashlib, os, pickle, re, threading
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+import numpy as np
+from sgp4.api import Satrec, WGS72
+from skyfield.api import EarthSatellite, load
+
+_token_re = re.compile(r"[A-Z0-9]+")
+_catalog_cache = {}
+_catalog_lock = threading.Lock()
+snapshot_version = 1
+sgp4_epoch0_jd = 2433281.5
+j2000_utc = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+element_fields = [("satnum", "i8"), ("epoch", "f8"), ("bstar", "f8"), ("ndot", "f8"), ("nddot", "f8"),
+                  ("ecco", "f8"), ("argpo", "f8"), ("inclo", "f8"), ("mo", "f8"), ("no_kozai", "f8"),
+                  ("nodeo", "f8")]
+
+
+class TleEntry(NamedTuple):
+    name: str
+    line1: str
+    line2: str
+    norad: int
+    intl_designator: str
+
+
+def tle_checksum(line):
+    """Modulo-10 checksum over the first 68 columns: digits count as themselves, '-' as 1."""
+    total = 0
+    for ch in line[:68]:
+        if ch.isdigit():
+            total += int(ch)
+        elif ch == "-":
+            total += 1
+    return total % 10
+
+
+def _valid_line(line, number):
+    return (len(line) >= 69 and line[0] == str(number) and line[1] == " "
+            and line[68].isdigit() and tle_checksum(line) == int(line[68]))
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def satrec_elements(satrecs):
+    """SGP4 initialisation arguments of each Satrec, as an ``element_fields`` structured array."""
+    elements = np.zeros(len(satrecs), dtype=element_fields)
+    for i, r in enumerate(satrecs):
+        elements[i] = (r.satnum, r.jdsatepoch - sgp4_epoch0_jd + r.jdsatepochF, r.bstar, r.ndot, r.nddot,
+                       r.ecco, r.argpo, r.inclo, r.mo, r.no_kozai, r.nodeo)
+    return elements
+
+
+class TleCatalog:
+    """Parsed and validated TLE file with lookups by NORAD ID, designator and name.
+
+    Entries must be three lines (name, line 1, line 2) with valid checksums
+    and matching catalog numbers on both element lines; anything else is
+    skipped and counted in ``errors``. Name substring searches go through a
+    trigram index so resolving a name does not scan the whole catalog.
+    """
+
+    def __init__(self, entries, errors=0):
+        self.entries = list(entries)
+        self.errors = errors
+        self.by_norad = {}
+        self.by_intl = {}
+        self.by_name = {}
+        self.by_token = {}
+        self._trigram_index = {}
+        self._upper = []
+        self._satellites = {}
+        self.elements = None
+        for i, e in enumerate(self.entries):
+            upper = e.name.upper()
+            self._upper.append(upper)
+            self.by_norad.setdefault(e.norad, i)
+            if e.intl_designator:
+                self.by_intl.setdefault(e.intl_designator, i)
+            self.by_name.setdefault(upper, i)
+            for token in _token_re.findall(upper):
+                self.by_token.setdefault(token, []).append(i)
+            for gram in _trigrams(upper):
+                self._trigram_index.setdefault(gram, set()).add(i)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_satellites"] = {}
+        return state
+
+    def compute_elements(self):
+        """Fill ``elements`` with the SGP4 initialisation arguments of every entry."""
+        self.elements = satrec_elements([Satrec.twoline2rv(e.line1, e.line2) for e in self.entries])
+
+    @classmethod
+    def from_lines(cls, lines):
+        lines = [l.rstrip() for l in lines if l.strip()]
+        entries, errors = [], 0
+        i = 0
+        while i < len(lines):
+            if i + 2 < len(lines) and _valid_line(lines[i + 1], 1) and _valid_line(lines[i + 2], 2):
+                name, l1, l2 = lines[i].strip(), lines[i + 1], lines[i + 2]
+                if name.startswith("0 "):
+                    name = name[2:].strip()
+                norad = l1[2:7].strip()
+                if norad == l2[2:7].strip() and norad.isdigit():
+                    entries.append(TleEntry(name, l1, l2, int(norad), l1[9:17].strip()))
+                else:
+                    errors += 1
+                i += 3
+            else:
+                errors += 1
+                i += 1
+                # resynchronise on the next line that could start an entry
+                while i < len(lines) and lines[i][:2] in ("1 ", "2 "):
+                    i += 1
+        return cls(entries, errors)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8-sig") as f:
+            return cls.from_lines(f.read().splitlines())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Exact lookup by NORAD ID, international designator or full name; None if absent."""
+        key = str(key).strip().upper()
+        if key.isdigit() and int(key) in self.by_norad:
+            return self.entries[self.by_norad[int(key)]]
+        if key in self.by_intl:
+            return self.entries[self.by_intl[key]]
+        if key in self.by_name:
+            return self.entries[self.by_name[key]]
+        return None
+
+    def search(self, query):
+        """Entries whose name contains ``query`` (case-insensitive), in file order."""
+        q = query.strip().upper()
+        if not q:
+            return []
+        if len(q) < 3:
+            candidates = range(len(self.entries))
+        else:
+            grams = sorted(_trigrams(q), key=lambda g: len(self._trigram_index.get(g, ())))
+            candidates = set(self._trigram_index.get(grams[0], ()))
+            for g in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= self._trigram_index.get(g, set())
+            candidates = sorted(candidates)
+        return [self.entries[i] for i in candidates if q in self._upper[i]]
+
+    def resolve(self, query):
+        """Exact NORAD ID / designator / name match if there is one, else a name search."""
+        exact = self.get(query)
+        if exact is not None:
+            return [exact]
+        return self.search(query)
+
+    def satellite(self, entry):
+        """EarthSatellite for an entry, built once and reused."""
+        sat = self._satellites.get(entry.norad)
+        if sat is None or sat.name != entry.name:
+            i = self.by_norad.get(entry.norad)
+            if self.elements is not None and i is not None and self.entries[i] == entry:
+                sat = SnapshotSatellite(self.elements[i], entry.name)
+            else:
+                sat = EarthSatellite(entry.line1, entry.line2, entry.name)
+            self._satellites[entry.norad] = sat
+        return sat
+
+    def satellites(self):
+        sats = []
+        for e in self.entries:
+            try:
+                sats.append(self.satellite(e))
+            except Exception:
+                pass
+        return sats
+
+
+class SnapshotSatellite(EarthSatellite):
+    """EarthSatellite initialised from stored SGP4 elements instead of TLE text.
+
+    Building the skyfield epoch Time is the slowest part of constructing a
+    satellite, so it is deferred until something actually reads ``epoch``.
+    """
+
+    def __init__(self, element, name):
+        satrec = Satrec()
+        satrec.sgp4init(WGS72, "i", int(element["satnum"]), float(element["epoch"]), float(element["bstar"]),
+                        float(element["ndot"]), float(element["nddot"]), float(element["ecco"]),
+                        float(element["argpo"]), float(element["inclo"]), float(element["mo"]),
+                        float(element["no_kozai"]), float(element["nodeo"]))
+        self.model = satrec
+        self.name = name
+        self._epoch = None
+        self._setup(satrec)
+
+    @property
+    def epoch(self):
+        if self._epoch is None:
+            ts = EarthSatellite.ts or load.timescale()
+            days = (self.model.jdsatepoch - 2451545.0) + self.model.jdsatepochF
+            self._epoch = ts.from_datetime(j2000_utc + timedelta(days=days))
+        return self._epoch
+
+
+def snapshot_path(path):
+    return os.path.splitext(path)[0] + ".snapshot"
+
+
+def _source_key(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(data), hashlib.sha1(data).hexdigest()
+
+
+def write_snapshot(path, catalog=None):
+    """Write the binary snapshot for TLE file ``path``; returns the catalog it holds."""
+    if catalog is None:
+        catalog = TleCatalog.from_file(path)
+    if catalog.elements is None:
+        catalog.compute_elements()
+    out = snapshot_path(path)
+    tmp = out + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": snapshot_version, "source": _source_key(path), "catalog": catalog},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, out)
+    except OSError:
+        pass
+    return catalog
+
+
+def read_snapshot(path):
+    """Catalog from the snapshot of ``path``, or None if it is missing, stale or corrupt."""
+    try:
+        with open(snapshot_path(path), "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != snapshot_version or data.get("source") != _source_key(path):
+            return None
+        catalog = data["catalog"]
+        if not isinstance(catalog, TleCatalog) or catalog.elements is None or len(catalog.elements) != len(catalog):
+            return None
+        return catalog
+    except Exception:
+        return None
+
+
+def load_catalog(path):
+    """Indexed catalog for ``path``, parsed once per modification.
+
+    The binary snapshot is preferred; if it is missing, stale or corrupt the
+    text file is parsed and the snapshot rewritten for the next start.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _catalog_lock:
+        cached = _catalog_cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+    catalog = read_snapshot(path)
+    if catalog is None:
+        catalog = write_snapshot(path)
+    with _catalog_lock:
+        _catalog_cache[path] = (key, catalog)
+    return catalog
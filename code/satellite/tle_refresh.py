@@ -0,0 +1,197 @@
+import json, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from tle_catalog import write_snapshot
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+tle_base_url = os.getenv("SATTRACK_TLE_URL", "https://celestrak.org/NORAD/elements/gp.php")
+tle_groups = [g.strip() for g in os.getenv("SATTRACK_TLE_GROUPS", "weather").split(",") if g.strip()]
+tle_refresh_interval = float(os.getenv("SATTRACK_TLE_REFRESH_H", "6")) * 3600
+tle_cache_dir = os.path.join(base_dir, "tle_cache")
+tle_timeout = (3.05, 10)
+
+
+def clean_tle_lines(text):
+    """Name/line 1/line 2 triples from a Celestrak response, dropping anything that does not fit."""
+    lines = text.encode("utf-8").decode("utf-8-sig").splitlines()
+    cleaned = []
+    i = 0
+    while i < len(lines) - 2:
+        if lines[i + 1].startswith("1 ") and lines[i + 2].startswith("2 "):
+            cleaned.extend([lines[i].strip(), lines[i + 1].strip(), lines[i + 2].strip()])
+            i += 3
+        else:
+            i += 1
+    return cleaned
+
+
+def _write_atomic(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class TleRefresher:
+    """Keeps the local TLE file current without ever making the tracker wait on the network.
+
+    Each Celestrak group is fetched concurrently with its stored ETag and
+    Last-Modified validators, so an unchanged group costs one 304 response.
+    Group bodies are kept in ``tle_cache`` and merged (first occurrence of a
+    catalog number wins) into the TLE file, which is replaced atomically and
+    re-snapshotted only when a group actually changed. A group with neither
+    a fresh nor a cached copy keeps its satellites from the existing file.
+    The existing file is always served as-is in the meantime, and a failed
+    write is reported and retried on the next refresh rather than ending
+    the refresh thread.
+    """
+
+    def __init__(self, tle_path, groups=None, base_url=None, cache_dir=None, interval=None):
+        self.tle_path = tle_path
+        self.groups = list(groups or tle_groups)
+        self.base_url = base_url or tle_base_url
+        self.cache_dir = cache_dir or tle_cache_dir
+        self.interval = tle_refresh_interval if interval is None else float(interval)
+        self.meta_path = os.path.join(self.cache_dir, "meta.json")
+        self.meta = self._load_meta()
+        self.last_messages = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _group_path(self, group):
+        return os.path.join(self.cache_dir, f"{group}.txt")
+
+    def due(self, now=None):
+        """True if the TLE file is missing or any group is older than the refresh interval."""
+        now = time.time() if now is None else now
+        if not os.path.exists(self.tle_path):
+            return True
+        return any(now - self.meta.get(g, {}).get("checked", 0) >= self.interval for g in self.groups)
+
+    def _fetch_group(self, group):
+        headers = {}
+        info = self.meta.get(group, {})
+        if os.path.exists(self._group_path(group)):
+            if info.get("etag"):
+                headers["If-None-Match"] = info["etag"]
+            if info.get("last_modified"):
+                headers["If-Modified-Since"] = info["last_modified"]
+        try:
+            r = requests.get(self.base_url, params={"GROUP": group}, headers=headers,
+                             timeout=tle_timeout, verify=False)
+            if r.status_code == 304:
+                return group, "not_modified", None, r.headers
+            r.raise_for_status()
+            cleaned = clean_tle_lines(r.text)
+            if not cleaned:
+                return group, "error", "no TLE entries in response", r.headers
+            return group, "modified", cleaned, r.headers
+        except requests.RequestException as e:
+            return group, "error", type(e).__name__, {}
+
+    def _merge(self):
+        lines, seen, missing = [], set(), False
+
+        def add(group_lines):
+            for i in range(0, len(group_lines) - 2, 3):
+                norad = group_lines[i + 1][2:7].strip()
+                if norad not in seen:
+                    seen.add(norad)
+                    lines.extend(group_lines[i:i + 3])
+
+        for group in self.groups:
+            try:
+                with open(self._group_path(group), encoding="utf-8") as f:
+                    add(f.read().splitlines())
+            except OSError:
+                missing = True
+        if missing:
+            # a group we hold no copy of: carry its satellites over from the current file
+            try:
+                with open(self.tle_path, encoding="utf-8") as f:
+                    add(clean_tle_lines(f.read()))
+            except OSError:
+                pass
+        return lines
+
+    def refresh(self):
+        """Fetch every group once; returns (changed, messages) with colour-markup messages."""
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=max(1, len(self.groups))) as pool:
+                results = list(pool.map(self._fetch_group, self.groups))
+
+            now = time.time()
+            changed, messages = False, []
+            for group, status, payload, headers in results:
+                if status == "error":
+                    messages.append(f"[yellow]TLE group '{group}' not refreshed: {payload}[/yellow]")
+                    continue
+                if status == "modified":
+                    try:
+                        _write_atomic(self._group_path(group), "\n".join(payload))
+                    except OSError as e:
+                        messages.append(f"[yellow]TLE group '{group}' not saved: {e}[/yellow]")
+                        continue
+                    info = self.meta.setdefault(group, {})
+                    info["etag"] = headers.get("ETag")
+                    info["last_modified"] = headers.get("Last-Modified")
+                    changed = True
+                self.meta.setdefault(group, {})["checked"] = now
+
+            pending = self.meta.pop("_merge_pending", False)
+            if changed or pending or (not os.path.exists(self.tle_path) and any(r[1] != "error" for r in results)):
+                merged = self._merge()
+                changed = False
+                if merged:
+                    try:
+                        _write_atomic(self.tle_path, "\n".join(merged))
+                        write_snapshot(self.tle_path)
+                        changed = True
+                        messages.append(f"[green]TLE data updated ({len(merged) // 3} satellites)[/green]")
+                    except OSError as e:
+                        # the groups are cached now, so later 304s would never rebuild the file without this
+                        self.meta["_merge_pending"] = True
+                        messages.append(f"[yellow]TLE file not updated: {e}[/yellow]")
+            elif any(r[1] == "not_modified" for r in results):
+                messages.append("[green]TLE data already current[/green]")
+
+            try:
+                _write_atomic(self.meta_path, json.dumps(self.meta))
+            except OSError:
+                pass
+            self.last_messages = messages
+            return changed, messages
+
+    def start(self, on_update=None, force=False):
+        """Refresh in a daemon thread now if due (or forced) and then every ``interval`` seconds.
+
+        ``on_update(messages)`` is called from that thread whenever the TLE file changed.
+        """
+        if self._thread is not None:
+            return
+
+        def run():
+            first = True
+            while not self._stop.is_set():
+                if (first and force) or self.due():
+                    changed, messages = self.refresh()
+                    if changed and on_update is not None:
+                        on_update(messages)
+                first = False
+                self._stop.wait(min(self.interval, 600.0))
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
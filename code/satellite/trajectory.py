@@ -0,0 +1,220 @@
+import bisect, os
+import numpy as np
+
+trajectory_step = float(os.getenv("SATTRACK_TRAJECTORY_STEP", "1"))
+trajectory_lead = float(os.getenv("SATTRACK_TRAJECTORY_LEAD_S", "30"))
+az_limits = (-135.0, 135.0)
+el_limits = (-90.0, 90.0)
+signed_el_limit = 75.0
+# NumPy's vectorised arctan2 may differ from libm in the last bit, which decides the
+# configuration of samples landing exactly on a +-135 deg limit; count anything this
+# close outside a limit as reachable, so both sides pick the same one
+limit_tolerance = 1e-9
+
+
+def _normalize_deg(a):
+    return ((a + 180.0) % 360.0) - 180.0
+
+
+def _servo_branch(az_rad, alt_rad):
+    east = np.cos(alt_rad) * np.sin(az_rad)
+    north = np.cos(alt_rad) * np.cos(az_rad)
+    up = np.sin(alt_rad)
+    servo_az = _normalize_deg(np.degrees(np.arctan2(east, north)))
+    from_zenith = np.degrees(np.arccos(np.clip(up, -1.0, 1.0)))
+    sign_north = np.where(np.abs(north) > 1e-9, np.copysign(1.0, north), np.copysign(1.0, np.cos(az_rad)))
+    servo_el = np.clip(from_zenith * sign_north, -signed_el_limit, signed_el_limit)
+    return servo_az, servo_el
+
+
+def servo_candidates(sat_az, sat_el):
+    """Direct and 180 deg flipped servo angles for arrays of satellite az/el, before the servo limits.
+
+    The same geometry as ``satellite_to_servo_coords``: (direct_az, direct_el, flip_az, flip_el).
+    """
+    alt_rad = np.radians(np.asarray(sat_el, dtype=float))
+    direct_az, direct_el = _servo_branch(np.radians(np.asarray(sat_az, dtype=float)), alt_rad)
+    flip_az, flip_el = _servo_branch(np.radians(_normalize_deg(direct_az + 180.0)), alt_rad)
+    return direct_az, direct_el, flip_az, flip_el
+
+
+def limit_excess(servo_az, servo_el):
+    """Degrees by which each sample lies outside the servo limits (0 where reachable)."""
+    return (np.abs(servo_az - np.clip(servo_az, *az_limits))
+            + np.abs(servo_el - np.clip(servo_el, *el_limits)))
+
+
+def _within(servo_az, servo_el):
+    tol = limit_tolerance
+    return ((az_limits[0] - tol <= servo_az) & (servo_az <= az_limits[1] + tol)
+            & (el_limits[0] - tol <= servo_el) & (servo_el <= el_limits[1] + tol))
+
+
+def _select(direct_az, direct_el, flip_az, flip_el):
+    flipped = ~_within(direct_az, direct_el) & (limit_excess(flip_az, flip_el) < limit_excess(direct_az, direct_el))
+    servo_az = np.clip(np.where(flipped, flip_az, direct_az), *az_limits)
+    servo_el = np.clip(np.where(flipped, flip_el, direct_el), *el_limits)
+    return servo_az, servo_el, flipped
+
+
+def servo_coords(sat_az, sat_el):
+    """Servo angles for arrays of satellite az/el, choosing per sample: (servo_az, servo_el, flipped).
+
+    Each sample takes the direct solution if it is within the servo limits,
+    else the flipped one if that needs less clamping, clamped. The same rule
+    as the scalar ``satellite_to_servo_coords``: the flags agree and the
+    angles agree to the last few bits (see ``limit_tolerance``).
+    """
+    return _select(*servo_candidates(sat_az, sat_el))
+
+
+def rotator_feasibility(sat_az, sat_el, starts):
+    """Rotator feasibility of many passes from their concatenated az/el samples, in one batch.
+
+    ``starts`` is the index of each pass's first sample (every pass needs at
+    least one). Per pass: whether a single configuration covers all of it
+    (``one_config``), how often the per-sample solution flips mid-pass
+    (``flips``) and how many samples neither configuration reaches
+    (``clamped``).
+    """
+    direct_az, direct_el, flip_az, flip_el = servo_candidates(sat_az, sat_el)
+    direct_ok = _within(direct_az, direct_el)
+    flip_ok = _within(flip_az, flip_el)
+    _, _, flipped = _select(direct_az, direct_el, flip_az, flip_el)
+    starts = np.asarray(starts, dtype=int)
+    change = np.zeros(len(flipped), dtype=int)
+    change[1:] = flipped[1:] != flipped[:-1]
+    change[starts] = 0
+    return {
+        "one_config": np.logical_and.reduceat(direct_ok, starts) | np.logical_and.reduceat(flip_ok, starts),
+        "flips": np.add.reduceat(change, starts),
+        "clamped": np.add.reduceat((~direct_ok & ~flip_ok).astype(int), starts),
+    }
+
+
+def total_slew(servo_az, servo_el, start=None):
+    """Summed az + el travel along the samples, plus the move from ``start`` if given."""
+    slew = float(np.abs(np.diff(servo_az)).sum() + np.abs(np.diff(servo_el)).sum())
+    if start is not None and len(servo_az):
+        slew += abs(float(servo_az[0]) - start[0]) + abs(float(servo_el[0]) - start[1])
+    return slew
+
+
+class ServoTrajectory:
+    """Time-stamped servo angles for one pass, planned in one go before AOS.
+
+    ``flipped`` is the configuration at AOS. ``changeover`` is None when the
+    whole pass is flown in that configuration, else the unix time of the
+    single planned switch to the other one. ``at(t)`` interpolates linearly
+    between samples and holds the first or last point outside the span, so
+    the servos can be parked on the start point ahead of AOS.
+    """
+
+    def __init__(self, sat_index, times, servo_az, servo_el, flipped, changeover, feasible, slew_deg):
+        self.sat_index = sat_index
+        self.t = np.asarray(times, dtype=float)
+        self.az = np.asarray(servo_az, dtype=float)
+        self.el = np.asarray(servo_el, dtype=float)
+        self.flipped = flipped
+        self.changeover = changeover
+        self.feasible = feasible
+        self.slew_deg = slew_deg
+        self.t0 = float(self.t[0])
+        self.t_end = float(self.t[-1])
+        self._t = self.t.tolist()
+        self._az = self.az.tolist()
+        self._el = self.el.tolist()
+
+    def __len__(self):
+        return len(self._t)
+
+    def covers(self, t, lead=None):
+        """True from ``lead`` seconds before the first sample (default trajectory_lead) to the last."""
+        lead = trajectory_lead if lead is None else lead
+        return self.t0 - lead <= t <= self.t_end
+
+    def at(self, t):
+        """(servo_az, servo_el) at unix time ``t``."""
+        i = bisect.bisect_right(self._t, t)
+        if i <= 0:
+            return self._az[0], self._el[0]
+        if i >= len(self._t):
+            return self._az[-1], self._el[-1]
+        t0, t1 = self._t[i - 1], self._t[i]
+        u = (t - t0) / (t1 - t0)
+        return (self._az[i - 1] + (self._az[i] - self._az[i - 1]) * u,
+                self._el[i - 1] + (self._el[i] - self._el[i - 1]) * u)
+
+    def describe(self):
+        config = "flipped" if self.flipped else "direct"
+        if self.changeover is not None:
+            config += f", one changeover {self.changeover - self.t0:.0f} s after AOS"
+        fit = "" if self.feasible else ", clamped to the servo limits"
+        return f"{config}, {self.slew_deg:.0f} deg slew{fit}"
+
+
+def _changeover(configs, ok, sat_el):
+    """(elevation, first configuration, index) of the lowest-elevation single switch that keeps every sample reachable."""
+    best = None
+    for first in (0, 1):
+        head = np.logical_and.accumulate(ok[first])
+        tail = np.logical_and.accumulate(ok[1 - first][::-1])[::-1]
+        ks = np.flatnonzero(head[:-1] & tail[1:]) + 1
+        if len(ks):
+            k = int(ks[np.argmin(sat_el[ks])])
+            candidate = (float(sat_el[k]), first, k)
+            best = candidate if best is None else min(best, candidate)
+    return best
+
+
+def plan_trajectory(times, sat_az, sat_el, sat_index=None, start=None):
+    """Servo trajectory for one pass from its satellite az/el samples, with one flip decision.
+
+    The direct and the flipped solution are each evaluated over the whole
+    pass; of those that stay inside the servo limits throughout, the one
+    with the least total slew (including the move from ``start``, the
+    current servo angles) is flown. Passes that neither can cover (polar
+    passes running north to south) get exactly one changeover, placed at
+    the lowest elevation where both are reachable so the high part of the
+    pass is never interrupted. Only if that is impossible too is the
+    least-clamped solution used, with ``feasible`` False.
+    """
+    sat_el = np.asarray(sat_el, dtype=float)
+    direct_az, direct_el, flip_az, flip_el = servo_candidates(sat_az, sat_el)
+    configs = ((direct_az, direct_el), (flip_az, flip_el))
+    excess = [limit_excess(a, e) for a, e in configs]
+    ok = [_within(a, e) for a, e in configs]
+    configs = tuple((np.clip(a, *az_limits), np.clip(e, *el_limits)) for a, e in configs)
+
+    whole = [(total_slew(a, e, start), flipped) for flipped, (a, e) in enumerate(configs) if ok[flipped].all()]
+    if whole:
+        slew, flipped = min(whole)
+        a, e = configs[flipped]
+        return ServoTrajectory(sat_index, times, a, e, bool(flipped), None, True, slew)
+
+    switch = _changeover(configs, ok, sat_el)
+    if switch is not None:
+        _, first, k = switch
+        (a1, e1), (a2, e2) = configs[first], configs[1 - first]
+        a = np.concatenate([a1[:k], a2[k:]])
+        e = np.concatenate([e1[:k], e2[k:]])
+        return ServoTrajectory(sat_index, times, a, e, bool(first), float(times[k]), True, total_slew(a, e, start))
+
+    flipped = int(excess[1].sum() < excess[0].sum())
+    a, e = configs[flipped]
+    return ServoTrajectory(sat_index, times, a, e, bool(flipped), None, False, total_slew(a, e, start))
+
+
+def plan_table_pass(table, start=None, step=None, min_elevation=0.0):
+    """Plan the first above-horizon stretch covered by a PointingTable; None if it has none."""
+    step = trajectory_step if step is None else float(step)
+    times = table.t0 + step * np.arange(int((table.t_end - table.t0) / step) + 1)
+    az, el = table.at_array(times)
+    above = np.flatnonzero(el > min_elevation)
+    if len(above) < 2:
+        return None
+    breaks = np.flatnonzero(np.diff(above) > 1)
+    first, last = above[0], above[breaks[0]] if len(breaks) else above[-1]
+    if last <= first:
+        return None
+    return plan_trajectory(times[first:last + 1], az[first:last + 1], el[first:last + 1], table.sat_index, start)